@@ -0,0 +1,265 @@
+"""
+Artifact Store - Content-Addressed, Byte-Stable Evaluation Outputs
+Bachelor Thesis: Component Libraries for Project Business
+
+Outputs are rendered into memory (large ones such as the report PDF into a
+temporary file, hashed in blocks) and stored once per content under
+output/.artifacts/objects/<sha256>. The human-readable file in output/
+(or next to the data, e.g. the appendix workbook) is a hardlink to that
+blob, so repeated runs and duplicate reports cost no extra disk space:
+
+    save_figure(fig, "output/power_curves.png", dpi=300)
+    with stable_output("survey_results_appendix.xlsx") as buffer:
+        summary_df.to_excel(buffer, index=False)
+
+Rendering is byte-stable - no timestamps or tool versions in PNG/PDF/SVG
+metadata, a fixed SVG hash salt, fixed dates inside workbooks - so an
+unchanged artifact is recognized by its hash alone (no pixel diffs). Names
+are replaced atomically and blobs are never written to in place.
+
+``python artifacts.py`` writes output/manifest.json (name -> sha256) for
+uploads that skip known blobs; ``--gc`` removes blobs no name links to.
+
+Usage:
+    python artifacts.py [--gc] [directory ...]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import matplotlib
+
+from store import file_sha256
+
+EVAL_DIR = Path(__file__).parent
+OUTPUT_DIR = EVAL_DIR / "output"
+ARTIFACT_ROOT = OUTPUT_DIR / ".artifacts"
+MANIFEST_NAME = "manifest.json"
+
+# Metadata entries matplotlib would fill with the version or the current time
+STABLE_METADATA = {
+    "png": {"Software": None},
+    "pdf": {"Creator": None, "Producer": None, "CreationDate": None},
+    "svg": {"Creator": None, "Date": None},
+}
+SVG_HASH_SALT = "spade-eval"
+
+# Fixed timestamps inside workbooks (zip entries and document properties)
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+WORKBOOK_TIMESTAMP = "2000-01-01T00:00:00Z"
+WORKBOOK_DATES = re.compile(
+    rb"(<dcterms:(?:created|modified)[^>]*>)[^<]*(</dcterms:(?:created|modified)>)"
+)
+
+
+class ArtifactStore:
+    """Blobs addressed by their SHA-256, linked to their readable names"""
+
+    def __init__(self, root=ARTIFACT_ROOT):
+        self.root = Path(root)
+
+    def object_path(self, digest):
+        return self.root / "objects" / digest[:2] / digest[2:]
+
+    def put(self, data):
+        """Store ``data`` once; returns its SHA-256"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            temporary.write_bytes(data)
+            os.chmod(temporary, 0o444)
+            os.replace(temporary, path)
+        return digest
+
+    def temporary_path(self):
+        """Scratch file on the store's file system (for ``put_file``)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.root / f"incoming.{os.getpid()}.tmp"
+
+    def put_file(self, source):
+        """Move a finished file into the store (hashed in blocks); returns its SHA-256"""
+        digest = file_sha256(source)
+        path = self.object_path(digest)
+        if path.exists():
+            os.unlink(source)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.chmod(source, 0o444)
+            os.replace(source, path)
+        return digest
+
+    def publish(self, path, data):
+        """
+        Store ``data`` and make ``path`` point to it.
+
+        Args:
+            path (Path): Human-readable output file
+            data (bytes): Rendered content
+
+        Returns:
+            tuple: (sha256, changed) - ``changed`` is False if ``path``
+            already had this content
+        """
+        return self.link(path, self.put(data))
+
+    def link(self, path, digest):
+        """Make ``path`` point to the stored blob ``digest`` (see ``publish``)"""
+        blob = self.object_path(digest)
+        path = Path(path)
+        changed = True
+        if path.exists():
+            if os.path.samefile(path, blob):
+                return digest, False
+            changed = file_sha256(path) != digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            os.link(blob, temporary)
+        except OSError:
+            # No hardlinks (other file system, Windows without support): copy
+            shutil.copyfile(blob, temporary)
+        os.replace(temporary, path)
+        return digest, changed
+
+    def manifest(self, directory):
+        """Name -> {sha256, size} of all files below ``directory``"""
+        directory = Path(directory)
+        entries = {}
+        for path in sorted(directory.rglob("*")):
+            name = path.relative_to(directory)
+            # Skips the store itself and temporary files
+            if any(part.startswith(".") for part in name.parts):
+                continue
+            if not path.is_file() or path.name == MANIFEST_NAME:
+                continue
+            entries[name.as_posix()] = {
+                "sha256": file_sha256(path),
+                "size": path.stat().st_size,
+            }
+        return entries
+
+    def collect_garbage(self):
+        """Remove blobs no output file links to; returns the freed bytes"""
+        freed = 0
+        for blob in (self.root / "objects").glob("*/*"):
+            stat = blob.stat()
+            if stat.st_nlink == 1:
+                freed += stat.st_size
+                blob.unlink()
+        return freed
+
+
+def normalize_zip(data):
+    """Zip container (xlsx) with fixed entry dates and document timestamps"""
+    source = zipfile.ZipFile(io.BytesIO(data))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as target:
+        for info in source.infolist():
+            content = source.read(info)
+            if info.filename == "docProps/core.xml":
+                content = WORKBOOK_DATES.sub(
+                    rb"\g<1>" + WORKBOOK_TIMESTAMP.encode() + rb"\g<2>", content
+                )
+            entry = zipfile.ZipInfo(info.filename, date_time=ZIP_DATE_TIME)
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            entry.external_attr = info.external_attr
+            target.writestr(entry, content)
+    return buffer.getvalue()
+
+
+def _report(path, digest, changed):
+    if not changed:
+        print(f"   = {Path(path).name} unverändert ({digest[:12]})")
+    return digest
+
+
+def publish(path, data, store=None):
+    """Publish rendered bytes under ``path`` and report whether they changed"""
+    store = store or ArtifactStore()
+    return _report(path, *store.publish(path, data))
+
+
+@contextmanager
+def stable_output(path, store=None):
+    """Buffer for writers (ExcelWriter, PdfPages, to_csv) published on exit"""
+    buffer = io.BytesIO()
+    yield buffer
+    data = buffer.getvalue()
+    if Path(path).suffix == ".xlsx":
+        data = normalize_zip(data)
+    publish(path, data, store)
+
+
+@contextmanager
+def streamed_output(path, store=None):
+    """
+    File handle for large outputs (e.g. PdfPages) published on exit.
+
+    Unlike ``stable_output`` nothing is buffered in memory: the content is
+    written to a temporary file next to the blobs, hashed in blocks and moved
+    into the store.
+    """
+    store = store or ArtifactStore()
+    temporary = store.temporary_path()
+    try:
+        with open(temporary, "wb") as handle:
+            yield handle
+        _report(path, *store.link(path, store.put_file(temporary)))
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def figure_bytes(fig, fmt, **kwargs):
+    """Figure rendered without timestamps or version strings"""
+    buffer = io.BytesIO()
+    metadata = {**STABLE_METADATA.get(fmt, {}), **kwargs.pop("metadata", {})}
+    with matplotlib.rc_context({"svg.hashsalt": SVG_HASH_SALT}):
+        fig.savefig(buffer, format=fmt, metadata=metadata, **kwargs)
+    return buffer.getvalue()
+
+
+def save_figure(fig, path, store=None, **kwargs):
+    """Render a figure byte-stably and publish it under ``path``"""
+    fmt = Path(path).suffix.lstrip(".")
+    publish(path, figure_bytes(fig, fmt, **kwargs), store)
+    return path
+
+
+def main():
+    """Main function to write output manifests and clean up unused blobs"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directories", nargs="*", type=Path, default=[OUTPUT_DIR])
+    parser.add_argument("--gc", action="store_true")
+    args = parser.parse_args()
+
+    store = ArtifactStore()
+    for directory in args.directories:
+        entries = store.manifest(directory)
+        (directory / MANIFEST_NAME).write_text(
+            json.dumps(entries, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        unique = {entry["sha256"]: entry["size"] for entry in entries.values()}
+        total = sum(entry["size"] for entry in entries.values())
+        print(
+            f"📦 {directory}: {len(entries)} Dateien, {len(unique)} eindeutige "
+            f"Inhalte ({sum(unique.values()) / 1024:.0f} von {total / 1024:.0f} KB)"
+        )
+
+    if args.gc:
+        freed = store.collect_garbage()
+        print(f"🧹 {freed / 1024:.0f} KB ungenutzter Blobs entfernt")
+
+
+if __name__ == "__main__":
+    main()
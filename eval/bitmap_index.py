@@ -0,0 +1,285 @@
+"""
+Survey Bitmap Index - Cross-Filter Queries over Decoded Answers
+Bachelor Thesis: Component Libraries for Project Business
+
+After decoding, the answers of multi-select questions only exist as
+"; "-joined strings, so every follow-up question ("Angular Material users
+who name customization as a challenge") would need another string scan.
+The index stores one packed bit array (one bit per respondent) per option
+of every multi-select question and per value of every single-choice
+question:
+
+    index = SurveyBitmapIndex.from_decoded(result_df)
+    users = index.get("Verwendete UI Libraries", "Angular Material")
+    hits = users & index.get("Größte Herausforderungen", "Customization")
+    hits.count(), hits.indices()
+
+AND/OR/NOT work on whole bytes and counts use a vectorized popcount, so
+filters cost n/8 bytes per operand regardless of the answer texts.
+
+Usage:
+    python bitmap_index.py [survey.csv] --where "Spalte=Wert" [--exclude ...]
+        [--count-by Spalte]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Rows one-hot encoded per pass while building (bounds the boolean buffer)
+BUILD_BLOCK_ROWS = 1 << 20
+
+
+class Bitmap:
+    """Packed set of row positions out of ``n`` rows"""
+
+    def __init__(self, bits, n):
+        self.bits = bits
+        self.n = n
+
+    @classmethod
+    def from_mask(cls, mask):
+        mask = np.asarray(mask, dtype=bool)
+        return cls(np.packbits(mask, bitorder="little"), len(mask))
+
+    @classmethod
+    def empty(cls, n):
+        return cls(np.zeros((n + 7) // 8, dtype=np.uint8), n)
+
+    @classmethod
+    def full(cls, n):
+        return ~cls.empty(n)
+
+    def _check(self, other):
+        if self.n != other.n:
+            raise ValueError("Bitmaps over different row counts cannot be combined")
+
+    def __and__(self, other):
+        self._check(other)
+        return Bitmap(self.bits & other.bits, self.n)
+
+    def __or__(self, other):
+        self._check(other)
+        return Bitmap(self.bits | other.bits, self.n)
+
+    def __sub__(self, other):
+        self._check(other)
+        return Bitmap(self.bits & ~other.bits, self.n)
+
+    def __invert__(self):
+        bits = ~self.bits
+        # Keep the padding bits of the last byte cleared
+        if self.n % 8:
+            bits[-1] &= np.uint8((1 << (self.n % 8)) - 1)
+        return Bitmap(bits, self.n)
+
+    def __len__(self):
+        return self.count()
+
+    def count(self):
+        """Number of rows in the set"""
+        return int(np.bitwise_count(self.bits).sum(dtype=np.int64))
+
+    def to_mask(self):
+        return np.unpackbits(self.bits, count=self.n, bitorder="little").astype(bool)
+
+    def indices(self):
+        """Row positions in the set"""
+        return np.flatnonzero(self.to_mask())
+
+
+def _bitmaps_from_codes(codes, rows, n_values, n):
+    """One packed bit array per value from (value code, row position) pairs"""
+    bits = np.zeros((n_values, (n + 7) // 8), dtype=np.uint8)
+    for start in range(0, n, BUILD_BLOCK_ROWS):
+        stop = min(start + BUILD_BLOCK_ROWS, n)
+        in_block = (rows >= start) & (rows < stop)
+        onehot = np.zeros((n_values, stop - start), dtype=bool)
+        onehot[codes[in_block], rows[in_block] - start] = True
+        # BUILD_BLOCK_ROWS is a multiple of 8, so blocks start on byte boundaries
+        bits[:, start // 8 : (stop + 7) // 8] = np.packbits(
+            onehot, axis=1, bitorder="little"
+        )
+    return bits
+
+
+class SurveyBitmapIndex:
+    """Bitmaps per answer value of the single-choice and multi-select columns"""
+
+    def __init__(self, n):
+        self.n = n
+        # column -> {value: Bitmap}, values in order of first appearance
+        # (category order for categorical columns)
+        self.columns = {}
+        # column -> Bitmap of rows with a non-empty answer
+        self.answered = {}
+
+    def _add_column(self, col, codes, rows, uniques, answered):
+        bits = _bitmaps_from_codes(codes, rows, len(uniques), self.n)
+        self.columns[col] = {
+            value: Bitmap(bits[position], self.n)
+            for position, value in enumerate(uniques)
+        }
+        self.answered[col] = Bitmap.from_mask(answered)
+
+    def add_single_choice(self, col, values):
+        """Index a column with one answer per row"""
+        values = pd.Series(values).reset_index(drop=True)
+        answered = (values.notna() & (values.astype(str) != "")).to_numpy()
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Category order, as value_counts breaks ties by it
+            codes = values.cat.codes.to_numpy()[answered]
+            uniques = values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values[answered])
+        rows = np.flatnonzero(answered)
+        self._add_column(col, codes, rows, list(uniques), answered)
+
+    def add_multi_select(self, col, values, separator=";"):
+        """Index a column of separator-joined selections"""
+        values = pd.Series(values).reset_index(drop=True)
+        answered = (values.notna() & (values.astype(str) != "")).to_numpy()
+        selections = (
+            values[answered].astype(str).str.split(separator).explode().str.strip()
+        )
+        selections = selections[selections != ""]
+        codes, uniques = pd.factorize(selections)
+        rows = selections.index.to_numpy()
+        self._add_column(col, codes, rows, list(uniques), answered)
+
+    @classmethod
+    def from_decoded(cls, result_df, single_choice=None, multi_select=None):
+        """
+        Build the index of a decoded survey table.
+
+        Args:
+            result_df (pd.DataFrame): Decoded table (see ``csv2ex.decode_survey``)
+            single_choice (list): Columns with one answer per row
+                (defaults to ``csv2ex.CATEGORICAL_COLUMNS``)
+            multi_select (list): Columns of "; "-joined selections
+                (defaults to ``csv2ex.MULTI_SELECT_COLUMNS``)
+
+        Returns:
+            SurveyBitmapIndex: Index over the columns present in ``result_df``
+        """
+        if single_choice is None or multi_select is None:
+            from csv2ex import CATEGORICAL_COLUMNS, MULTI_SELECT_COLUMNS
+
+            single_choice = (
+                CATEGORICAL_COLUMNS if single_choice is None else single_choice
+            )
+            multi_select = (
+                MULTI_SELECT_COLUMNS if multi_select is None else multi_select
+            )
+
+        index = cls(len(result_df))
+        for col in single_choice:
+            if col in result_df.columns:
+                index.add_single_choice(col, result_df[col])
+        for col in multi_select:
+            if col in result_df.columns:
+                index.add_multi_select(col, result_df[col])
+        return index
+
+    def values(self, col):
+        return list(self.columns[col])
+
+    def get(self, col, value):
+        """Rows that gave ``value`` in ``col`` (empty if nobody did)"""
+        bitmap = self.columns[col].get(value)
+        return bitmap if bitmap is not None else Bitmap.empty(self.n)
+
+    def any_of(self, col, values):
+        """Rows that gave at least one of ``values`` in ``col``"""
+        result = Bitmap.empty(self.n)
+        for value in values:
+            result = result | self.get(col, value)
+        return result
+
+    def counts(self, col, where=None, sort=True):
+        """
+        Answer counts of a column, optionally restricted to a filter.
+
+        Returns:
+            dict: Value -> count for values with a count > 0, by count
+            (ties in the value order of the index) or, with ``sort=False``,
+            in the value order of the index
+        """
+        bitmaps = self.columns[col]
+        if not bitmaps:
+            return {}
+        bits = np.stack([bitmap.bits for bitmap in bitmaps.values()])
+        if where is not None:
+            bits = bits & where.bits
+        counts = np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+        order = np.argsort(-counts, kind="stable") if sort else range(len(counts))
+        values = list(bitmaps)
+        return {values[i]: int(counts[i]) for i in order if counts[i] > 0}
+
+    def nbytes(self):
+        bitmaps = [b for col in self.columns.values() for b in col.values()]
+        bitmaps += list(self.answered.values())
+        return sum(bitmap.bits.nbytes for bitmap in bitmaps)
+
+
+def parse_condition(index, condition):
+    """Bitmap of a "Spalte=Wert" (or "Spalte=Wert1|Wert2") condition"""
+    col, _, values = condition.partition("=")
+    col = col.strip()
+    if col not in index.columns:
+        raise ValueError(f"Spalte '{col}' ist nicht indiziert")
+    return index.any_of(col, [value.strip() for value in values.split("|")])
+
+
+def main():
+    """Main function to query the decoded survey via the bitmap index"""
+    from csv2ex import decode_survey, load_survey_export
+    from survey_io import find_survey_exports
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("export", nargs="?", type=Path)
+    parser.add_argument("--where", action="append", default=[], metavar="SPALTE=WERT")
+    parser.add_argument("--exclude", action="append", default=[], metavar="SPALTE=WERT")
+    parser.add_argument("--count-by", metavar="SPALTE")
+    args = parser.parse_args()
+
+    exports = (
+        [args.export]
+        if args.export
+        else find_survey_exports(Path(__file__).parent, stem="results-survey")
+    )
+    if not exports:
+        print("❌ Keine Umfrage-Exporte gefunden!")
+        return
+
+    df, _ = load_survey_export(exports[0])
+    result_df = decode_survey(df)
+
+    started = time.perf_counter()
+    index = SurveyBitmapIndex.from_decoded(result_df)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(
+        f"🗂️  Bitmap-Index: {len(index.columns)} Spalten, "
+        f"{sum(len(values) for values in index.columns.values())} Werte, "
+        f"{index.nbytes() / 1024:.1f} KB, {build_ms:.1f}ms"
+    )
+
+    started = time.perf_counter()
+    selection = Bitmap.full(index.n)
+    for condition in args.where:
+        selection = selection & parse_condition(index, condition)
+    for condition in args.exclude:
+        selection = selection - parse_condition(index, condition)
+    query_us = (time.perf_counter() - started) * 1e6
+    print(f"✓ {selection.count()} von {index.n} Antworten ({query_us:.0f}µs)")
+
+    if args.count_by:
+        for value, count in index.counts(args.count_by, where=selection).items():
+            print(f"   • {value}: {count}")
+
+
+if __name__ == "__main__":
+    main()
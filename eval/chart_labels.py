@@ -0,0 +1,53 @@
+"""
+Chart Labels - Shared Number Formatting and Bulk Bar Annotation
+Bachelor Thesis: Component Libraries for Project Business
+
+All value labels of the evaluation charts are formatted in one vectorized
+pass with the German decimal separator and attached to a whole bar
+container at once via ``Axes.bar_label`` (which also places edge labels
+above error bars), instead of one ``ax.text`` call per bar.
+"""
+
+import numpy as np
+
+DECIMAL_SEPARATOR = ","
+
+
+def format_numbers(values, decimals=1, prefix="", suffix=""):
+    """
+    Format numbers with the German decimal separator.
+
+    Args:
+        values (array-like): Numbers to format
+        decimals (int): Digits after the decimal separator
+        prefix (str or array-like): Text before each number
+        suffix (str or array-like): Text after each number
+
+    Returns:
+        list: One label per value
+    """
+    text = np.char.mod(f"%.{decimals}f", np.asarray(values, dtype=float))
+    if decimals > 0 and DECIMAL_SEPARATOR != ".":
+        text = np.char.replace(text, ".", DECIMAL_SEPARATOR)
+    return np.char.add(np.char.add(prefix, text), suffix).tolist()
+
+
+def label_bars(ax, bars, labels, position="edge", padding=3, **text_kw):
+    """
+    Attach one label per bar of a container in a single call.
+
+    Args:
+        ax (Axes): Axes holding the bars
+        bars (BarContainer): Result of ``ax.bar``
+        labels (list): Label texts (see ``format_numbers``)
+        position (str): "edge" (above the bar or its error bar) or "center"
+            (middle of the bar segment, also for stacked bars)
+        padding (float): Distance to the anchor in points
+        **text_kw: Text properties (fontweight, fontsize, color, ...)
+
+    Returns:
+        list: The created annotations
+    """
+    return ax.bar_label(
+        bars, labels=labels, label_type=position, padding=padding, **text_kw
+    )
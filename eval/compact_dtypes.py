@@ -0,0 +1,163 @@
+"""
+Compact dtype inference for survey and completion frames.
+
+``pd.read_csv`` loads repeated answer strings as ``object`` and small
+integer scales as ``int64``/``float64``. This pass converts them on load:
+
+1. Multi-select option columns ("Question [Option]") to ``bool``
+2. Low-cardinality answer columns (roles, frameworks, ...) to ``category``
+3. Declared rating columns (1-5 in the table's schema) to ``Int8``
+4. Experience years to the smallest integer type
+
+and reports the memory saved per column.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, is_object_dtype, is_string_dtype
+
+# Answers that mark an option of a multi-select question as not selected
+NOT_SELECTED_VALUES = {"not selected", "no", "false", "0", ""}
+
+RATING_RANGE = (1, 5)
+SMALL_INT_COLUMNS = ("experience_years",)
+
+# Convert text columns to category while distinct values stay below this share
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def _is_option_column(name, values):
+    """Multi-select option column: bracketed header, one option value or 'not selected'"""
+    if "[" not in name or not name.endswith("]"):
+        return False
+    distinct = {str(value).lower() for value in values.dropna().unique()}
+    return len(distinct - NOT_SELECTED_VALUES) <= 1
+
+
+def _is_integer_valued(values):
+    non_null = values.dropna()
+    return len(non_null) > 0 and bool(np.all(np.mod(non_null, 1) == 0))
+
+
+def _to_small_int(values):
+    """Smallest integer dtype; nullable only when the column has missing values"""
+    if values.isna().any():
+        return values.astype("Int8" if values.abs().max() <= 127 else "Int16")
+    return pd.to_numeric(values, downcast="integer")
+
+
+def rating_columns(df, schema):
+    """
+    Headers of ``df`` that the schema declares as 1-5 ratings.
+
+    Only these become ``Int8``: other integer columns that happen to stay
+    within 1-5 (counts, IDs of a small sample) keep their loaded dtype.
+
+    Args:
+        df (pd.DataFrame): Frame as loaded
+        schema (Schema): Contract of the table
+    """
+    low, high = RATING_RANGE
+    names = set()
+    for column in schema.columns:
+        if column.kind not in ("integer", "number"):
+            continue
+        if column.min_value is None or column.max_value is None:
+            continue
+        if column.min_value < low or column.max_value > high:
+            continue
+        if column.prefix:
+            names.update(col for col in df.columns if str(col).startswith(column.name))
+        elif column.name in df.columns:
+            names.add(column.name)
+    return names
+
+
+def infer_compact_dtype(name, values, ratings=()):
+    """
+    Compact version of one column, or ``None`` if it should stay as loaded.
+
+    Args:
+        name (str): Column header
+        values (pd.Series): Column as loaded by ``pd.read_csv``
+        ratings (set): Headers declared as 1-5 ratings
+    """
+    if is_numeric_dtype(values) and not values.dtype == bool:
+        if not _is_integer_valued(values):
+            return None
+        if name in SMALL_INT_COLUMNS:
+            return _to_small_int(values)
+        if name in ratings:
+            return values.astype("Int8")
+        return None
+
+    if is_object_dtype(values) or is_string_dtype(values):
+        if _is_option_column(name, values):
+            text = values.astype("string").str.lower()
+            return values.notna() & ~text.isin(NOT_SELECTED_VALUES).fillna(False)
+        n_unique = values.nunique(dropna=True)
+        if n_unique <= CATEGORY_MAX_UNIQUE_RATIO * len(values):
+            # Categories in order of first appearance, as value_counts breaks
+            # ties by category order (alphabetical by default)
+            return values.astype(pd.CategoricalDtype(pd.unique(values.dropna())))
+
+    return None
+
+
+def compact_dtypes(df, schema=None):
+    """
+    Convert a loaded frame to compact dtypes.
+
+    Args:
+        df (pd.DataFrame): Frame as loaded by ``pd.read_csv``
+        schema (Schema): Contract of the table; its 1-5 columns become ``Int8``
+
+    Returns:
+        tuple: (compact_df, report) where ``report`` lists dtype and memory
+        (bytes) before and after for every converted column
+    """
+    ratings = rating_columns(df, schema) if schema is not None else set()
+    converted = {}
+    report_rows = []
+
+    for name in df.columns:
+        values = df[name]
+        compact = infer_compact_dtype(name, values, ratings)
+        if compact is None:
+            continue
+
+        bytes_before = int(values.memory_usage(deep=True, index=False))
+        bytes_after = int(compact.memory_usage(deep=True, index=False))
+        converted[name] = compact
+        report_rows.append(
+            {
+                "column": name,
+                "dtype_before": str(values.dtype),
+                "dtype_after": str(compact.dtype),
+                "bytes_before": bytes_before,
+                "bytes_after": bytes_after,
+                "bytes_saved": bytes_before - bytes_after,
+            }
+        )
+
+    compact_df = df.assign(**converted) if converted else df
+    report = pd.DataFrame(
+        report_rows,
+        columns=[
+            "column",
+            "dtype_before",
+            "dtype_after",
+            "bytes_before",
+            "bytes_after",
+            "bytes_saved",
+        ],
+    )
+    return compact_df, report
+
+
+def format_memory_summary(df_before, df_after):
+    """One-line memory summary for load messages"""
+    before = df_before.memory_usage(deep=True).sum()
+    after = df_after.memory_usage(deep=True).sum()
+    factor = before / after if after else float("inf")
+    return f"{before / 1024:.1f} KB → {after / 1024:.1f} KB ({factor:.1f}x kleiner)"
@@ -1,4 +1,5 @@
 import matplotlib.pyplot as plt
+from matplotlib.colors import LinearSegmentedColormap
 import numpy as np
 import seaborn as sns
 import pandas as pd
@@ -6,10 +7,28 @@ from scipy.stats import pearsonr, spearmanr
 from scipy import stats
 from pathlib import Path
 
+from artifacts import save_figure, stable_output
+from chart_labels import format_numbers, label_bars
+from compact_dtypes import compact_dtypes
+from correlation_matrix import run_correlation_matrix
+from paired_tests import run_paired_tests
+from pivot_cube import load_pivot_cube
+from shared_frames import run_with_shared_frame
+from streaming_stats import PearsonAccumulator
+from store import EvalStore
+
 # Set scientific plotting style
 plt.style.use("seaborn-v0_8-whitegrid")
 sns.set_palette("Set2")
 
+# From this many participants the correlation plot switches to binned density
+LARGE_N_THRESHOLD = 2000
+DENSITY_GRIDSIZE = 40
+MAX_TREND_BINS = 30
+
+# From this many rows charts and tests run in worker processes (shared memory)
+PARALLEL_MIN_ROWS = 200_000
+
 
 # Example data structure based on your experiment design
 # Replace with your actual data loading
@@ -17,7 +36,10 @@ def load_completion_data():
     """
     Load completion rate data from experiment results.
     """
-    return pd.read_csv(Path(__file__).parent / "completion_data.csv")
+    with EvalStore() as store:
+        store.sync_completion_csv(Path(__file__).parent / "completion_data.csv")
+        df, _ = compact_dtypes(store.read_completion())
+    return df
 
 
 def create_completion_rate_visualization(df):
@@ -67,17 +89,13 @@ def create_completion_rate_visualization(df):
 
     # Add value labels on bars
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax1.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height + 1,
-                f"{height:.1f}%",
-                ha="center",
-                va="bottom",
-                fontweight="bold",
-                fontsize=10,
-            )
+        label_bars(
+            ax1,
+            bars,
+            format_numbers(bars.datavalues, suffix="%"),
+            fontweight="bold",
+            fontsize=10,
+        )
 
     ax1.set_xlabel("Task", fontweight="bold", fontsize=12)
     ax1.set_ylabel(
@@ -111,17 +129,13 @@ def create_completion_rate_visualization(df):
     )
 
     # Add value labels
-    for bar, value in zip(bars, [overall_material, overall_spade]):
-        height = bar.get_height()
-        ax2.text(
-            bar.get_x() + bar.get_width() / 2.0,
-            height + 1,
-            f"{value:.1f}%",
-            ha="center",
-            va="bottom",
-            fontweight="bold",
-            fontsize=12,
-        )
+    label_bars(
+        ax2,
+        bars,
+        format_numbers([overall_material, overall_spade], suffix="%"),
+        fontweight="bold",
+        fontsize=12,
+    )
 
     ax2.set_ylabel("Erfüllungsrate (%)", fontweight="bold", fontsize=12)
     ax2.set_title("Gesamtvergleich", fontweight="bold", fontsize=12)
@@ -131,6 +145,72 @@ def create_completion_rate_visualization(df):
     return fig, (ax1, ax2)
 
 
+def plot_density_correlation(ax, x, y, color, trend_color):
+    """
+    Binned density view of a large experience/completion sample.
+
+    Draws a hexbin density, the binned mean completion rate with 95% CI band
+    and the least-squares trend line. The correlation is computed in one
+    streaming pass, so render time and file size do not grow with n.
+
+    Returns:
+        tuple: (r, p) Pearson correlation and p-value
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    accumulator = PearsonAccumulator.from_arrays(x, y)
+    r, p = accumulator.correlation()
+
+    cmap = LinearSegmentedColormap.from_list("density", ["#FFFFFF", color])
+    ax.hexbin(
+        x,
+        y,
+        gridsize=DENSITY_GRIDSIZE,
+        cmap=cmap,
+        mincnt=1,
+        bins="log",
+        linewidths=0,
+    )
+
+    # Binned means with 95% confidence band
+    unique_x = np.unique(x)
+    if len(unique_x) <= MAX_TREND_BINS:
+        centers = unique_x
+        bin_index = np.searchsorted(unique_x, x)
+    else:
+        edges = np.linspace(x.min(), x.max(), MAX_TREND_BINS + 1)
+        centers = (edges[:-1] + edges[1:]) / 2
+        bin_index = np.clip(np.digitize(x, edges) - 1, 0, MAX_TREND_BINS - 1)
+
+    counts = np.bincount(bin_index, minlength=len(centers))
+    sums = np.bincount(bin_index, weights=y, minlength=len(centers))
+    squares = np.bincount(bin_index, weights=y * y, minlength=len(centers))
+    filled = counts > 1
+    means = sums[filled] / counts[filled]
+    variances = (squares[filled] - counts[filled] * means**2) / (counts[filled] - 1)
+    ci = 1.96 * np.sqrt(np.maximum(variances, 0) / counts[filled])
+
+    ax.plot(centers[filled], means, color=color, linewidth=2, marker="o")
+    ax.fill_between(
+        centers[filled], means - ci, means + ci, color=color, alpha=0.25, linewidth=0
+    )
+
+    # Add trend line
+    slope, intercept = accumulator.linear_fit()
+    trend_x = np.array([x.min(), x.max()])
+    ax.plot(
+        trend_x,
+        slope * trend_x + intercept,
+        color=trend_color,
+        linewidth=2,
+        linestyle="--",
+        alpha=0.8,
+    )
+
+    return r, p
+
+
 def create_experience_correlation_analysis(df):
     """Create correlation analysis between experience and completion rates"""
 
@@ -142,6 +222,9 @@ def create_experience_correlation_analysis(df):
         .reset_index()
     )
 
+    # Large samples: binned density instead of one marker per participant
+    large_n = len(participant_data) >= LARGE_N_THRESHOLD
+
     # Create correlation subplot
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 
@@ -151,30 +234,35 @@ def create_experience_correlation_analysis(df):
     y_material = participant_data["material_completion"]
 
     # Calculate correlation
-    r_material, p_material = pearsonr(x_material, y_material)
-
-    # Scatter plot with trend line
-    ax1.scatter(
-        x_material,
-        y_material,
-        color="#603DB1",
-        alpha=0.7,
-        s=80,
-        edgecolors="black",
-        linewidth=1,
-    )
+    if large_n:
+        r_material, p_material = plot_density_correlation(
+            ax1, x_material, y_material, "#603DB1", "#8B5CF6"
+        )
+    else:
+        r_material, p_material = pearsonr(x_material, y_material)
+
+        # Scatter plot with trend line
+        ax1.scatter(
+            x_material,
+            y_material,
+            color="#603DB1",
+            alpha=0.7,
+            s=80,
+            edgecolors="black",
+            linewidth=1,
+        )
 
-    # Add trend line
-    z = np.polyfit(x_material, y_material, 1)
-    p = np.poly1d(z)
-    ax1.plot(
-        x_material,
-        p(x_material),
-        color="#8B5CF6",
-        linewidth=2,
-        linestyle="--",
-        alpha=0.8,
-    )
+        # Add trend line
+        z = np.polyfit(x_material, y_material, 1)
+        p = np.poly1d(z)
+        ax1.plot(
+            x_material,
+            p(x_material),
+            color="#8B5CF6",
+            linewidth=2,
+            linestyle="--",
+            alpha=0.8,
+        )
 
     ax1.set_xlabel("Berufserfahrung (Jahre)", fontweight="bold", fontsize=12)
     ax1.set_ylabel("Erfüllungsrate (%)", fontweight="bold", fontsize=12)
@@ -192,30 +280,35 @@ def create_experience_correlation_analysis(df):
     y_spade = participant_data["spade_completion"]
 
     # Calculate correlation
-    r_spade, p_spade = pearsonr(x_spade, y_spade)
-
-    # Scatter plot with trend line
-    ax2.scatter(
-        x_spade,
-        y_spade,
-        color="#06667E",
-        alpha=0.7,
-        s=80,
-        edgecolors="black",
-        linewidth=1,
-    )
+    if large_n:
+        r_spade, p_spade = plot_density_correlation(
+            ax2, x_spade, y_spade, "#06667E", "#078CA3"
+        )
+    else:
+        r_spade, p_spade = pearsonr(x_spade, y_spade)
+
+        # Scatter plot with trend line
+        ax2.scatter(
+            x_spade,
+            y_spade,
+            color="#06667E",
+            alpha=0.7,
+            s=80,
+            edgecolors="black",
+            linewidth=1,
+        )
 
-    # Add trend line
-    z = np.polyfit(x_spade, y_spade, 1)
-    p_trend = np.poly1d(z)
-    ax2.plot(
-        x_spade,
-        p_trend(x_spade),
-        color="#078CA3",
-        linewidth=2,
-        linestyle="--",
-        alpha=0.8,
-    )
+        # Add trend line
+        z = np.polyfit(x_spade, y_spade, 1)
+        p_trend = np.poly1d(z)
+        ax2.plot(
+            x_spade,
+            p_trend(x_spade),
+            color="#078CA3",
+            linewidth=2,
+            linestyle="--",
+            alpha=0.8,
+        )
 
     ax2.set_xlabel("Berufserfahrung (Jahre)", fontweight="bold", fontsize=12)
     ax2.set_ylabel("Erfüllungsrate (%)", fontweight="bold", fontsize=12)
@@ -254,16 +347,26 @@ def create_experience_correlation_analysis(df):
     return fig, (r_material, p_material, r_spade, p_spade)
 
 
-def create_experience_group_comparison(df):
-    """Compare completion rates across experience groups"""
+def create_experience_group_comparison(df, estimates=None):
+    """
+    Compare completion rates across experience groups.
+
+    Args:
+        df (pd.DataFrame): Completion data
+        estimates (pd.DataFrame): Precomputed mean and error bar per group in
+            the layout of ``groupby(...).agg(["mean", "std"])`` (e.g. the
+            partial pooling estimates of pooling.py); defaults to mean ± SD
+    """
 
     # Define experience group order by years of experience
     experience_order = ["Studenten", "Junior", "Mid-Level", "Senior"]
 
     # Calculate average completion rates by experience group
-    exp_comparison = df.groupby("experience_group")[
-        ["material_completion", "spade_completion"]
-    ].agg(["mean", "std"])
+    exp_comparison = estimates
+    if exp_comparison is None:
+        exp_comparison = df.groupby("experience_group")[
+            ["material_completion", "spade_completion"]
+        ].agg(["mean", "std"])
 
     # Sort by experience level (YoE)
     exp_comparison = exp_comparison.reindex(experience_order)
@@ -310,18 +413,16 @@ def create_experience_group_comparison(df):
 
     # Add value labels
     for bars, means in [(bars1, material_means), (bars2, spade_means)]:
-        for bar, mean in zip(bars, means):
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height / 2,
-                f"{mean:.1f}%",
-                ha="center",
-                va="bottom",
-                fontweight="bold",
-                color="#fff",
-                fontsize=10,
-            )
+        label_bars(
+            ax,
+            bars,
+            format_numbers(means, suffix="%"),
+            position="center",
+            padding=0,
+            fontweight="bold",
+            color="#fff",
+            fontsize=10,
+        )
 
     ax.set_xlabel("Erfahrungsgruppe", fontweight="bold", fontsize=12)
     ax.set_ylabel("Erfüllungsrate (%) ± SD", fontweight="bold", fontsize=12)
@@ -338,44 +439,142 @@ def create_experience_group_comparison(df):
     return fig
 
 
-def main():
-    """Main execution function"""
-
-    # Load data (replace with your actual data loading)
-    df = load_completion_data()
+def create_correlation_heatmap(df, results=None):
+    """Heatmap of experience-completion correlations per group, task and library"""
+    if results is None:
+        results = run_correlation_matrix(df)
+    library_labels = {"material": "Material", "spade": "Spade"}
+    groups = pd.unique(results["group"])
+    slices = results[["task", "library"]].drop_duplicates()
 
-    # Create completion rate visualization
-    print("Erstelle Erfüllungsrate Visualisierung...")
-    fig1, axes1 = create_completion_rate_visualization(df)
-    plt.savefig(
-        "output/completion_rates_overview.png",
-        dpi=300,
-        bbox_inches="tight",
-        facecolor="white",
-        edgecolor="none",
+    cmap = LinearSegmentedColormap.from_list(
+        "correlation", ["#603DB1", "#FFFFFF", "#06667E"]
     )
-
-    # Create correlation analysis
-    print("Führe Korrelationsanalyse durch...")
-    fig2, correlation_results = create_experience_correlation_analysis(df)
-    plt.savefig(
-        "output/experience_completion_correlation.png",
-        dpi=300,
-        bbox_inches="tight",
-        facecolor="white",
-        edgecolor="none",
+    annotate = len(groups) * len(slices) <= 300
+    fig, axes = plt.subplots(
+        1,
+        2,
+        figsize=(max(16, 1.4 * len(slices)), max(5, 0.6 * len(groups) + 2)),
+        sharey=True,
     )
 
-    # Create experience group comparison
-    print("Erstelle Erfahrungsgruppen-Vergleich...")
-    fig3 = create_experience_group_comparison(df)
-    plt.savefig(
-        "output/experience_group_comparison.png",
+    for ax, (value_col, p_col, title) in zip(
+        axes,
+        [
+            ("pearson_r", "pearson_p_bh", "Pearson r"),
+            ("spearman_rho", "spearman_p_bh", "Spearman ρ"),
+        ],
+    ):
+        matrix = results.pivot(
+            index="group", columns=["task", "library"], values=value_col
+        ).reindex(index=groups, columns=pd.MultiIndex.from_frame(slices))
+        p_values = results.pivot(
+            index="group", columns=["task", "library"], values=p_col
+        ).reindex(index=groups, columns=matrix.columns)
+
+        labels = None
+        if annotate:
+            stars = np.where(p_values.to_numpy() < 0.05, "*", "")
+            labels = np.where(
+                matrix.isna(), "", matrix.map(lambda r: f"{r:.2f}") + stars
+            )
+
+        sns.heatmap(
+            matrix,
+            ax=ax,
+            cmap=cmap,
+            vmin=-1,
+            vmax=1,
+            center=0,
+            annot=labels if annotate else False,
+            fmt="",
+            linewidths=0.5,
+            linecolor="white",
+            cbar=ax is axes[-1],
+            cbar_kws={"label": "Korrelation mit Berufserfahrung"},
+        )
+        ax.set_facecolor("#EEEEEE")  # slices without a defined correlation
+        ax.grid(False)
+        ax.set_xticklabels(
+            [f"{task}\n{library_labels.get(lib, lib)}" for task, lib in matrix.columns],
+            rotation=0 if len(slices) <= 10 else 90,
+        )
+        ax.set_xlabel("Task / Bibliothek", fontweight="bold", fontsize=12)
+        ax.set_ylabel("Erfahrungsgruppe" if ax is axes[0] else "", fontweight="bold")
+        ax.set_title(title, fontweight="bold", fontsize=12)
+
+    fig.suptitle(
+        "Korrelation Berufserfahrung vs. Erfüllungsrate (* BH-korrigiert p < 0.05)",
+        fontweight="bold",
+        fontsize=14,
+    )
+    plt.tight_layout()
+    return fig, results
+
+
+# Output name -> (progress message, figure function)
+CHARTS = {
+    "completion_rates_overview": (
+        "Erstelle Erfüllungsrate Visualisierung...",
+        create_completion_rate_visualization,
+    ),
+    "experience_completion_correlation": (
+        "Führe Korrelationsanalyse durch...",
+        create_experience_correlation_analysis,
+    ),
+    "experience_group_comparison": (
+        "Erstelle Erfahrungsgruppen-Vergleich...",
+        create_experience_group_comparison,
+    ),
+    "experience_correlation_matrix": (
+        "Erstelle Korrelationsmatrix...",
+        create_correlation_heatmap,
+    ),
+}
+
+
+def save_chart(df, name, *args):
+    """Create one chart of CHARTS and save it to output/<name>.png"""
+    result = CHARTS[name][1](df, *args)
+    fig = result[0] if isinstance(result, tuple) else result
+    path = f"output/{name}.png"
+    save_figure(
+        fig,
+        path,
         dpi=300,
         bbox_inches="tight",
         facecolor="white",
         edgecolor="none",
     )
+    plt.close(fig)
+    return path
+
+
+def main():
+    """Main execution function"""
+
+    # Load data (replace with your actual data loading)
+    df = load_completion_data()
+
+    # Participant x task x library cube, built from df once per input change
+    pivot = load_pivot_cube(df)
+
+    # The tests only slice the cached cube, no pivoting in workers needed
+    paired_results = run_paired_tests(df, pivot=pivot)
+    correlation_results = run_correlation_matrix(df, pivot=pivot)
+
+    # Extra arguments per chart: the heatmap reuses the correlation results
+    chart_args = {name: (name,) for name in CHARTS}
+    chart_args["experience_correlation_matrix"] += (correlation_results,)
+
+    if len(df) >= PARALLEL_MIN_ROWS:
+        # Charts in worker processes sharing one copy of df
+        print("Erstelle Visualisierungen parallel...")
+        run_with_shared_frame(df, [(save_chart, args) for args in chart_args.values()])
+    else:
+        for name, (message, _) in CHARTS.items():
+            print(message)
+            save_chart(df, *chart_args[name])
 
     # Statistical summary
     print("\nStatistische Zusammenfassung:")
@@ -388,14 +587,11 @@ def main():
     # Paired t-test for completion rates
     from scipy.stats import ttest_rel
 
-    # Average completion rates per participant
-    participant_avg = df.groupby("participant_id")[
-        ["material_completion", "spade_completion"]
-    ].mean()
+    # Average completion rates per participant (over the task axis of the cube)
+    participant_avg = np.nanmean(pivot.metric("completion"), axis=1)
+    material, spade = pivot.libraries.index("material"), pivot.libraries.index("spade")
 
-    t_stat, t_p = ttest_rel(
-        participant_avg["material_completion"], participant_avg["spade_completion"]
-    )
+    t_stat, t_p = ttest_rel(participant_avg[:, material], participant_avg[:, spade])
 
     print(f"\nPaired t-Test (Material vs. Spade):")
     print(f"t = {t_stat:.3f}, p = {t_p:.3f}")
@@ -405,10 +601,52 @@ def main():
     else:
         print("Kein signifikanter Unterschied zwischen den Ansätzen (p ≥ 0.05)")
 
+    # Paired tests per task, experience group and library pair
+    with stable_output("output/paired_tests.csv") as buffer:
+        paired_results.to_csv(buffer, index=False)
+    with EvalStore() as store:
+        store.write_results("paired_tests", paired_results)
+
+    significant = paired_results[paired_results["p_t_holm"] < 0.05]
+    print(f"\nPaired Tests pro Task und Erfahrungsgruppe (Holm-korrigiert):")
+    print(f"{len(significant)} von {len(paired_results)} Vergleichen signifikant")
+    print(
+        paired_results[
+            [
+                "group",
+                "task",
+                "n",
+                "mean_diff",
+                "cohens_dz",
+                "p_t_holm",
+                "p_wilcoxon_holm",
+            ]
+        ]
+        .round(3)
+        .to_string(index=False)
+    )
+
+    # Experience correlations per group, task and library
+    with stable_output("output/correlation_matrix.csv") as buffer:
+        correlation_results.to_csv(buffer, index=False)
+    with EvalStore() as store:
+        store.write_results("correlation_matrix", correlation_results)
+
+    defined = correlation_results.dropna(subset=["spearman_rho"])
+    significant = defined[defined["spearman_p_bh"] < 0.05]
+    print(f"\nKorrelationsmatrix Erfahrung vs. Erfüllungsrate (BH-korrigiert):")
+    print(
+        f"{len(significant)} von {len(defined)} Slices signifikant "
+        f"({len(correlation_results) - len(defined)} ohne Varianz/zu klein)"
+    )
+
     print("\nVisualisierungen gespeichert in:")
     print("- output/completion_rates_overview.png")
     print("- output/experience_completion_correlation.png")
     print("- output/experience_group_comparison.png")
+    print("- output/experience_correlation_matrix.png")
+    print("- output/paired_tests.csv")
+    print("- output/correlation_matrix.csv")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+"""
+Correlation Matrix - Experience vs. Completion Rate per Slice
+Bachelor Thesis: Component Libraries for Project Business
+
+Computes Pearson and Spearman correlations between professional experience
+and completion rate for every experience group x task x library slice in
+one batched pass. The long-format completion data is pivoted into the
+participant x task x library cube of paired_tests.py, all slices become
+columns of one (participants x slices) matrix, and means, co-moments and
+ranks are computed column-wise. Participants outside a slice are NaN and
+excluded pairwise; ranks for Spearman are computed once per slice. p-values
+use the t-distribution with n - 2 degrees of freedom (as scipy.stats).
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from paired_tests import (
+    ALL_GROUPS,
+    COMPLETION_SUFFIX,
+    OVERALL_TASK,
+    benjamini_hochberg_correction,
+    participant_slices,
+)
+
+# Slices per batch; bounds memory to participants x SLICE_BLOCK_SIZE values
+SLICE_BLOCK_SIZE = 4096
+
+
+def batched_pearson(x, y):
+    """
+    Pearson r, p-value and n for every column of two (n, slices) arrays.
+
+    Rows where either value is NaN are excluded per column.
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    n = valid.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        x = np.where(valid, x, 0.0)
+        y = np.where(valid, y, 0.0)
+        dx = np.where(valid, x - x.sum(axis=0) / n, 0.0)
+        dy = np.where(valid, y - y.sum(axis=0) / n, 0.0)
+
+        r = np.einsum("ij,ij->j", dx, dy) / np.sqrt(
+            np.einsum("ij,ij->j", dx, dx) * np.einsum("ij,ij->j", dy, dy)
+        )
+        r = np.clip(r, -1.0, 1.0)
+        dof = n - 2
+        t_stat = r * np.sqrt(dof / (1.0 - r * r))
+        p = 2 * stats.t.sf(np.abs(t_stat), dof)
+
+    r = np.where(n >= 3, r, np.nan)
+    p = np.where(np.isnan(r), np.nan, p)
+    return r, p, n
+
+
+def batched_spearman(x, y):
+    """Spearman rho, p-value and n per column (Pearson on per-column ranks)"""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = np.where(valid, x, np.nan)
+    y = np.where(valid, y, np.nan)
+    ranks_x = stats.rankdata(x, axis=0, nan_policy="omit")
+    ranks_y = stats.rankdata(y, axis=0, nan_policy="omit")
+    return batched_pearson(ranks_x, ranks_y)
+
+
+def run_correlation_matrix(
+    df,
+    x_col="experience_years",
+    group_col="experience_group",
+    value_suffix=COMPLETION_SUFFIX,
+    pivot=None,
+):
+    """
+    Correlate experience with completion for every group x task x library.
+
+    Args:
+        df (pd.DataFrame): Long-format completion data (see ``build_completion_cube``)
+        x_col (str): Participant-level predictor column
+        group_col (str): Participant-level grouping column, ``None`` to skip groups
+        value_suffix (str): Suffix identifying the per-library value columns
+        pivot (PivotCube): Cached cube to slice instead of pivoting ``df``
+
+    Returns:
+        pd.DataFrame: Tidy results table, one row per group x task x library
+    """
+    cube, participants, tasks, libraries, participant_info = participant_slices(
+        df, value_suffix, pivot
+    )
+
+    # Per-participant average over all tasks as an additional "task"
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        overall = np.nanmean(cube, axis=1, keepdims=True)
+    cube = np.concatenate([cube, overall], axis=1)
+    tasks = tasks + [OVERALL_TASK]
+
+    x = participant_info[x_col].to_numpy(dtype=float)
+
+    groups = [ALL_GROUPS]
+    masks = [np.ones(len(participants), dtype=bool)]
+    if group_col is not None and group_col in participant_info.columns:
+        for group in pd.unique(participant_info[group_col].dropna()):
+            groups.append(group)
+            masks.append((participant_info[group_col] == group).to_numpy())
+    masks = np.column_stack(masks)
+
+    # Slice s -> (group, task, library) indices, groups varying slowest
+    group_idx, task_idx, library_idx = (
+        grid.ravel()
+        for grid in np.meshgrid(
+            np.arange(len(groups)),
+            np.arange(len(tasks)),
+            np.arange(len(libraries)),
+            indexing="ij",
+        )
+    )
+
+    columns = {
+        name: np.empty(len(group_idx))
+        for name in ["pearson_r", "pearson_p", "spearman_rho", "spearman_p"]
+    }
+    n = np.empty(len(group_idx), dtype=int)
+    for start in range(0, len(group_idx), SLICE_BLOCK_SIZE):
+        block = slice(start, start + SLICE_BLOCK_SIZE)
+        y = cube[:, task_idx[block], library_idx[block]]
+        y = np.where(masks[:, group_idx[block]], y, np.nan)
+        x_block = np.broadcast_to(x[:, None], y.shape)
+
+        r, p, n[block] = batched_pearson(x_block, y)
+        columns["pearson_r"][block], columns["pearson_p"][block] = r, p
+        rho, p_rho, _ = batched_spearman(x_block, y)
+        columns["spearman_rho"][block], columns["spearman_p"][block] = rho, p_rho
+
+    results_df = pd.DataFrame(
+        {
+            "group": np.array(groups, dtype=object)[group_idx],
+            "task": np.array(tasks, dtype=object)[task_idx],
+            "library": np.array(libraries, dtype=object)[library_idx],
+            "n": n,
+            **columns,
+        }
+    )
+
+    # Exploratory family over all slices: false discovery rate
+    results_df["pearson_p_bh"] = benjamini_hochberg_correction(results_df["pearson_p"])
+    results_df["spearman_p_bh"] = benjamini_hochberg_correction(
+        results_df["spearman_p"]
+    )
+    return results_df
@@ -0,0 +1,275 @@
+"""
+Cross Tabulation - Chi-Square and Cramér's V for All Question Pairs
+Bachelor Thesis: Component Libraries for Project Business
+
+Builds the contingency tables between every pair of survey questions
+(role x preferred approach, framework x challenges, ...) from one matrix
+product instead of one ``pd.crosstab`` per pair. The bitmap index of the
+decoded survey is unpacked into a one-hot matrix X (responses x answer
+levels); XᵀX holds the counts of every crosstab as blocks.
+
+Single-choice questions and ratings are variables with one level per
+answer. Options of multi-select questions are not mutually exclusive, so
+every option is a variable of its own ("ausgewählt" / "nicht ausgewählt"
+among respondents of the question); options of the same question are not
+paired with each other. Chi-square statistics, degrees of freedom, p-values
+(Benjamini-Hochberg corrected over all pairs) and Cramér's V are computed
+for all blocks at once with segment sums over the co-occurrence matrix.
+
+Usage:
+    python crosstabs.py [survey.csv] [--min-n 10] [--top 15]
+"""
+
+import argparse
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from artifacts import stable_output
+from bitmap_index import SurveyBitmapIndex
+from chart_labels import format_numbers
+from paired_tests import benjamini_hochberg_correction
+
+SELECTED = "ausgewählt"
+NOT_SELECTED = "nicht ausgewählt"
+
+# Rows unpacked into the one-hot matrix per pass (bounds its memory)
+COOCCURRENCE_BLOCK_ROWS = 1 << 16
+
+# Share of expected cell counts below 5 from which chi-square is unreliable
+LOW_EXPECTED_WARNING = 0.2
+
+
+def build_variables(index, single_choice, multi_select):
+    """
+    Answer levels of all variables as bitmaps.
+
+    Returns:
+        tuple: (levels, variables) - one (variable, level, Bitmap) per level,
+        and per variable its name and source question
+    """
+    levels = []
+    variables = []
+
+    for col in single_choice:
+        if col not in index.columns or len(index.columns[col]) < 2:
+            continue
+        variables.append({"variable": col, "question": col})
+        for value, bitmap in index.columns[col].items():
+            levels.append((col, value, bitmap))
+
+    for col in multi_select:
+        if col not in index.columns:
+            continue
+        answered = index.answered[col]
+        for option, bitmap in index.columns[col].items():
+            name = f"{col}: {option}"
+            variables.append({"variable": name, "question": col})
+            levels.append((name, SELECTED, bitmap))
+            levels.append((name, NOT_SELECTED, answered - bitmap))
+
+    return levels, variables
+
+
+def cooccurrence_matrix(bitmaps, n):
+    """XᵀX of the one-hot matrix whose columns are ``bitmaps``"""
+    packed = np.stack([bitmap.bits for bitmap in bitmaps], axis=1)
+    counts = np.zeros((len(bitmaps), len(bitmaps)))
+    for start in range(0, n, COOCCURRENCE_BLOCK_ROWS):
+        stop = min(start + COOCCURRENCE_BLOCK_ROWS, n)
+        block = np.unpackbits(
+            packed[start // 8 : (stop + 7) // 8],
+            axis=0,
+            count=stop - start,
+            bitorder="little",
+        ).astype(np.float64)
+        counts += block.T @ block
+    return counts
+
+
+def _block_sums(matrix, starts):
+    """Sum of every (variable x variable) block of a level x level matrix"""
+    return np.add.reduceat(np.add.reduceat(matrix, starts, axis=0), starts, axis=1)
+
+
+def run_crosstabs(result_df, single_choice=None, multi_select=None, min_n=10):
+    """
+    Chi-square test of independence for every pair of variables.
+
+    Args:
+        result_df (pd.DataFrame): Decoded survey table (see ``csv2ex.decode_survey``)
+        single_choice (list): Single-choice columns (defaults to the
+            categorical and rating columns of csv2ex.py)
+        multi_select (list): Multi-select columns (defaults to csv2ex.py's)
+        min_n (int): Pairs answered by fewer respondents are left out
+
+    Returns:
+        pd.DataFrame: One row per variable pair, strongest association first
+    """
+    from csv2ex import CATEGORICAL_COLUMNS, MULTI_SELECT_COLUMNS, RATING_COLUMNS
+
+    if single_choice is None:
+        single_choice = CATEGORICAL_COLUMNS + RATING_COLUMNS
+    if multi_select is None:
+        multi_select = MULTI_SELECT_COLUMNS
+
+    index = SurveyBitmapIndex.from_decoded(result_df, single_choice, multi_select)
+    levels, variables = build_variables(index, single_choice, multi_select)
+    if len(variables) < 2:
+        return pd.DataFrame()
+
+    level_var = pd.factorize(
+        np.array([variable for variable, _, _ in levels], dtype=object)
+    )[0]
+    starts = np.flatnonzero(np.r_[True, np.diff(level_var) != 0])
+    counts = cooccurrence_matrix([bitmap for _, _, bitmap in levels], index.n)
+
+    # Margins of level i within the crosstab against variable v (both answered)
+    row_margins = np.add.reduceat(counts, starts, axis=1)  # levels x variables
+    margin_a = row_margins[:, level_var]  # row margin of cell (i, j)
+    margin_b = row_margins[:, level_var].T  # column margin of cell (i, j)
+    pair_n = _block_sums(counts, starts)
+    cell_n = pair_n[level_var][:, level_var]
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        # chi² = n * (Σ O² / (row margin * column margin) - 1)
+        denominator = margin_a * margin_b
+        ratio = np.divide(
+            counts**2,
+            denominator,
+            out=np.zeros_like(counts),
+            where=denominator > 0,
+        )
+        chi2 = pair_n * (_block_sums(ratio, starts) - 1)
+
+        expected = np.divide(
+            denominator, cell_n, out=np.zeros_like(counts), where=cell_n > 0
+        )
+        low_expected = _block_sums(
+            ((expected < 5) & (denominator > 0)).astype(float), starts
+        )
+        cells = _block_sums((denominator > 0).astype(float), starts)
+
+        # Only levels that occur in the pair count towards the degrees of freedom
+        present = (row_margins > 0).astype(float)
+        present_levels = np.add.reduceat(present, starts, axis=0)
+        dof = (present_levels - 1) * (present_levels.T - 1)
+        cramers_v = np.sqrt(
+            chi2 / (pair_n * np.minimum(present_levels - 1, present_levels.T - 1))
+        )
+
+    first, second = np.triu_indices(len(variables), k=1)
+    questions = np.array([variable["question"] for variable in variables])
+    keep = (questions[first] != questions[second]) & (pair_n[first, second] >= min_n)
+    keep &= dof[first, second] > 0
+    first, second = first[keep], second[keep]
+
+    names = np.array([variable["variable"] for variable in variables], dtype=object)
+    results_df = pd.DataFrame(
+        {
+            "variable_a": names[first],
+            "variable_b": names[second],
+            "n": pair_n[first, second].astype(int),
+            "chi2": chi2[first, second],
+            "dof": dof[first, second].astype(int),
+            "cramers_v": np.clip(cramers_v[first, second], 0.0, 1.0),
+            "low_expected_share": low_expected[first, second] / cells[first, second],
+        }
+    )
+    results_df["p"] = stats.chi2.sf(results_df["chi2"], results_df["dof"])
+    # Exploratory family over all pairs: false discovery rate
+    results_df["p_bh"] = benjamini_hochberg_correction(results_df["p"])
+    results_df["low_expected"] = results_df["low_expected_share"] > LOW_EXPECTED_WARNING
+
+    return results_df.sort_values(
+        ["cramers_v", "p"], ascending=[False, True], kind="stable"
+    ).reset_index(drop=True)
+
+
+def crosstab(result_df, variable_a, variable_b):
+    """
+    Contingency table of two variables (as named in ``run_crosstabs``).
+
+    Multi-select options are addressed as "<Frage>: <Option>".
+    """
+    from csv2ex import CATEGORICAL_COLUMNS, MULTI_SELECT_COLUMNS, RATING_COLUMNS
+
+    single_choice = CATEGORICAL_COLUMNS + RATING_COLUMNS
+    index = SurveyBitmapIndex.from_decoded(
+        result_df, single_choice, MULTI_SELECT_COLUMNS
+    )
+    levels, _ = build_variables(index, single_choice, MULTI_SELECT_COLUMNS)
+    rows = [(value, bitmap) for name, value, bitmap in levels if name == variable_a]
+    columns = [(value, bitmap) for name, value, bitmap in levels if name == variable_b]
+    return pd.DataFrame(
+        [[(row & column).count() for _, column in columns] for _, row in rows],
+        index=pd.Index([value for value, _ in rows], name=variable_a),
+        columns=pd.Index([value for value, _ in columns], name=variable_b),
+    )
+
+
+def format_association(row):
+    """One line per association for the console"""
+    # Only the numbers get the decimal comma (labels may contain dots)
+    line = (
+        f"{row['variable_a']} × {row['variable_b']}: "
+        f"V = {format_numbers(row['cramers_v'], 2)}, "
+        f"χ²({row['dof']}) = {format_numbers(row['chi2'], 1)}, "
+        f"p(BH) = {format_numbers(row['p_bh'], 3)}, n = {row['n']}"
+    )
+    if row["low_expected"]:
+        line += " ⚠️"
+    return line
+
+
+def main():
+    """Main function to rank the associations between all survey questions"""
+    from csv2ex import decode_survey, load_survey_export
+    from store import EvalStore
+    from survey_io import find_survey_exports
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("export", nargs="?", type=Path)
+    parser.add_argument("--min-n", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    exports = (
+        [args.export]
+        if args.export
+        else find_survey_exports(Path(__file__).parent, stem="results-survey")
+    )
+    if not exports:
+        print("❌ Keine Umfrage-Exporte gefunden!")
+        return
+
+    df, _ = load_survey_export(exports[0])
+    results_df = run_crosstabs(decode_survey(df), min_n=args.min_n)
+    if results_df.empty:
+        print("❌ Zu wenige Fragen für Kreuztabellen!")
+        return
+
+    output_dir = Path("output")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with stable_output(output_dir / "crosstab_associations.csv") as buffer:
+        results_df.to_csv(buffer, index=False)
+    with EvalStore() as store:
+        store.write_results("crosstab_associations", results_df)
+
+    significant = int((results_df["p_bh"] < 0.05).sum())
+    print(
+        f"✓ {len(results_df)} Fragenpaare getestet, {significant} signifikant "
+        f"(BH p < 0,05)"
+    )
+    print("\n🔗 Stärkste Zusammenhänge (Cramér's V):")
+    for _, row in results_df.head(args.top).iterrows():
+        print(f"   • {format_association(row)}")
+    print("\n⚠️ = mehr als 20% erwartete Häufigkeiten unter 5")
+
+
+if __name__ == "__main__":
+    main()
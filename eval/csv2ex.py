@@ -1,83 +1,199 @@
+import argparse
+import os
+import re
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl import Workbook
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from artifacts import stable_output
+from bitmap_index import SurveyBitmapIndex
+from compact_dtypes import (
+    NOT_SELECTED_VALUES,
+    compact_dtypes,
+    format_memory_summary,
+)
+
+from schemas import Column, Schema, validate
+from shared_frames import run_with_shared_frame
+from sketches import CountMinSketch, HyperLogLog, SpaceSaving
+from store import EvalStore
+from survey_io import find_survey_exports, iter_survey_chunks, read_survey_export
+from text_analysis import analyze_answers, count_terms
+
+# Define column mappings for clear, German headers
+COLUMN_MAPPINGS = {
+    "Response ID": "Antwort-ID",
+    "Which role best describes your position?": "Rolle",
+    "Which Framework are you using in your current project?": "Framework",
+    "How would you estimate the proportion of reused components from libraries compared to individually created components in your projects?": "Komponenten-Verhältnis",
+    "How much time do you spend on average per sprint (~3 weeks) adapting or overriding components from standard libraries?": "Zeitaufwand pro Sprint",
+    "How often do you need to completely reimplement components that already exist in a library to fulfill client requirements?": "Neuimplementierung Häufigkeit",
+    "How satisfied are you overall with the currently available UI component libraries for enterprise projects?": "Zufriedenheit (1-5)",
+    "If you could develop your own component library for your project / Capgemini-wide, which of the following approaches would interest you the most?": "Bevorzugter Ansatz",
+    "Do you work on projects with multiple frontend frameworks simultaneously?": "Multi-Framework Arbeit",
+}
+
+# Multiple choice questions (one column per option)
+MULTIPLE_CHOICE_QUESTIONS = {
+    "Which UI component libraries are you currently using or have used in enterprise projects within the last 2 years?": "Verwendete UI Libraries",
+    "What are the biggest challenges when using UI component libraries in the customer projects you were a part of?": "Größte Herausforderungen",
+    "Which accessibility standards do you need to meet in your projects?": "Accessibility Standards",
+    "How do you currently test accessibility in your applications?": "Accessibility Testing",
+}
+
+IMPORTANCE_BASE_QUESTION = "Please rate the following aspects according to their importance for an ideal component library"
+
+# Add open-ended questions
+OPEN_QUESTIONS = {
+    "What is your biggest frustration when working with existing component libraries in enterprise projects?": "Größte Frustration",
+    "What innovative approaches or best practices have you found to overcome challenges with component libraries?": "Innovative Ansätze",
+    "What are your biggest challenges when implementing accessibility in client projects?": "Accessibility Herausforderungen",
+}
+
+# Footer statistic categories
+CATEGORICAL_COLUMNS = [
+    "Rolle",
+    "Framework",
+    "Komponenten-Verhältnis",
+    "Zeitaufwand pro Sprint",
+    "Neuimplementierung Häufigkeit",
+    "Bevorzugter Ansatz",
+    "Multi-Framework Arbeit",
+]
+RATING_COLUMNS = ["Zufriedenheit (1-5)"]
+MULTI_SELECT_COLUMNS = list(MULTIPLE_CHOICE_QUESTIONS.values())
+OPEN_TEXT_COLUMNS = list(OPEN_QUESTIONS.values())
+
+# Approximate footer (--approx): candidates per column and rows per chunk
+SKETCH_CAPACITY = 200
+SKETCH_CHUNK_SIZE = 50_000
+
+# Segmented appendix: from this many responses segments run in worker processes
+SEGMENT_PARALLEL_MIN_ROWS = 5000
+
+SATISFACTION_QUESTION = {
+    column: question for question, column in COLUMN_MAPPINGS.items()
+}["Zufriedenheit (1-5)"]
+
+# Contract of a raw export: only role and framework are mandatory, every other
+# question may be missing from a survey version but is checked when present
+SURVEY_SCHEMA = Schema(
+    "survey",
+    [Column("Response ID", required=False, nullable=False)]
+    + [
+        Column(question, required=column in ("Rolle", "Framework"))
+        for question, column in COLUMN_MAPPINGS.items()
+        if column not in ("Antwort-ID", "Zufriedenheit (1-5)")
+    ]
+    + [
+        Column(
+            SATISFACTION_QUESTION,
+            "integer",
+            required=False,
+            min_value=1,
+            max_value=5,
+        ),
+        Column(
+            IMPORTANCE_BASE_QUESTION,
+            "number",
+            required=False,
+            min_value=1,
+            max_value=5,
+            prefix=True,
+        ),
+    ]
+    + [
+        Column(question, required=False, prefix=True)
+        for question in MULTIPLE_CHOICE_QUESTIONS
+    ]
+    + [Column(question, required=False) for question in OPEN_QUESTIONS],
+    unique=["Response ID"],
+    check_renamed=True,
+)
 
 
-def process_survey_for_appendix(csv_file_path, excel_output_path):
-    """
-    Processes survey data into a single, appendix-ready table with statistics.
+def _option_name(col, base_question):
+    """Extract option name from column header"""
+    if "[" in col and "]" in col:
+        return col.split("[")[1].split("]")[0]
 
-    Args:
-        csv_file_path (str): Path to the input CSV file
-        excel_output_path (str): Path for the output Excel file
+    # Fallback extraction
+    option = col.replace(base_question, "").strip()
+    if option.startswith(" [") and option.endswith("]"):
+        option = option[2:-1]
+    return option
+
+
+def _selected_mask(values):
+    """Boolean mask of responses that selected the option of this column"""
+    if is_bool_dtype(values):
+        return values.fillna(False).astype(bool).to_numpy()
+
+    if is_numeric_dtype(values):
+        return (values.notna() & (values != 0)).fillna(False).to_numpy(dtype=bool)
+
+    # Text answers: anything but empty/"not selected"-like answers counts as selected
+    text = values.astype("string")
+    not_selected = text.str.lower().isin(NOT_SELECTED_VALUES) | (text == "")
+    return (values.notna() & ~not_selected.fillna(True)).to_numpy(dtype=bool)
+
+
+def _join_selected(parts):
+    """Join (mask, label) column pairs row-wise with semicolons"""
+    joined = None
+    for mask, labels in parts:
+        labels = np.where(mask, labels, "")
+        if joined is None:
+            joined = labels.astype(object)
+            continue
+        separator = np.where((joined != "") & mask, "; ", "")
+        joined = joined + separator + labels
+    return joined
+
+
+def extract_multiple_choice_selected(df, base_question):
+    """Extract only selected options from multiple choice questions"""
+    matching_cols = [col for col in df.columns if col.startswith(base_question)]
+
+    parts = [
+        (_selected_mask(df[col]), _option_name(col, base_question))
+        for col in matching_cols
+    ]
+
+    # Join with semicolons for compact display
+    if not parts:
+        return pd.Series("", name=base_question, index=df.index)
+    return pd.Series(_join_selected(parts), name=base_question, index=df.index)
+
+
+def load_survey_export(csv_file_path):
+    """Load a survey export with compact dtypes (categories, bools, Int8 ratings)"""
+    raw_df = validate(
+        read_survey_export(csv_file_path), SURVEY_SCHEMA, source=csv_file_path
+    )
+    df, memory_report = compact_dtypes(raw_df, SURVEY_SCHEMA)
+    print(f"🗜️  Survey memory: {format_memory_summary(raw_df, df)}")
+    return df, memory_report
+
+
+def decode_survey(df):
     """
+    Decodes a raw survey export into the appendix table (German headers).
 
-    # Load the CSV data
-    df = pd.read_csv(csv_file_path)
-
-    # Define column mappings for clear, German headers
-    column_mappings = {
-        "Response ID": "Antwort-ID",
-        "Which role best describes your position?": "Rolle",
-        "Which Framework are you using in your current project?": "Framework",
-        "How would you estimate the proportion of reused components from libraries compared to individually created components in your projects?": "Komponenten-Verhältnis",
-        "How much time do you spend on average per sprint (~3 weeks) adapting or overriding components from standard libraries?": "Zeitaufwand pro Sprint",
-        "How often do you need to completely reimplement components that already exist in a library to fulfill client requirements?": "Neuimplementierung Häufigkeit",
-        "How satisfied are you overall with the currently available UI component libraries for enterprise projects?": "Zufriedenheit (1-5)",
-        "If you could develop your own component library for your project / Capgemini-wide, which of the following approaches would interest you the most?": "Bevorzugter Ansatz",
-        "Do you work on projects with multiple frontend frameworks simultaneously?": "Multi-Framework Arbeit",
-    }
+    Args:
+        df (pd.DataFrame): Raw survey export as loaded from the CSV file
 
-    def extract_multiple_choice_selected(df, base_question):
-        """Extract only selected options from multiple choice questions"""
-        matching_cols = [col for col in df.columns if col.startswith(base_question)]
-
-        result_series = []
-
-        for idx, row in df.iterrows():
-            selected_options = []
-
-            for col in matching_cols:
-                value = row[col]
-
-                # Skip empty/nan values
-                if pd.isna(value) or value == "" or value == "Not selected":
-                    continue
-
-                # Extract option name from column header
-                if "[" in col and "]" in col:
-                    option = col.split("[")[1].split("]")[0]
-                else:
-                    # Fallback extraction
-                    option = col.replace(base_question, "").strip()
-                    if option.startswith(" [") and option.endswith("]"):
-                        option = option[2:-1]
-
-                # Check if this option is selected
-                if isinstance(value, str):
-                    if value.lower() in ["selected", "yes", "true", "1"]:
-                        selected_options.append(option)
-                    elif value.lower() not in ["not selected", "no", "false", "0", ""]:
-                        # If it's not a standard selection indicator, treat as selected
-                        selected_options.append(option)
-                elif (
-                    isinstance(value, (int, float))
-                    and not pd.isna(value)
-                    and value != 0
-                ):
-                    selected_options.append(option)
-
-            # Join with semicolons for compact display
-            result = "; ".join(selected_options) if selected_options else ""
-            result_series.append(result)
-
-        return pd.Series(result_series, name=base_question)
+    Returns:
+        pd.DataFrame: One row per response with decoded answers
+    """
 
     # Start with basic columns
-    result_df = pd.DataFrame()
+    result_df = pd.DataFrame(index=df.index)
 
     # Add Response ID if available
     if "Response ID" in df.columns:
@@ -86,169 +202,501 @@ def process_survey_for_appendix(csv_file_path, excel_output_path):
         result_df["Antwort-ID"] = range(1, len(df) + 1)
 
     # Add simple single-answer questions
-    for original_col, german_col in column_mappings.items():
+    for original_col, german_col in COLUMN_MAPPINGS.items():
         if original_col in df.columns and original_col != "Response ID":
             result_df[german_col] = df[original_col]
 
     # Process multiple choice questions
-    ui_libraries_question = "Which UI component libraries are you currently using or have used in enterprise projects within the last 2 years?"
-    if any(col.startswith(ui_libraries_question) for col in df.columns):
-        ui_libraries_series = extract_multiple_choice_selected(
-            df, ui_libraries_question
-        )
-        result_df["Verwendete UI Libraries"] = ui_libraries_series
-
-    challenges_question = "What are the biggest challenges when using UI component libraries in the customer projects you were a part of?"
-    if any(col.startswith(challenges_question) for col in df.columns):
-        challenges_series = extract_multiple_choice_selected(df, challenges_question)
-        result_df["Größte Herausforderungen"] = challenges_series
-
-    accessibility_standards_question = (
-        "Which accessibility standards do you need to meet in your projects?"
-    )
-    if any(col.startswith(accessibility_standards_question) for col in df.columns):
-        accessibility_standards_series = extract_multiple_choice_selected(
-            df, accessibility_standards_question
-        )
-        result_df["Accessibility Standards"] = accessibility_standards_series
-
-    accessibility_testing_question = (
-        "How do you currently test accessibility in your applications?"
-    )
-    if any(col.startswith(accessibility_testing_question) for col in df.columns):
-        accessibility_testing_series = extract_multiple_choice_selected(
-            df, accessibility_testing_question
-        )
-        result_df["Accessibility Testing"] = accessibility_testing_series
+    for question, german_col in MULTIPLE_CHOICE_QUESTIONS.items():
+        if any(col.startswith(question) for col in df.columns):
+            result_df[german_col] = extract_multiple_choice_selected(df, question)
 
     # Add importance ratings as a single column
-    importance_base_question = "Please rate the following aspects according to their importance for an ideal component library"
     importance_cols = [
-        col for col in df.columns if col.startswith(importance_base_question)
+        col for col in df.columns if col.startswith(IMPORTANCE_BASE_QUESTION)
     ]
 
     if importance_cols:
-        importance_ratings = []
-        for idx, row in df.iterrows():
-            ratings = []
-            for col in importance_cols:
-                value = row[col]
-                if pd.isna(value) or value == "":
-                    continue
-
-                # Extract aspect name
-                if "[" in col and "]" in col:
-                    aspect = col.split("[")[1].split("]")[0]
-                else:
-                    aspect = col.replace(importance_base_question, "").strip()
-
-                if isinstance(value, (int, float)) and not pd.isna(value):
-                    rating_map = {
-                        1: "unwichtig",
-                        2: "eher unwichtig",
-                        3: "nice to have",
-                        4: "wichtig",
-                        5: "sehr wichtig",
-                    }
-                    rating_text = rating_map.get(int(value), str(int(value)))
-                    ratings.append(f"{aspect}: {rating_text}")
-
-            importance_ratings.append("; ".join(ratings) if ratings else "")
-
-        result_df["Wichtigkeits-Bewertungen"] = importance_ratings
-
-    # Add open-ended questions
-    open_questions = {
-        "What is your biggest frustration when working with existing component libraries in enterprise projects?": "Größte Frustration",
-        "What innovative approaches or best practices have you found to overcome challenges with component libraries?": "Innovative Ansätze",
-        "What are your biggest challenges when implementing accessibility in client projects?": "Accessibility Herausforderungen",
-    }
+        rating_map = {
+            1: "unwichtig",
+            2: "eher unwichtig",
+            3: "nice to have",
+            4: "wichtig",
+            5: "sehr wichtig",
+        }
+
+        parts = []
+        for col in importance_cols:
+            # Only numeric ratings are reported
+            if not is_numeric_dtype(df[col]) or is_bool_dtype(df[col]):
+                continue
+
+            # Extract aspect name
+            if "[" in col and "]" in col:
+                aspect = col.split("[")[1].split("]")[0]
+            else:
+                aspect = col.replace(IMPORTANCE_BASE_QUESTION, "").strip()
+
+            ratings = df[col]
+            rated = ratings.notna().to_numpy()
+            rating_values = ratings.fillna(0).astype(int)
+            rating_text = rating_values.map(
+                lambda value: rating_map.get(value, str(value))
+            )
+            parts.append((rated, (f"{aspect}: " + rating_text).to_numpy(dtype=object)))
 
-    for original_col, german_col in open_questions.items():
+        if parts:
+            result_df["Wichtigkeits-Bewertungen"] = _join_selected(parts)
+        else:
+            result_df["Wichtigkeits-Bewertungen"] = ""
+
+    for original_col, german_col in OPEN_QUESTIONS.items():
         if original_col in df.columns:
             result_df[german_col] = df[original_col]
 
-    # Calculate statistics for footer
-    stats_data = []
+    return result_df.reset_index(drop=True)
+
+
+def collect_footer_aggregates(result_df, index=None):
+    """
+    Collects the mergeable counts behind the statistics footer.
+
+    Args:
+        result_df (pd.DataFrame): Decoded survey table (see ``decode_survey``)
+        index (SurveyBitmapIndex): Bitmap index of ``result_df``; answer
+            counts of categorical and multiple choice columns are read from
+            it (built if not given)
+
+    Returns:
+        dict: Per column the number of non-empty responses, answer counts
+        (categorical and multiple choice), the term sketch and its top
+        counts with their errors (open questions) and rating sum/count.
+        Counts are in order of first appearance, which ``format_footer_stats``
+        keeps for ties
+    """
+    if index is None:
+        index = SurveyBitmapIndex.from_decoded(result_df)
+
+    aggregates = {}
 
     for col in result_df.columns:
         if col == "Antwort-ID":
             continue
 
+        if col in index.columns:
+            aggregates[col] = {
+                "responses": index.answered[col].count(),
+                "counts": index.counts(col, sort=False),
+                "rating_sum": 0.0,
+                "rating_count": 0,
+            }
+            continue
+
         # Count non-empty responses
         non_empty = result_df[col].dropna()
         non_empty = non_empty[non_empty != ""]
-        total_responses = len(non_empty)
+
+        entry = {
+            "responses": len(non_empty),
+            "counts": {},
+            "rating_sum": 0.0,
+            "rating_count": 0,
+        }
+
+        if col in CATEGORICAL_COLUMNS:
+            value_counts = non_empty.value_counts(sort=False)
+            entry["counts"] = value_counts[value_counts > 0].to_dict()
+
+        elif col in RATING_COLUMNS:
+            numeric_values = pd.to_numeric(non_empty, errors="coerce").dropna()
+            entry["rating_sum"] = float(numeric_values.sum())
+            entry["rating_count"] = len(numeric_values)
+
+        elif col in MULTI_SELECT_COLUMNS:
+            selections = non_empty.astype(str).str.split(";").explode().str.strip()
+            entry["counts"] = (
+                selections[selections != ""].value_counts(sort=False).to_dict()
+            )
+
+        elif col in OPEN_TEXT_COLUMNS:
+            # Bounded term sketch; the store merges it across waves
+            entry["terms"] = analyze_answers(non_empty)
+            entry["counts"], entry["count_errors"] = entry["terms"].footer_counts()
+
+        aggregates[col] = entry
+
+    return aggregates
+
+
+def format_footer_stats(aggregates, total_rows):
+    """
+    Formats footer statistics from collected aggregates.
+
+    Args:
+        aggregates (dict): Output of ``collect_footer_aggregates`` (or merged
+            equivalent, e.g. ``FooterSketch.to_aggregates``)
+        total_rows (int): Number of responses in the table
+
+    Returns:
+        list: One footer cell per column (without the Antwort-ID column)
+    """
+    stats_data = []
+
+    for col, entry in aggregates.items():
+        total_responses = entry["responses"]
 
         if total_responses == 0:
             stats_data.append("")
             continue
 
-        # For categorical data, show top 3 responses
-        if col in [
-            "Rolle",
-            "Framework",
-            "Komponenten-Verhältnis",
-            "Zeitaufwand pro Sprint",
-            "Neuimplementierung Häufigkeit",
-            "Bevorzugter Ansatz",
-            "Multi-Framework Arbeit",
-        ]:
-            value_counts = non_empty.value_counts()
-            if len(value_counts) > 0:
+        # For categorical data and multiple choice questions, show top 3 responses
+        # (stable sort: ties stay in order of first appearance)
+        if col in CATEGORICAL_COLUMNS or col in MULTI_SELECT_COLUMNS:
+            top_counts = sorted(entry["counts"].items(), key=lambda item: -item[1])[:3]
+            if top_counts:
                 top_responses = []
-                for i, (response, count) in enumerate(value_counts.head(3).items()):
+                for response, count in top_counts:
                     percentage = (count / total_responses) * 100
                     top_responses.append(
                         f"{response} ({percentage:.1f}%)".replace(".", ",")
                     )
-                stats_data.append("Top 3:\n" + "\n".join(top_responses))
+
+                # Sketch-based counts carry an upper bound on their error
+                count_errors = entry.get("count_errors", {})
+                max_error = max(
+                    (count_errors.get(response, 0) for response, _ in top_counts),
+                    default=0,
+                )
+                header = "Top 3:"
+                if max_error > 0:
+                    error_percentage = max_error / total_responses * 100
+                    header = f"Top 3 (≈, ±{error_percentage:.1f}%):".replace(".", ",")
+                stats_data.append(header + "\n" + "\n".join(top_responses))
             else:
                 stats_data.append("")
 
         # For satisfaction rating, calculate average
-        elif col == "Zufriedenheit (1-5)":
-            try:
-                numeric_values = pd.to_numeric(non_empty, errors="coerce").dropna()
-                if len(numeric_values) > 0:
-                    avg_rating = numeric_values.mean()
-                    stats_data.append(
-                        f"Durchschnitt: {avg_rating:.2f}".replace(".", ",")
-                    )
-                else:
-                    stats_data.append("")
-            except:
-                stats_data.append("")
-
-        # For multiple choice questions, show top 3 selections
-        elif col in [
-            "Verwendete UI Libraries",
-            "Größte Herausforderungen",
-            "Accessibility Standards",
-            "Accessibility Testing",
-        ]:
-            all_selections = []
-            for response in non_empty:
-                if response and response != "":
-                    selections = [s.strip() for s in response.split(";") if s.strip()]
-                    all_selections.extend(selections)
-
-            if all_selections:
-                selection_counts = pd.Series(all_selections).value_counts().head(3)
-                top_selections = []
-                for selection, count in selection_counts.items():
-                    percentage = (count / total_responses) * 100
-                    top_selections.append(
-                        f"{selection} ({percentage:.1f}%)".replace(".", ",")
-                    )
-                stats_data.append("Top 3:\n" + "\n".join(top_selections))
+        elif col in RATING_COLUMNS:
+            if entry["rating_count"] > 0:
+                avg_rating = entry["rating_sum"] / entry["rating_count"]
+                stats_data.append(f"Durchschnitt: {avg_rating:.2f}".replace(".", ","))
             else:
                 stats_data.append("")
 
-        # For text fields, show response rate
+        # For text fields, show response rate (and top terms for open questions)
+        else:
+            response_rate = (total_responses / total_rows) * 100
+            stat = f"Antwortrate: {response_rate:.1f}%".replace(".", ",")
+
+            top_terms = sorted(entry["counts"].items(), key=lambda item: -item[1])[:3]
+            if top_terms:
+                # Sketched term counts are upper bounds with an error each
+                count_errors = entry.get("count_errors", {})
+                max_error = max(count_errors.get(term, 0) for term, _ in top_terms)
+                header = "Top Begriffe:"
+                if max_error > 0:
+                    header = f"Top Begriffe (≈, ±{max_error}x):"
+                stat += f"\n{header}\n" + "\n".join(
+                    f"{term} ({count}x)" for term, count in top_terms
+                )
+            stats_data.append(stat)
+
+    return stats_data
+
+
+class FooterSketch:
+    """
+    Bounded-memory, mergeable counterpart of ``collect_footer_aggregates``.
+
+    Answer and term counts are kept in Space-Saving summaries (top-k
+    candidates) backed by Count-Min sketches (frequency upper bounds);
+    distinct respondents are counted with HyperLogLog. Response counts and
+    rating sums stay exact.
+    """
+
+    def __init__(self, capacity=SKETCH_CAPACITY, width=2048, depth=5):
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+        self.rows = 0
+        self.respondents = HyperLogLog()
+        self.columns = {}
+
+    def _column(self, col):
+        if col not in self.columns:
+            self.columns[col] = {
+                "responses": 0,
+                "rating_sum": 0.0,
+                "rating_count": 0,
+                "top": SpaceSaving(self.capacity),
+                "frequencies": CountMinSketch(self.width, self.depth),
+            }
+        return self.columns[col]
+
+    def update(self, result_df, source_has_ids=True):
+        """Add a chunk of the decoded survey table (see ``decode_survey``)"""
+        self.rows += len(result_df)
+        if source_has_ids:
+            self.respondents.update(result_df["Antwort-ID"].astype(str))
+
+        for col in result_df.columns:
+            if col == "Antwort-ID":
+                continue
+
+            non_empty = result_df[col].dropna()
+            non_empty = non_empty[non_empty != ""]
+            entry = self._column(col)
+            entry["responses"] += len(non_empty)
+
+            counts = {}
+            if col in CATEGORICAL_COLUMNS:
+                value_counts = non_empty.astype(str).value_counts()
+                counts = value_counts[value_counts > 0].to_dict()
+            elif col in RATING_COLUMNS:
+                numeric_values = pd.to_numeric(non_empty, errors="coerce").dropna()
+                entry["rating_sum"] += float(numeric_values.sum())
+                entry["rating_count"] += len(numeric_values)
+            elif col in MULTI_SELECT_COLUMNS:
+                selections = non_empty.astype(str).str.split(";").explode().str.strip()
+                counts = selections[selections != ""].value_counts().to_dict()
+            elif col in OPEN_TEXT_COLUMNS:
+                counts = count_terms(non_empty)
+
+            if counts:
+                entry["top"].update_counts(counts)
+                entry["frequencies"].update_counts(counts)
+        return self
+
+    def merge(self, other):
+        """Combine with another sketch (in place)"""
+        self.rows += other.rows
+        self.respondents.merge(other.respondents)
+        for col, other_entry in other.columns.items():
+            entry = self._column(col)
+            entry["responses"] += other_entry["responses"]
+            entry["rating_sum"] += other_entry["rating_sum"]
+            entry["rating_count"] += other_entry["rating_count"]
+            entry["top"].merge(other_entry["top"])
+            entry["frequencies"].merge(other_entry["frequencies"])
+        return self
+
+    def to_aggregates(self, top_k=10):
+        """
+        Aggregates in the format of ``collect_footer_aggregates``.
+
+        ``counts`` holds the ``top_k`` candidates with the tighter of both
+        upper bounds; ``count_errors`` bounds how far each count may exceed
+        the true frequency.
+        """
+        aggregates = {}
+        for col, entry in self.columns.items():
+            candidates = entry["top"].top(top_k)
+            estimates = entry["frequencies"].estimate(item for item, _, _ in candidates)
+            counts, count_errors = {}, {}
+            for (item, count, error), estimate in zip(candidates, estimates):
+                counts[item] = int(min(count, estimate))
+                count_errors[item] = int(counts[item] - (count - error))
+            aggregates[col] = {
+                "responses": entry["responses"],
+                "counts": counts,
+                "count_errors": count_errors,
+                "rating_sum": entry["rating_sum"],
+                "rating_count": entry["rating_count"],
+            }
+        return aggregates
+
+
+def sketch_survey_export(path, chunksize=SKETCH_CHUNK_SIZE):
+    """Single streaming pass over one export, decoding chunk by chunk"""
+    sketch = FooterSketch()
+    for chunk in iter_survey_chunks(path, chunksize):
+        validate(chunk, SURVEY_SCHEMA, source=path)
+        sketch.update(decode_survey(chunk), "Response ID" in chunk.columns)
+    return sketch
+
+
+def sketch_survey_exports(paths, chunksize=SKETCH_CHUNK_SIZE, max_workers=None):
+    """Sketch several exports in parallel (one worker per file) and merge"""
+    paths = list(paths)
+    sketch = FooterSketch()
+    if len(paths) > 1:
+        workers = min(max_workers or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(
+                sketch_survey_export, paths, [chunksize] * len(paths)
+            ):
+                sketch.merge(partial)
+    elif paths:
+        sketch = sketch_survey_export(paths[0], chunksize)
+    return sketch
+
+
+def process_survey_approximate(csv_file_paths, excel_output_path):
+    """
+    Approximate footer statistics for pooled exports too large for memory.
+
+    Writes one row per column with its footer statistic instead of the full
+    appendix table.
+
+    Args:
+        csv_file_paths (list): Survey exports (pooled), see survey_io.py
+        excel_output_path (str): Path for the output Excel file
+    """
+    sketch = sketch_survey_exports(csv_file_paths)
+    aggregates = sketch.to_aggregates()
+    stats_data = format_footer_stats(aggregates, sketch.rows)
+
+    respondents = sketch.respondents.estimate()
+    error = sketch.respondents.relative_error * 100
+    respondents_text = f"≈ {respondents:,.0f}".replace(",", ".") + (
+        f" (±{error:.1f}%)".replace(".", ",")
+    )
+    summary_df = pd.DataFrame(
+        {
+            "Spalte": ["Antworten", "Eindeutige Antwort-IDs", *aggregates],
+            "Statistik": [
+                str(sketch.rows),
+                respondents_text,
+                *stats_data,
+            ],
+        }
+    )
+    with stable_output(excel_output_path) as buffer:
+        summary_df.to_excel(buffer, index=False)
+
+    print(f"📊 {sketch.rows} Antworten aus {len(csv_file_paths)} Exporten")
+    print(f"👥 Eindeutige Antwort-IDs: {respondents_text}")
+    print(f"📁 Output saved to: {excel_output_path}")
+
+    return summary_df
+
+
+def write_appendix_sheet(writer, final_df, stats_row, sheet_name="Umfrageergebnisse"):
+    """
+    Writes the appendix table with its statistics row to one formatted sheet.
+
+    Args:
+        writer (pd.ExcelWriter): Open openpyxl writer
+        final_df (pd.DataFrame): Decoded survey table
+        stats_row (list): Footer row including the "STATISTIKEN" label
+        sheet_name (str): Name of the worksheet
+    """
+
+    # Write main data
+    final_df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    # Get the worksheet
+    worksheet = writer.sheets[sheet_name]
+
+    # Add statistics row
+    stats_row_index = len(final_df) + 3  # Leave a gap
+    for col_idx, stat in enumerate(stats_row):
+        cell = worksheet.cell(row=stats_row_index, column=col_idx + 1)
+        cell.value = stat
+        cell.alignment = Alignment(
+            wrap_text=True, vertical="top"
+        )  # Enable wrap text for statistics
+        if col_idx == 0:  # First column header
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill(
+                start_color="E6E6E6", end_color="E6E6E6", fill_type="solid"
+            )
         else:
-            response_rate = (total_responses / len(result_df)) * 100
-            stats_data.append(f"Antwortrate: {response_rate:.1f}%".replace(".", ","))
+            cell.font = Font(size=9)
+
+    # Set row height for statistics row to accommodate multiple lines
+    worksheet.row_dimensions[stats_row_index].height = 60
+
+    # Format the worksheet
+    # Auto-adjust column widths
+    for column in worksheet.columns:
+        max_length = 0
+        column_letter = column[0].column_letter
+
+        for cell in column:
+            try:
+                # Handle multi-line content
+                cell_value = str(cell.value) if cell.value else ""
+                # For statistics row, limit display length
+                if cell.row == stats_row_index and len(cell_value) > 100:
+                    cell_value = cell_value[:100] + "..."
+
+                lines = (
+                    cell_value.split("\n")
+                    if "\n" in cell_value
+                    else cell_value.split(";")
+                )
+                max_line_length = max([len(line) for line in lines]) if lines else 0
+
+                if max_line_length > max_length:
+                    max_length = max_line_length
+            except:
+                pass
+
+        # Set reasonable column width limits
+        adjusted_width = min(max(max_length + 2, 15), 60)
+        worksheet.column_dimensions[column_letter].width = adjusted_width
+
+    # Format header row
+    for cell in worksheet[1]:
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill(
+            start_color="D9E2F3", end_color="D9E2F3", fill_type="solid"
+        )
+        cell.alignment = Alignment(wrap_text=True, vertical="top")
+
+    # Format data rows
+    for row in worksheet.iter_rows(min_row=2, max_row=len(final_df) + 1):
+        for cell in row:
+            cell.alignment = Alignment(wrap_text=True, vertical="top")
+
+    # Add borders
+    thin_border = Border(
+        left=Side(style="thin"),
+        right=Side(style="thin"),
+        top=Side(style="thin"),
+        bottom=Side(style="thin"),
+    )
+
+    for row in worksheet.iter_rows(min_row=1, max_row=len(final_df) + 1):
+        for cell in row:
+            cell.border = thin_border
+
+
+def write_appendix_workbook(final_df, stats_row, excel_output_path):
+    """
+    Writes the appendix table with its statistics row to a formatted Excel file.
+
+    Args:
+        final_df (pd.DataFrame): Decoded survey table
+        stats_row (list): Footer row including the "STATISTIKEN" label
+        excel_output_path (str): Path for the output Excel file
+    """
+
+    # Save to Excel with formatting
+    with stable_output(excel_output_path) as buffer, pd.ExcelWriter(
+        buffer, engine="openpyxl"
+    ) as writer:
+        write_appendix_sheet(writer, final_df, stats_row)
+
+
+def process_survey_for_appendix(csv_file_path, excel_output_path):
+    """
+    Processes survey data into a single, appendix-ready table with statistics.
+
+    Args:
+        csv_file_path (str): Path to the survey export (CSV, .csv.gz/.zst, .xlsx)
+        excel_output_path (str): Path for the output Excel file
+    """
+
+    # Load the CSV data
+    df, _ = load_survey_export(csv_file_path)
+
+    result_df = decode_survey(df)
+
+    # Calculate statistics for footer
+    aggregates = collect_footer_aggregates(result_df)
+    stats_data = format_footer_stats(aggregates, len(result_df))
 
     # Add statistics row
     stats_row = ["STATISTIKEN"] + stats_data
@@ -256,89 +704,188 @@ def process_survey_for_appendix(csv_file_path, excel_output_path):
     # Create final dataframe with statistics
     final_df = result_df.copy()
 
-    # Save to Excel with formatting
-    with pd.ExcelWriter(excel_output_path, engine="openpyxl") as writer:
-        # Write main data
-        final_df.to_excel(writer, sheet_name="Umfrageergebnisse", index=False)
-
-        # Get the worksheet
-        worksheet = writer.sheets["Umfrageergebnisse"]
-
-        # Add statistics row
-        stats_row_index = len(final_df) + 3  # Leave a gap
-        for col_idx, stat in enumerate(stats_row):
-            cell = worksheet.cell(row=stats_row_index, column=col_idx + 1)
-            cell.value = stat
-            cell.alignment = Alignment(
-                wrap_text=True, vertical="top"
-            )  # Enable wrap text for statistics
-            if col_idx == 0:  # First column header
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(
-                    start_color="E6E6E6", end_color="E6E6E6", fill_type="solid"
+    write_appendix_workbook(final_df, stats_row, excel_output_path)
+
+    print(f"✅ Survey data processed for appendix!")
+    print(f"📁 Output saved to: {excel_output_path}")
+
+    return final_df
+
+
+def _safe_name(value, max_length):
+    """Sheet/file name without characters Excel and file systems reject"""
+    name = re.sub(r'[\\/*?:\[\]<>|"]', "_", str(value)).strip() or "Leer"
+    return name[:max_length]
+
+
+def _unique_names(values, max_length):
+    """
+    Safe, distinct sheet/file names for segment values.
+
+    Names that collide after sanitizing or truncation (case-insensitive, as
+    in Excel and on Windows) get a counter suffix "_2", "_3", ...
+
+    Returns:
+        dict: Value -> name of at most ``max_length`` characters
+    """
+    names = {}
+    taken = set()
+    for value in values:
+        base = _safe_name(value, max_length)
+        name, counter = base, 1
+        while name.lower() in taken:
+            counter += 1
+            suffix = f"_{counter}"
+            name = base[: max_length - len(suffix)] + suffix
+        taken.add(name.lower())
+        names[value] = name
+    return names
+
+
+def segment_footer(result_df, indices, excel_output_path=None):
+    """
+    Footer statistics (and optionally the workbook) of one segment.
+
+    Runs in a worker process on the shared decoded table.
+
+    Returns:
+        list: Footer row including the "STATISTIKEN" label
+    """
+    segment_df = result_df.iloc[indices].reset_index(drop=True)
+    aggregates = collect_footer_aggregates(segment_df)
+    stats_row = ["STATISTIKEN"] + format_footer_stats(aggregates, len(segment_df))
+    if excel_output_path is not None:
+        write_appendix_workbook(segment_df, stats_row, excel_output_path)
+    return stats_row
+
+
+def process_survey_segmented(
+    csv_file_path, excel_output_path, segment_by, separate_workbooks=False
+):
+    """
+    Appendix tables split by a column, e.g. "Rolle", "Framework" or a client column.
+
+    The export is decoded once; rows are partitioned by ``segment_by`` and
+    every segment's footer statistics (and workbook) are computed in worker
+    processes sharing the decoded table.
+
+    Args:
+        csv_file_path (str): Path to the survey export (CSV, .csv.gz/.zst, .xlsx)
+        excel_output_path (str): Output workbook (one sheet per segment) or,
+            with ``separate_workbooks``, output directory (one file per segment)
+        segment_by (str): Decoded (German) or raw export column to split by
+        separate_workbooks (bool): Write one workbook per segment
+
+    Returns:
+        dict: Segment name -> number of responses
+    """
+    df, _ = load_survey_export(csv_file_path)
+    result_df = decode_survey(df)
+
+    if segment_by in result_df.columns:
+        keys = result_df[segment_by]
+    elif segment_by in df.columns:
+        keys = df[segment_by].reset_index(drop=True)
+    else:
+        raise ValueError(f"Segmentierungsspalte '{segment_by}' nicht gefunden")
+
+    keys = keys.astype(object).where(keys.notna(), "Keine Angabe").astype(str)
+    segments = {
+        name: indices for name, indices in keys.groupby(keys, sort=True).indices.items()
+    }
+
+    output_paths = {name: None for name in segments}
+    if separate_workbooks:
+        output_dir = Path(excel_output_path)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        file_names = _unique_names(segments, 100)
+        output_paths = {
+            name: str(output_dir / f"{file_names[name]}.xlsx") for name in segments
+        }
+
+    calls = [
+        (segment_footer, (segments[name], output_paths[name])) for name in segments
+    ]
+    if len(segments) > 1 and len(result_df) >= SEGMENT_PARALLEL_MIN_ROWS:
+        stats_rows = run_with_shared_frame(result_df, calls)
+    else:
+        stats_rows = [func(result_df, *args) for func, args in calls]
+
+    if not separate_workbooks:
+        # openpyxl cannot write one workbook from several processes
+        sheet_names = _unique_names(segments, 31)
+        with stable_output(excel_output_path) as buffer, pd.ExcelWriter(
+            buffer, engine="openpyxl"
+        ) as writer:
+            for (name, indices), stats_row in zip(segments.items(), stats_rows):
+                write_appendix_sheet(
+                    writer,
+                    result_df.iloc[indices].reset_index(drop=True),
+                    stats_row,
+                    sheet_names[name],
                 )
-            else:
-                cell.font = Font(size=9)
-
-        # Set row height for statistics row to accommodate multiple lines
-        worksheet.row_dimensions[stats_row_index].height = 60
-
-        # Format the worksheet
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-
-            for cell in column:
-                try:
-                    # Handle multi-line content
-                    cell_value = str(cell.value) if cell.value else ""
-                    # For statistics row, limit display length
-                    if cell.row == stats_row_index and len(cell_value) > 100:
-                        cell_value = cell_value[:100] + "..."
-
-                    lines = (
-                        cell_value.split("\n")
-                        if "\n" in cell_value
-                        else cell_value.split(";")
-                    )
-                    max_line_length = max([len(line) for line in lines]) if lines else 0
 
-                    if max_line_length > max_length:
-                        max_length = max_line_length
-                except:
-                    pass
+    counts = {name: len(indices) for name, indices in segments.items()}
+    print(f"✅ {len(segments)} Segmente nach '{segment_by}' erstellt:")
+    for name, count in counts.items():
+        print(f"   • {name}: {count} Antworten")
+    print(f"📁 Output saved to: {excel_output_path}")
 
-            # Set reasonable column width limits
-            adjusted_width = min(max(max_length + 2, 15), 60)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    return counts
 
-        # Format header row
-        for cell in worksheet[1]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(
-                start_color="D9E2F3", end_color="D9E2F3", fill_type="solid"
-            )
-            cell.alignment = Alignment(wrap_text=True, vertical="top")
 
-        # Format data rows
-        for row in worksheet.iter_rows(min_row=2, max_row=len(final_df) + 1):
-            for cell in row:
-                cell.alignment = Alignment(wrap_text=True, vertical="top")
-
-        # Add borders
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
+def process_survey_wave(csv_file_path, excel_output_path, store):
+    """
+    Appends a survey export as a new wave to the store and rebuilds the appendix.
+
+    Only responses whose Response ID is not stored yet, or whose answers
+    changed since they were stored, are decoded and upserted; the footer
+    statistics are formatted from the aggregates kept in the store, so earlier
+    waves are only reprocessed when a wave edits stored responses.
+
+    Args:
+        csv_file_path (str): Path to the survey export (new or cumulative)
+        excel_output_path (str): Path for the output Excel file
+        store (EvalStore): Evaluation data store holding previous waves
+    """
+
+    df, _ = load_survey_export(csv_file_path)
+
+    if "Response ID" not in df.columns:
+        raise ValueError(
+            f"'{csv_file_path}' has no 'Response ID' column to deduplicate waves"
         )
 
-        for row in worksheet.iter_rows(min_row=1, max_row=len(final_df) + 1):
-            for cell in row:
-                cell.border = thin_border
+    df = df.drop_duplicates(subset="Response ID")
+    is_new, is_edited = store.changed_responses(df)
+    changed_df = df[is_new | is_edited]
 
-    print(f"✅ Survey data processed for appendix!")
+    if len(changed_df) > 0:
+        store.append_survey_wave(
+            Path(csv_file_path).name,
+            changed_df,
+            decode_survey(changed_df),
+            collect_footer_aggregates,
+        )
+
+    unchanged = len(df) - len(changed_df)
+    print(
+        f"🆕 New responses: {int(is_new.sum())}, edited: {int(is_edited.sum())} "
+        f"(unchanged: {unchanged})"
+    )
+
+    final_df = store.read_decoded_survey()
+
+    # Footer statistics from stored aggregates instead of the full history
+    stored_aggregates = store.read_footer_aggregates()
+    aggregates = {
+        col: stored_aggregates[col] for col in final_df.columns if col != "Antwort-ID"
+    }
+    stats_row = ["STATISTIKEN"] + format_footer_stats(aggregates, len(final_df))
+
+    write_appendix_workbook(final_df, stats_row, excel_output_path)
+
+    print(f"✅ Survey wave added to appendix ({len(final_df)} responses total)!")
     print(f"📁 Output saved to: {excel_output_path}")
 
     return final_df
@@ -347,18 +894,56 @@ def process_survey_for_appendix(csv_file_path, excel_output_path):
 def main():
     """Main function to process survey data for appendix"""
 
-    csv_file = "results-survey.csv"
+    parser = argparse.ArgumentParser(description="Survey export to appendix table")
+    parser.add_argument(
+        "--approx",
+        nargs="+",
+        metavar="EXPORT",
+        help="Approximate footer statistics over pooled exports (streaming)",
+    )
+    parser.add_argument(
+        "--segment-by",
+        metavar="SPALTE",
+        help='Appendix split by a column, e.g. "Rolle" or "Framework"',
+    )
+    parser.add_argument(
+        "--workbooks",
+        action="store_true",
+        help="One workbook per segment instead of one sheet per segment",
+    )
+    args = parser.parse_args()
+
+    if args.approx:
+        process_survey_approximate(args.approx, "survey_results_summary_approx.xlsx")
+        return
+
     excel_file = "survey_results_appendix.xlsx"
 
-    if not Path(csv_file).exists():
-        print(f"❌ Error: CSV file '{csv_file}' not found!")
+    # results-survey.csv, .csv.gz, .csv.zst or .xlsx
+    exports = find_survey_exports(".", stem="results-survey")
+    if not exports:
+        print(f"❌ Error: Survey export 'results-survey.*' not found!")
         print("Available files:")
-        for file in Path(".").glob("*.csv"):
-            print(f"  - {file.name}")
+        for file in find_survey_exports("."):
+            if file.name != excel_file:
+                print(f"  - {file.name}")
+        return
+    csv_file = exports[0]
+
+    if args.segment_by:
+        suffix = _safe_name(args.segment_by, 50).lower()
+        output = f"survey_results_appendix_{suffix}"
+        process_survey_segmented(
+            csv_file,
+            output if args.workbooks else f"{output}.xlsx",
+            args.segment_by,
+            separate_workbooks=args.workbooks,
+        )
         return
 
     try:
-        result_df = process_survey_for_appendix(csv_file, excel_file)
+        with EvalStore() as store:
+            result_df = process_survey_wave(csv_file, excel_file, store)
         print(f"✨ Appendix-ready table created successfully!")
 
     except Exception as e:
@@ -0,0 +1,349 @@
+"""
+Dashboard Export - Offline HTML Dashboard from Pre-Aggregated Chart Data
+Bachelor Thesis: Component Libraries for Project Business
+
+Writes the aggregates behind the completion, experience group, lines of
+code and implementation time charts as compact JSON and embeds them into
+one self-contained HTML page (no external scripts or fonts) that draws the
+charts client-side as SVG. Stakeholders filter by task, experience group
+and library in the browser instead of waiting for 300 dpi renderings.
+
+Completion rates are stored as count, sum and sum of squares per task,
+experience group and library: every filter combination merges these cells
+into exact means and standard deviations, without shipping participants'
+individual rates. The JSON contains no timestamps, so unchanged data
+gives byte-identical files (see artifacts.py).
+
+Usage:
+    python dashboard.py [--output-dir output]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from artifacts import publish
+
+LIBRARIES = {"material": "Angular Material", "spade": "Spade"}
+COLORS = {"material": "#603DB1", "spade": "#06667E"}
+TASK_ORDER = ["Button", "Input", "Dropdown"]
+EXPERIENCE_ORDER = ["Studenten", "Junior", "Mid-Level", "Senior"]
+
+# Decimals kept in the JSON (sums of squares of percentages need more)
+DECIMALS = 4
+
+
+def _table(df):
+    """Columnar JSON layout: column names once, then one list per row"""
+    return {
+        "columns": list(df.columns),
+        "rows": df.round(DECIMALS)
+        .astype(object)
+        .where(df.notna(), None)
+        .values.tolist(),
+    }
+
+
+def completion_aggregates(df):
+    """Count, sum and sum of squares per task, experience group and library"""
+    long_df = df.melt(
+        id_vars=["task", "experience_group"],
+        value_vars=[f"{library}_completion" for library in LIBRARIES],
+        var_name="library",
+        value_name="completion",
+    ).dropna(subset=["completion"])
+    long_df["library"] = long_df["library"].str.removesuffix("_completion")
+    long_df["square"] = long_df["completion"] ** 2
+
+    cells = (
+        long_df.groupby(["task", "experience_group", "library"], observed=True)
+        .agg(
+            n=("completion", "count"),
+            sum=("completion", "sum"),
+            sum_squares=("square", "sum"),
+        )
+        .reset_index()
+    )
+    for col in ["task", "experience_group", "library"]:
+        cells[col] = cells[col].astype(str)
+    return cells
+
+
+def loc_aggregates(loc_df):
+    """Lines of code per task, library and type of change"""
+    return loc_df[["Task", "Library", "Type", "Lines"]].rename(
+        columns={"Task": "task", "Library": "library", "Type": "type", "Lines": "lines"}
+    )
+
+
+def time_aggregates(time_df):
+    """Mean and standard deviation of the implementation time per task and library"""
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "task": time_df["Task"],
+                    "library": library,
+                    "mean": time_df[label],
+                    "std": time_df[f"{label} Std"],
+                }
+            )
+            for library, label in LIBRARIES.items()
+        ],
+        ignore_index=True,
+    )
+
+
+def build_dashboard_data(completion_df, loc_df, time_df):
+    """All chart aggregates plus the labels and orders the page needs"""
+    return {
+        "libraries": LIBRARIES,
+        "colors": COLORS,
+        "tasks": TASK_ORDER,
+        "experience_groups": EXPERIENCE_ORDER,
+        "completion": _table(completion_aggregates(completion_df)),
+        "loc": _table(loc_aggregates(loc_df)),
+        "time": _table(time_aggregates(time_df)),
+    }
+
+
+def render_dashboard(data):
+    """Self-contained HTML page with the data embedded"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    # A "</script>" inside the data must not end the script element
+    return DASHBOARD_TEMPLATE.replace("__DATA__", payload.replace("</", "<\\/"))
+
+
+def main():
+    """Main function to export the interactive dashboard"""
+    from completion import load_completion_data
+    from dev_ex import load_data_from_csv
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output-dir", type=Path, default=Path("output"))
+    args = parser.parse_args()
+
+    completion_df = load_completion_data()
+    loc_df, time_df = load_data_from_csv()
+
+    started = time.perf_counter()
+    data = build_dashboard_data(completion_df, loc_df, time_df)
+    data_json = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    html = render_dashboard(data)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    publish(args.output_dir / "dashboard_data.json", data_json.encode("utf-8"))
+    publish(args.output_dir / "dashboard.html", html.encode("utf-8"))
+
+    print(
+        f"✓ Dashboard erstellt in {elapsed_ms:.1f}ms "
+        f"(Daten {len(data_json) / 1024:.1f} KB, Seite {len(html) / 1024:.1f} KB)"
+    )
+    print("\nErgebnisse gespeichert in:")
+    print(f"- {args.output_dir / 'dashboard_data.json'}")
+    print(f"- {args.output_dir / 'dashboard.html'}")
+
+
+DASHBOARD_TEMPLATE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Evaluation Angular Material vs. Spade</title>
+<style>
+  body { font-family: "DejaVu Sans", Arial, sans-serif; margin: 24px; color: #333; }
+  h1 { font-size: 22px; margin-bottom: 4px; }
+  .subtitle { color: #666; margin-bottom: 16px; }
+  .filters { display: flex; flex-wrap: wrap; gap: 24px; padding: 12px 16px;
+             background: #F3F0FA; border-radius: 6px; margin-bottom: 16px; }
+  .filters fieldset { border: none; margin: 0; padding: 0; }
+  .filters legend { font-weight: bold; margin-bottom: 4px; }
+  .filters label { margin-right: 12px; white-space: nowrap; }
+  .charts { display: grid; grid-template-columns: repeat(auto-fit, minmax(520px, 1fr));
+            gap: 16px; }
+  .chart { border: 1px solid #DDD; border-radius: 6px; padding: 12px; }
+  .chart h2 { font-size: 15px; margin: 0 0 8px; }
+  .empty { color: #999; font-style: italic; }
+  svg text { font-size: 11px; fill: #333; }
+  svg .value { font-weight: bold; fill: #FFF; }
+</style>
+</head>
+<body>
+<h1>Component Libraries for Project Business - Evaluation</h1>
+<div class="subtitle">Angular Material vs. Spade &middot; Filter wirken auf alle Diagramme</div>
+<div class="filters" id="filters"></div>
+<div class="charts">
+  <div class="chart"><h2>Erfüllungsrate nach Aufgabe (Mittelwert ± SD)</h2><div id="by-task"></div></div>
+  <div class="chart"><h2>Erfüllungsrate nach Erfahrungsgruppe (Mittelwert ± SD)</h2><div id="by-group"></div></div>
+  <div class="chart"><h2>Code-Aufwand (Zeilen)</h2><div id="loc"></div></div>
+  <div class="chart"><h2>Implementierungszeit (Minuten ± SD)</h2><div id="time"></div></div>
+</div>
+<script>
+const DATA = __DATA__;
+
+function records(table) {
+  return table.rows.map(row => Object.fromEntries(table.columns.map((c, i) => [c, row[i]])));
+}
+const completion = records(DATA.completion);
+const loc = records(DATA.loc);
+const time = records(DATA.time);
+const libraries = Object.keys(DATA.libraries);
+
+const dimensions = {
+  task: ["Aufgabe", DATA.tasks],
+  experience_group: ["Erfahrungsgruppe", DATA.experience_groups],
+  library: ["Bibliothek", libraries],
+};
+const selected = {};
+const filters = document.getElementById("filters");
+for (const [key, [title, values]] of Object.entries(dimensions)) {
+  selected[key] = new Set(values);
+  const fieldset = document.createElement("fieldset");
+  fieldset.innerHTML = `<legend>${title}</legend>`;
+  for (const value of values) {
+    const label = document.createElement("label");
+    const box = document.createElement("input");
+    box.type = "checkbox";
+    box.checked = true;
+    box.onchange = () => {
+      box.checked ? selected[key].add(value) : selected[key].delete(value);
+      render();
+    };
+    label.append(box, " " + (DATA.libraries[value] || value));
+    fieldset.append(label);
+  }
+  filters.append(fieldset);
+}
+
+// Merge count / sum / sum of squares cells into mean and SD
+function summarize(cells) {
+  const n = cells.reduce((a, c) => a + c.n, 0);
+  if (!n) return null;
+  const sum = cells.reduce((a, c) => a + c.sum, 0);
+  const squares = cells.reduce((a, c) => a + c.sum_squares, 0);
+  const mean = sum / n;
+  const sd = n > 1 ? Math.sqrt(Math.max(squares - sum * sum / n, 0) / (n - 1)) : 0;
+  return { n, mean, sd };
+}
+
+function format(value, digits = 1) {
+  return value.toFixed(digits).replace(".", ",");
+}
+
+// Grouped bar chart: one group per category, one bar (or stack) per series
+function barChart(target, categories, series, yLabel, suffix) {
+  const element = document.getElementById(target);
+  const shown = series.filter(s => s.values.some(v => v != null));
+  if (!categories.length || !shown.length) {
+    element.innerHTML = '<p class="empty">Keine Daten für diese Auswahl</p>';
+    return;
+  }
+  const width = 560, height = 320, left = 56, bottom = 40, top = 28;
+  const plotHeight = height - bottom - top;
+  const tops = shown.flatMap(s => s.values.map((v, i) =>
+    v == null ? 0 : v + (s.base ? s.base[i] : 0) + (s.errors ? s.errors[i] || 0 : 0)));
+  const yMax = Math.max(...tops) * 1.15 || 1;
+  const y = v => top + plotHeight * (1 - v / yMax);
+  const groupWidth = (width - left - 10) / categories.length;
+  // Series with the same slot are stacked on one bar
+  const slots = [...new Set(shown.map((s, k) => s.slot ?? k))];
+  const barWidth = groupWidth * 0.7 / slots.length;
+
+  let svg = `<svg viewBox="0 0 ${width} ${height}" width="100%">`;
+  for (let i = 0; i <= 4; i++) {
+    const value = yMax / 1.15 * i / 4;
+    svg += `<line x1="${left}" x2="${width - 10}" y1="${y(value)}" y2="${y(value)}" stroke="#EEE"/>`;
+    svg += `<text x="${left - 6}" y="${y(value) + 4}" text-anchor="end">${format(value, 0)}</text>`;
+  }
+  svg += `<text transform="translate(14 ${top + plotHeight / 2}) rotate(-90)" text-anchor="middle" font-weight="bold">${yLabel}</text>`;
+  categories.forEach((category, c) => {
+    const x0 = left + c * groupWidth + groupWidth * 0.15;
+    svg += `<text x="${left + (c + 0.5) * groupWidth}" y="${height - bottom + 18}" text-anchor="middle" font-weight="bold">${category}</text>`;
+    shown.forEach((s, k) => {
+      const value = s.values[c];
+      if (value == null) return;
+      const x = x0 + slots.indexOf(s.slot ?? k) * barWidth;
+      const base = s.base ? s.base[c] || 0 : 0;
+      svg += `<rect x="${x}" y="${y(base + value)}" width="${barWidth - 2}" height="${y(base) - y(base + value)}" fill="${s.color}" opacity="${s.opacity || 0.85}" stroke="#222"><title>${s.name}: ${format(value)}${suffix}</title></rect>`;
+      if (y(base) - y(base + value) > 16) {
+        svg += `<text class="value" x="${x + barWidth / 2 - 1}" y="${(y(base) + y(base + value)) / 2 + 4}" text-anchor="middle">${format(value)}</text>`;
+      }
+      const error = s.errors ? s.errors[c] : 0;
+      if (error) {
+        const cx = x + barWidth / 2 - 1;
+        svg += `<path d="M${cx} ${y(value - error)}V${y(value + error)}M${cx - 5} ${y(value - error)}h10M${cx - 5} ${y(value + error)}h10" stroke="#222"/>`;
+      }
+    });
+  });
+  shown.forEach((s, k) => {
+    const x = left + 10 + k * (width - left - 10) / shown.length;
+    svg += `<rect x="${x}" y="6" width="12" height="12" fill="${s.color}" opacity="${s.opacity || 0.85}"/>`;
+    svg += `<text x="${x + 17}" y="16">${s.name}</text>`;
+  });
+  element.innerHTML = svg + "</svg>";
+}
+
+function completionChart(target, dimension, categories) {
+  const cells = completion.filter(c =>
+    selected.task.has(c.task) && selected.experience_group.has(c.experience_group));
+  const series = libraries.filter(l => selected.library.has(l)).map(library => {
+    const stats = categories.map(category => summarize(cells.filter(c =>
+      c.library === library && c[dimension] === category)));
+    return {
+      name: DATA.libraries[library],
+      color: DATA.colors[library],
+      values: stats.map(s => s && s.mean),
+      errors: stats.map(s => s && s.sd),
+    };
+  });
+  barChart(target, categories, series, "Erfüllungsrate (%)", "%");
+}
+
+function render() {
+  const tasks = DATA.tasks.filter(t => selected.task.has(t));
+  completionChart("by-task", "task", tasks);
+  completionChart("by-group", "experience_group",
+    DATA.experience_groups.filter(g => selected.experience_group.has(g)));
+
+  // Stacked Spade changes + additions next to Angular Material overrides
+  const locSeries = [];
+  const types = [...new Set(loc.map(r => r.library + "|" + r.type))];
+  const bases = {};
+  for (const key of types) {
+    const [label, type] = key.split("|");
+    const library = libraries.find(l => DATA.libraries[l] === label);
+    if (!selected.library.has(library)) continue;
+    const values = tasks.map(task => {
+      const row = loc.find(r => r.task === task && r.library === label && r.type === type);
+      return row ? row.lines : null;
+    });
+    const base = bases[library] || tasks.map(() => 0);
+    locSeries.push({
+      name: type, color: DATA.colors[library], values, base,
+      opacity: base.some(v => v) ? 0.55 : 0.85, slot: library,
+    });
+    bases[library] = base.map((v, i) => v + (values[i] || 0));
+  }
+  barChart("loc", tasks, locSeries, "Zeilen Code", " Zeilen");
+
+  barChart("time", tasks, libraries.filter(l => selected.library.has(l)).map(library => {
+    const rows = tasks.map(task => time.find(r => r.task === task && r.library === library));
+    return {
+      name: DATA.libraries[library], color: DATA.colors[library],
+      values: rows.map(r => r ? r.mean : null), errors: rows.map(r => r ? r.std : null),
+    };
+  }), "Minuten", " min");
+}
+render();
+</script>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    main()
@@ -8,15 +8,25 @@ Generates scientific visualizations for:
 
 Uses Purple-Teal color palette and German labels.
 
+Usage:
+    python dev_ex.py [--trim 0.05 0.95]
+
 Author: Florian Kulig
 """
 
+import argparse
+
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 import pandas as pd
 from pathlib import Path
 
+from artifacts import save_figure, stable_output
+from chart_labels import format_numbers, label_bars
+from store import EvalStore
+from timing_logs import TIME_LOG_PATTERN, TIME_LOG_TRIM, summarize_time_logs
+
 # Scientific color scheme (purple-teal)
 COLORS = {
     "material_primary": "#603DB1",  # Deep purple
@@ -58,14 +68,29 @@ def setup_matplotlib():
     )
 
 
-def load_data_from_csv():
-    """Load evaluation data from CSV files"""
-    loc_df = pd.read_csv(Path(__file__).parent / "loc_data.csv")
-    time_df = pd.read_csv(Path(__file__).parent / "time_data.csv")
-    return loc_df, time_df
+def load_data_from_csv(trim=TIME_LOG_TRIM):
+    """
+    Load evaluation data from CSV files.
+
+    Args:
+        trim (tuple): Optional (lower, upper) quantiles to drop outliers when
+            the times are aggregated from raw timing logs
+    """
+    time_logs = sorted(Path(__file__).parent.glob(TIME_LOG_PATTERN))
+
+    with EvalStore() as store:
+        store.sync_loc_csv(Path(__file__).parent / "loc_data.csv")
+        loc_df = store.read_loc()
 
+        # Aggregate raw timing logs in one streaming pass if available
+        if time_logs:
+            return loc_df, summarize_time_logs(time_logs, trim=trim)
 
-def plot_lines_of_code(loc_df, output_dir):
+        store.sync_time_csv(Path(__file__).parent / "time_data.csv")
+        return loc_df, store.read_time()
+
+
+def plot_lines_of_code(loc_df, output_dir, dpi=300, formats=("png", "pdf")):
     """Create comparison chart for Lines of Code (Angular Material: CSS only vs Spade: Changes + Additions)"""
 
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -137,34 +162,33 @@ def plot_lines_of_code(loc_df, output_dir):
     )
 
     # Add value labels on bars
-    def add_value_labels(bars, values, bottom=None):
-        for i, (bar, value) in enumerate(zip(bars, values)):
-            height = bar.get_height()
-            y_pos = height / 2 if bottom is None else bottom[i] + height / 2
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                y_pos,
-                f"{int(value)}",
-                ha="center",
-                va="center",
-                fontweight="bold",
-                color="white",
-                fontsize=10,
-            )
-
-    add_value_labels(bars1, material_overrides)
-    add_value_labels(bars2_changes, spade_changes)
-    add_value_labels(bars2_additions, spade_additions, spade_changes)
+    for bars, values in [
+        (bars1, material_overrides),
+        (bars2_changes, spade_changes),
+        (bars2_additions, spade_additions),
+    ]:
+        label_bars(
+            ax,
+            bars,
+            format_numbers(values, decimals=0),
+            position="center",
+            padding=0,
+            fontweight="bold",
+            color="white",
+            fontsize=10,
+        )
 
     # Add improvement percentages
     total_spade = spade_changes + spade_additions
     improvements = (material_overrides - total_spade) / material_overrides * 100
 
-    for i, improvement in enumerate(improvements):
+    labels = format_numbers(improvements, prefix="-", suffix="%")
+    for i, label in enumerate(labels):
         max_height = max(material_overrides[i], total_spade[i])
-        ax.annotate(
-            f"-{improvement:.1f}%",
-            xy=(x_pos[i], max_height + 2),
+        ax.text(
+            x_pos[i],
+            max_height + 2,
+            label,
             ha="center",
             va="bottom",
             fontweight="bold",
@@ -189,14 +213,15 @@ def plot_lines_of_code(loc_df, output_dir):
     ax.set_ylim(0, max_height * 1.25)
 
     plt.tight_layout()
-    plt.savefig(output_dir / "code_aufwand_vergleich.png", dpi=300)
-    plt.savefig(output_dir / "code_aufwand_vergleich.pdf", dpi=300)
-    print(f"✓ Code-Aufwand Diagramm gespeichert in {output_dir}")
+    for fmt in formats:
+        save_figure(fig, output_dir / f"code_aufwand_vergleich.{fmt}", dpi=dpi)
+    if formats:
+        print(f"✓ Code-Aufwand Diagramm gespeichert in {output_dir}")
 
     return fig
 
 
-def plot_time_to_implement(time_df, output_dir):
+def plot_time_to_implement(time_df, output_dir, dpi=300, formats=("png", "pdf")):
     """Create bar chart with error bars for time-to-implement comparison"""
 
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -253,33 +278,28 @@ def plot_time_to_implement(time_df, output_dir):
         ["Aufgabe 1\n(Button)", "Aufgabe 2\n(Input)", "Aufgabe 3\n(Dropdown)"]
     )
 
-    # Add value labels on bars
-    def add_time_labels(bars, values, std_devs):
-        for bar, value, std in zip(bars, values, std_devs):
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height + std + 1,
-                f"{value:.1f}min",
-                ha="center",
-                va="bottom",
-                fontweight="bold",
-                fontsize=11,
-            )
-
-    add_time_labels(bars1, material_times, material_std)
-    add_time_labels(bars2, spade_times, spade_std)
+    # Add value labels above the error bars
+    for bars, values in [(bars1, material_times), (bars2, spade_times)]:
+        label_bars(
+            ax,
+            bars,
+            format_numbers(values, suffix="min"),
+            fontweight="bold",
+            fontsize=11,
+        )
 
     # Add improvement percentages
     improvements = (material_times - spade_times) / material_times * 100
 
-    for i, improvement in enumerate(improvements):
+    labels = format_numbers(improvements, prefix="-", suffix="%")
+    for i, label in enumerate(labels):
         max_height = max(
             material_times[i] + material_std[i], spade_times[i] + spade_std[i]
         )
-        ax.annotate(
-            f"-{improvement:.1f}%".replace(".", ","),
-            xy=(x_pos[i], max_height + 6),
+        ax.text(
+            x_pos[i],
+            max_height + 6,
+            label,
             ha="center",
             va="bottom",
             fontweight="bold",
@@ -294,15 +314,16 @@ def plot_time_to_implement(time_df, output_dir):
     ax.set_ylim(0, max(material_times + material_std) * 1.2)
 
     plt.tight_layout()
-    plt.savefig(output_dir / "implementierungszeit_vergleich.png", dpi=300)
-    plt.savefig(output_dir / "implementierungszeit_vergleich.pdf", dpi=300)
-    print(f"✓ Implementierungszeit Diagramm gespeichert in {output_dir}")
+    for fmt in formats:
+        save_figure(fig, output_dir / f"implementierungszeit_vergleich.{fmt}", dpi=dpi)
+    if formats:
+        print(f"✓ Implementierungszeit Diagramm gespeichert in {output_dir}")
 
     return fig
 
 
-def create_summary_table(loc_df, time_df, output_dir):
-    """Create a summary table with key metrics"""
+def build_summary_table(loc_df, time_df):
+    """Key metrics per task (lines of code, time and improvements)"""
 
     # Calculate improvements
     tasks = ["Button", "Input", "Dropdown"]
@@ -335,10 +356,18 @@ def create_summary_table(loc_df, time_df, output_dir):
             }
         )
 
-    summary_df = pd.DataFrame(summary_data)
+    return pd.DataFrame(summary_data)
+
+
+def create_summary_table(loc_df, time_df, output_dir):
+    """Create a summary table with key metrics"""
+    summary_df = build_summary_table(loc_df, time_df)
 
     # Save as CSV for further analysis
-    summary_df.to_csv(output_dir / "evaluation_zusammenfassung.csv", index=False)
+    with stable_output(output_dir / "evaluation_zusammenfassung.csv") as buffer:
+        summary_df.to_csv(buffer, index=False)
+    with EvalStore() as store:
+        store.write_results("evaluation_zusammenfassung", summary_df)
     print(
         f"✓ Zusammenfassungstabelle gespeichert in {output_dir}/evaluation_zusammenfassung.csv"
     )
@@ -349,6 +378,17 @@ def create_summary_table(loc_df, time_df, output_dir):
 def main():
     """Main function to generate all evaluation visualizations"""
 
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--trim",
+        nargs=2,
+        type=float,
+        metavar=("LOW", "HIGH"),
+        default=TIME_LOG_TRIM,
+        help="Quantiles for trimmed times from time_log*.csv, e.g. 0.05 0.95",
+    )
+    args = parser.parse_args()
+
     # Setup
     setup_matplotlib()
 
@@ -360,7 +400,7 @@ def main():
     print("=" * 60)
 
     # Load or create test data
-    loc_df, time_df = load_data_from_csv()
+    loc_df, time_df = load_data_from_csv(trim=args.trim)
 
     print("📊 Datenübersicht:")
     print(f"   Code-Aufwand Einträge: {len(loc_df)}")
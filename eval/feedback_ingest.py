@@ -0,0 +1,281 @@
+"""
+Experiment Feedback Ingestion - Completion and Timing Tables from JSON
+Bachelor Thesis: Component Libraries for Project Business
+
+Reads the experiment-feedback-<ts>.json files downloaded by the experiment
+app's TaskFeedback component and produces the inputs of completion.py
+(completion_data.csv) and dev_ex.py (time_data.csv).
+
+Files are parsed in a process pool, the nested times/completion/difficulty
+objects of all files are flattened in one vectorized pass into a long table
+(one row per submission, task and library) and appended to the evaluation
+store. Submissions are keyed by their submissionTimestamp, so re-running
+the ingestion only adds files that were not imported before.
+
+Usage:
+    python feedback_ingest.py <feedback_dir> [--write-data]
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from artifacts import stable_output
+from store import EvalStore
+
+FEEDBACK_PATTERN = "experiment-feedback-*.json"
+
+# Files below this count are parsed in-process (pool start-up dominates)
+PARALLEL_MIN_FILES = 256
+
+METRICS = {"times": "minutes", "completion": "completion", "difficulty": "difficulty"}
+TASK_LABELS = {"button": "Button", "input": "Input", "dropdown": "Dropdown"}
+LIBRARIES = ["material", "spade"]
+
+# Library key -> column label of time_data.csv
+TIME_LABELS = {"material": "Angular Material", "spade": "Spade"}
+
+# angularExperience answer -> (experience_years, experience_group);
+# the ranges are represented by their midpoint, "6+" by its lower bound
+EXPERIENCE_LEVELS = {
+    "1-2": (1.5, "Junior"),
+    "2-4": (3.0, "Mid-Level"),
+    "4-6": (5.0, "Mid-Level"),
+    "6+": (6.0, "Senior"),
+}
+
+
+def _read_feedback_files(paths):
+    """Parse a batch of feedback files; unreadable files are skipped"""
+    records = []
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as file:
+                record = json.load(file)
+        except (OSError, json.JSONDecodeError) as error:
+            print(f"⚠️  {Path(path).name} übersprungen: {error}")
+            continue
+        if isinstance(record, dict):
+            record["source"] = Path(path).name
+            records.append(record)
+    return records
+
+
+def read_feedback_files(paths, max_workers=None):
+    """
+    Parse many feedback files, in worker processes from PARALLEL_MIN_FILES on.
+
+    Returns:
+        list: One dict per readable file (with its file name as "source")
+    """
+    paths = [str(path) for path in paths]
+    if len(paths) < PARALLEL_MIN_FILES:
+        return _read_feedback_files(paths)
+
+    workers = max_workers or os.cpu_count() or 1
+    batch_size = max(1, len(paths) // (4 * workers))
+    batches = [
+        paths[start : start + batch_size] for start in range(0, len(paths), batch_size)
+    ]
+    records = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch_records in executor.map(_read_feedback_files, batches):
+            records.extend(batch_records)
+    return records
+
+
+def flatten_feedback(records):
+    """
+    Flatten feedback records into typed submission and long-format tables.
+
+    Args:
+        records (list): Parsed feedback files (see ``read_feedback_files``)
+
+    Returns:
+        tuple: (submissions_df, long_df) - one row per submission, and one
+        row per submission, task and library with minutes, completion and
+        difficulty (tasks a participant did not complete are omitted)
+    """
+    wide = pd.json_normalize(records)
+    if wide.empty or "submissionTimestamp" not in wide.columns:
+        return (
+            pd.DataFrame(
+                columns=[
+                    "submission_timestamp",
+                    "source",
+                    "angular_experience",
+                    "material_experience",
+                ]
+            ),
+            pd.DataFrame(
+                columns=["submission_timestamp", "task", "library"]
+                + list(METRICS.values())
+            ),
+        )
+
+    wide = wide[wide["submissionTimestamp"].fillna("").astype(str) != ""]
+    wide = wide.drop_duplicates("submissionTimestamp").reset_index(drop=True)
+
+    submissions_df = pd.DataFrame(
+        {
+            "submission_timestamp": wide["submissionTimestamp"].astype(str),
+            "source": wide["source"],
+            "angular_experience": wide.get("angularExperience"),
+            "material_experience": wide.get("materialExperience"),
+        }
+    )
+
+    # "times.button.material" -> (minutes, button, material) for all columns at once
+    value_cols = [
+        f"{metric}.{task}.{library}"
+        for metric in METRICS
+        for task in TASK_LABELS
+        for library in LIBRARIES
+    ]
+    values = wide.reindex(columns=value_cols).apply(pd.to_numeric, errors="coerce")
+    values.index = submissions_df["submission_timestamp"]
+    values.columns = pd.MultiIndex.from_tuples(
+        [tuple(column.split(".")) for column in value_cols],
+        names=["metric", "task", "library"],
+    )
+
+    long_df = values.stack(["task", "library"]).rename(columns=METRICS)
+    long_df = long_df.reindex(columns=list(METRICS.values()))
+    long_df = long_df.dropna(how="all").reset_index()
+    long_df["task"] = long_df["task"].map(TASK_LABELS)
+    return submissions_df, long_df
+
+
+def ingest_feedback(paths, store, max_workers=None):
+    """
+    Append feedback files that are not in the store yet.
+
+    Returns:
+        int: Number of new submissions
+    """
+    known_sources = store.known_feedback_sources()
+    new_paths = [path for path in paths if Path(path).name not in known_sources]
+    submissions_df, long_df = flatten_feedback(
+        read_feedback_files(new_paths, max_workers)
+    )
+
+    # The same submission may have been downloaded more than once
+    known = store.known_feedback_timestamps()
+    is_new = ~submissions_df["submission_timestamp"].isin(known)
+    submissions_df = submissions_df[is_new]
+    long_df = long_df[
+        long_df["submission_timestamp"].isin(submissions_df["submission_timestamp"])
+    ]
+
+    if len(submissions_df):
+        store.append_feedback(submissions_df, long_df)
+
+    print(
+        f"✓ {len(submissions_df)} neue Feedback-Dateien übernommen "
+        f"({len(paths) - len(new_paths)} bereits importiert, "
+        f"{len(new_paths) - len(submissions_df)} doppelt oder unlesbar)"
+    )
+    return len(submissions_df)
+
+
+def build_completion_data(feedback_df):
+    """Completion values in the layout of completion_data.csv"""
+    participant_ids = {
+        timestamp: position
+        for position, timestamp in enumerate(
+            pd.unique(feedback_df["submission_timestamp"]), start=1
+        )
+    }
+    wide = feedback_df.pivot_table(
+        index=["submission_timestamp", "task"],
+        columns="library",
+        values="completion",
+    ).reindex(columns=LIBRARIES)
+    wide = wide.dropna(how="all").reset_index()
+
+    experience = feedback_df.groupby("submission_timestamp")[
+        "angular_experience"
+    ].first()
+    levels = wide["submission_timestamp"].map(experience).map(EXPERIENCE_LEVELS)
+    task_order = {task: position for position, task in enumerate(TASK_LABELS.values())}
+    completion_df = pd.DataFrame(
+        {
+            "participant_id": wide["submission_timestamp"].map(participant_ids),
+            "experience_years": levels.str[0],
+            "experience_group": levels.str[1],
+            "task": wide["task"],
+            **{f"{library}_completion": wide[library] for library in LIBRARIES},
+        }
+    )
+    return completion_df.sort_values(
+        ["participant_id", "task"],
+        key=lambda column: (
+            column.map(task_order) if column.name == "task" else column
+        ),
+    ).reset_index(drop=True)
+
+
+def build_time_data(feedback_df):
+    """Mean and standard deviation of the minutes in the layout of time_data.csv"""
+    stats = feedback_df.groupby(["task", "library"])["minutes"].agg(["mean", "std"])
+    tasks = [task for task in TASK_LABELS.values() if task in stats.index]
+
+    time_df = pd.DataFrame({"Task": tasks})
+    for column in ["mean", "std"]:
+        for library, label in TIME_LABELS.items():
+            name = label if column == "mean" else f"{label} Std"
+            time_df[name] = (
+                stats[column]
+                .reindex(pd.MultiIndex.from_product([tasks, [library]]))
+                .round(1)
+                .to_numpy()
+            )
+    return time_df
+
+
+def main():
+    """Main function to ingest experiment feedback files"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("feedback_dir", type=Path)
+    parser.add_argument(
+        "--write-data",
+        action="store_true",
+        help="Replace completion_data.csv and time_data.csv with the ingested feedback",
+    )
+    args = parser.parse_args()
+
+    paths = sorted(args.feedback_dir.glob(FEEDBACK_PATTERN))
+    if not paths:
+        print(f"❌ Keine Feedback-Dateien in '{args.feedback_dir}' gefunden!")
+        return
+
+    with EvalStore() as store:
+        ingest_feedback(paths, store)
+        feedback_df = store.read_feedback()
+
+    output_dir = Path("output")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with stable_output(output_dir / "feedback_messung.csv") as buffer:
+        feedback_df.to_csv(buffer, index=False)
+
+    completion_df = build_completion_data(feedback_df)
+    time_df = build_time_data(feedback_df)
+    print(
+        f"✓ {completion_df['participant_id'].nunique()} Teilnehmende, "
+        f"{len(completion_df)} Completion-Zeilen"
+    )
+    print(time_df.to_string(index=False))
+
+    if args.write_data:
+        eval_dir = Path(__file__).parent
+        completion_df.to_csv(eval_dir / "completion_data.csv", index=False)
+        time_df.to_csv(eval_dir / "time_data.csv", index=False)
+        print("✓ completion_data.csv und time_data.csv aktualisiert")
+
+
+if __name__ == "__main__":
+    main()
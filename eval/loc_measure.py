@@ -0,0 +1,286 @@
+"""
+Lines of Code Measurement - Spade Component Modifications
+Bachelor Thesis: Component Libraries for Project Business
+
+Computes the "Code Changes" and "Code Additions" of loc_data.csv directly
+from participant submissions. Each submission's modified Spade components
+(src/app/components/spade-<name>/) are diffed per .ts/.html/.scss file
+against the same files of the experiment app the participants started from
+(experiment/src/app/components/spade-<name>/). The library sources in
+spade/src/lib/ are no baseline: the experiment copy renames selectors and
+classes (spade-<name>), so an untouched submission would already differ.
+
+Files are diffed in a process pool; results are cached in the evaluation
+store by a hash of both file contents, so unchanged files are never
+re-diffed.
+
+Usage:
+    python loc_measure.py <submissions_dir> [--write-loc-data]
+
+where every sub-directory of <submissions_dir> is one participant's copy of
+the experiment app.
+"""
+
+import argparse
+import difflib
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from artifacts import stable_output
+from store import EvalStore
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SUBMISSION_COMPONENTS = Path("src") / "app" / "components"
+# Components as handed out to the participants
+PRISTINE_COMPONENTS = REPO_ROOT / "experiment" / SUBMISSION_COMPONENTS
+
+# Task label in loc_data.csv -> component name
+TASK_COMPONENTS = {"Button": "button", "Input": "input", "Dropdown": "dropdown"}
+EXTENSIONS = (".ts", ".html", ".scss")
+
+# Diffs below this count run in-process (pool start-up dominates)
+PARALLEL_MIN_FILES = 32
+
+
+def _code_lines(text):
+    """Non-blank lines without surrounding whitespace"""
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def classify_lines(pristine_text, modified_text):
+    """
+    Classify the lines of a modified file against its pristine version.
+
+    Replaced lines count as changes (up to the length of the replaced block),
+    surplus and inserted lines as additions.
+
+    Returns:
+        dict: Numbers of changed, added and deleted lines
+    """
+    pristine = _code_lines(pristine_text)
+    modified = _code_lines(modified_text)
+
+    counts = {"changed": 0, "added": 0, "deleted": 0}
+    matcher = difflib.SequenceMatcher(None, pristine, modified, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        removed, inserted = i2 - i1, j2 - j1
+        if tag == "replace":
+            counts["changed"] += min(removed, inserted)
+            counts["added"] += max(inserted - removed, 0)
+            counts["deleted"] += max(removed - inserted, 0)
+        elif tag == "insert":
+            counts["added"] += inserted
+        elif tag == "delete":
+            counts["deleted"] += removed
+    return counts
+
+
+def _classify_pair(pair):
+    return classify_lines(*pair)
+
+
+def content_key(pristine_text, modified_text):
+    """Cache key over both file contents"""
+    digest = hashlib.sha256()
+    digest.update(pristine_text.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(modified_text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def find_component_files(submission_root, pristine_root=PRISTINE_COMPONENTS):
+    """
+    Pair every pristine component file with the submission's version.
+
+    Returns:
+        list: (task, extension, pristine_path, modified_path) tuples; files
+        missing in the submission are skipped
+    """
+    pairs = []
+    for task, component in TASK_COMPONENTS.items():
+        name = f"spade-{component}"
+        modified_dir = Path(submission_root) / SUBMISSION_COMPONENTS / name
+        for extension in EXTENSIONS:
+            pristine_path = pristine_root / name / f"{name}.component{extension}"
+            modified_path = modified_dir / f"{name}.component{extension}"
+            if pristine_path.exists() and modified_path.exists():
+                pairs.append((task, extension, pristine_path, modified_path))
+    return pairs
+
+
+def measure_submissions(
+    submission_roots, store, pristine_root=PRISTINE_COMPONENTS, max_workers=None
+):
+    """
+    Measure changed and added lines for many submissions.
+
+    Args:
+        submission_roots (list): Root directories of the submitted experiment apps
+        store (EvalStore): Store holding the per-file diff cache
+        pristine_root (Path): Spade components the participants started from
+        max_workers (int): Worker processes for uncached diffs
+
+    Returns:
+        pd.DataFrame: One row per submission and file with changed/added/deleted lines
+    """
+    rows = []
+    texts = {}
+    pristine_cache = {}
+
+    for root in submission_roots:
+        for task, extension, pristine_path, modified_path in find_component_files(
+            root, pristine_root
+        ):
+            if pristine_path not in pristine_cache:
+                pristine_cache[pristine_path] = pristine_path.read_text(
+                    encoding="utf-8"
+                )
+            pristine_text = pristine_cache[pristine_path]
+            modified_text = modified_path.read_text(encoding="utf-8")
+
+            key = content_key(pristine_text, modified_text)
+            texts.setdefault(key, (pristine_text, modified_text))
+            rows.append(
+                {
+                    "submission": Path(root).name,
+                    "Task": task,
+                    "file": modified_path.name,
+                    "extension": extension,
+                    "content_key": key,
+                }
+            )
+
+    cached = store.read_loc_diff_cache(texts)
+    missing = [key for key in texts if key not in cached]
+
+    if len(missing) >= PARALLEL_MIN_FILES:
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            computed = dict(
+                zip(
+                    missing,
+                    executor.map(
+                        _classify_pair,
+                        (texts[key] for key in missing),
+                        chunksize=max(1, len(missing) // (4 * workers)),
+                    ),
+                )
+            )
+    else:
+        computed = {key: classify_lines(*texts[key]) for key in missing}
+
+    if computed:
+        store.write_loc_diff_cache(computed)
+    cached.update(computed)
+
+    detail_df = pd.DataFrame(
+        rows, columns=["submission", "Task", "file", "extension", "content_key"]
+    )
+    for column in ["changed", "added", "deleted"]:
+        detail_df[column] = [cached[key][column] for key in detail_df["content_key"]]
+
+    print(
+        f"✓ {len(detail_df)} Dateien aus {len(submission_roots)} Abgaben gemessen "
+        f"({len(missing)} neu diffed, {len(texts) - len(missing)} aus Cache)"
+    )
+    return detail_df.drop(columns="content_key")
+
+
+def summarize_loc(detail_df):
+    """
+    Aggregate per-file measurements into loc_data.csv rows for Spade.
+
+    Lines are summed per submission and task, then averaged over submissions.
+    """
+    per_submission = detail_df.groupby(["submission", "Task"])[
+        ["changed", "added"]
+    ].sum()
+    per_task = per_submission.groupby("Task").mean().reindex(list(TASK_COMPONENTS))
+
+    rows = []
+    for task, values in per_task.iterrows():
+        rows.append(
+            {
+                "Task": task,
+                "Library": "Spade",
+                "Type": "Code Changes",
+                "Lines": int(np.round(values["changed"])),
+            }
+        )
+        rows.append(
+            {
+                "Task": task,
+                "Library": "Spade",
+                "Type": "Code Additions",
+                "Lines": int(np.round(values["added"])),
+            }
+        )
+    return pd.DataFrame(rows, columns=["Task", "Library", "Type", "Lines"])
+
+
+def update_loc_data(measured_df, loc_csv_path):
+    """
+    Replace measured rows in loc_data.csv, keeping all other rows (e.g. Angular
+    Material "Wrapper & Overrides") as maintained by hand.
+    """
+    key = ["Task", "Library", "Type"]
+    if Path(loc_csv_path).exists():
+        existing = pd.read_csv(loc_csv_path)
+        measured_keys = pd.MultiIndex.from_frame(measured_df[key])
+        keep = ~pd.MultiIndex.from_frame(existing[key]).isin(measured_keys)
+        existing = existing[keep]
+        updated = pd.concat([existing, measured_df], ignore_index=True)
+    else:
+        updated = measured_df
+
+    # dev_ex.py expects rows ordered by task
+    task_order = {task: position for position, task in enumerate(TASK_COMPONENTS)}
+    updated = updated.sort_values(
+        "Task", key=lambda tasks: tasks.map(task_order), kind="stable"
+    )
+    updated.to_csv(loc_csv_path, index=False)
+    return updated
+
+
+def main():
+    """Main function to measure lines of code from submissions"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("submissions_dir", type=Path)
+    parser.add_argument("--pristine", type=Path, default=PRISTINE_COMPONENTS)
+    parser.add_argument(
+        "--write-loc-data",
+        action="store_true",
+        help="Update loc_data.csv with the measured Spade rows",
+    )
+    args = parser.parse_args()
+
+    submission_roots = sorted(
+        path for path in args.submissions_dir.iterdir() if path.is_dir()
+    )
+    if not submission_roots:
+        print(f"❌ Keine Abgaben in '{args.submissions_dir}' gefunden!")
+        return
+
+    with EvalStore() as store:
+        detail_df = measure_submissions(submission_roots, store, args.pristine)
+
+    output_dir = Path("output")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with stable_output(output_dir / "loc_messung.csv") as buffer:
+        detail_df.to_csv(buffer, index=False)
+
+    measured_df = summarize_loc(detail_df)
+    print(measured_df.to_string(index=False))
+
+    if args.write_loc_data:
+        update_loc_data(measured_df, Path(__file__).parent / "loc_data.csv")
+        print("✓ loc_data.csv aktualisiert")
+
+
+if __name__ == "__main__":
+    main()
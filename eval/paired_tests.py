@@ -0,0 +1,227 @@
+"""
+Paired Significance Tests - Angular Material vs. Spade
+Bachelor Thesis: Component Libraries for Project Business
+
+Runs paired t-tests, Cohen's dz and Wilcoxon signed-rank tests for every
+task x experience group x library pair in one pass. The long-format
+completion data is pivoted into a participant x task x library cube, all
+library pairs are differenced at once and the statistics are computed with
+vectorized array math along the participant axis. p-values are corrected
+for multiple comparisons (Holm and Benjamini-Hochberg) across the whole
+results table.
+"""
+
+import warnings
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+COMPLETION_SUFFIX = "_completion"
+OVERALL_TASK = "Gesamt"
+ALL_GROUPS = "Alle"
+
+
+def build_completion_cube(df, value_suffix=COMPLETION_SUFFIX):
+    """
+    Pivot long-format completion data into a participant x task x library cube.
+
+    Args:
+        df (pd.DataFrame): One row per participant and task with one
+            ``<library><value_suffix>`` column per library
+        value_suffix (str): Suffix identifying the per-library value columns
+
+    Returns:
+        tuple: (cube, participants, tasks, libraries) where ``cube`` has shape
+        (participants, tasks, libraries) and missing cells are NaN
+    """
+    value_cols = [col for col in df.columns if col.endswith(value_suffix)]
+    libraries = [col[: -len(value_suffix)] for col in value_cols]
+    tasks = list(pd.unique(df["task"]))
+
+    pivot = df.pivot_table(
+        index="participant_id", columns="task", values=value_cols, aggfunc="mean"
+    )
+    pivot = pivot.reindex(columns=pd.MultiIndex.from_product([value_cols, tasks]))
+
+    participants = pivot.index.to_numpy()
+    cube = (
+        pivot.to_numpy(dtype=float)
+        .reshape(len(participants), len(value_cols), len(tasks))
+        .transpose(0, 2, 1)
+    )
+    return cube, participants, tasks, libraries
+
+
+def participant_slices(df, value_suffix=COMPLETION_SUFFIX, pivot=None):
+    """
+    Cube and participant attributes from a cached pivot cube or from ``df``.
+
+    Args:
+        df (pd.DataFrame): Long-format completion data, unused with ``pivot``
+        value_suffix (str): Suffix identifying the per-library value columns
+        pivot (PivotCube): Memory-mapped cube (see pivot_cube.py)
+
+    Returns:
+        tuple: (cube, participants, tasks, libraries, participant_info) where
+        ``participant_info`` is indexed like the participant axis
+    """
+    if pivot is not None:
+        cube, participants, tasks, libraries = pivot.as_cube(value_suffix.lstrip("_"))
+        return cube, participants, tasks, libraries, pivot.participant_info
+
+    cube, participants, tasks, libraries = build_completion_cube(df, value_suffix)
+    participant_info = df.groupby("participant_id", observed=True).first()
+    return cube, participants, tasks, libraries, participant_info.reindex(participants)
+
+
+def holm_correction(p_values):
+    """Holm step-down adjusted p-values (NaNs are ignored and kept)"""
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full_like(p_values, np.nan)
+    valid = ~np.isnan(p_values)
+    p = p_values[valid]
+    m = len(p)
+    if m == 0:
+        return adjusted
+
+    order = np.argsort(p)
+    stepped = np.maximum.accumulate(p[order] * (m - np.arange(m)))
+    result = np.empty(m)
+    result[order] = np.minimum(stepped, 1.0)
+    adjusted[valid] = result
+    return adjusted
+
+
+def benjamini_hochberg_correction(p_values):
+    """Benjamini-Hochberg adjusted p-values (NaNs are ignored and kept)"""
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full_like(p_values, np.nan)
+    valid = ~np.isnan(p_values)
+    p = p_values[valid]
+    m = len(p)
+    if m == 0:
+        return adjusted
+
+    order = np.argsort(p)
+    scaled = p[order] * m / np.arange(1, m + 1)
+    stepped = np.minimum.accumulate(scaled[::-1])[::-1]
+    result = np.empty(m)
+    result[order] = np.minimum(stepped, 1.0)
+    adjusted[valid] = result
+    return adjusted
+
+
+def paired_statistics(diffs, wilcoxon_method="auto"):
+    """
+    Paired t-test, Cohen's dz and Wilcoxon signed-rank along axis 0.
+
+    ``diffs`` has shape (participants, slices); NaNs mark missing pairs.
+    ``wilcoxon_method`` is passed to ``scipy.stats.wilcoxon`` ("approx"
+    avoids the permutation distribution scipy uses for small tied samples).
+    """
+    n = np.sum(~np.isnan(diffs), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean_diff = np.nanmean(diffs, axis=0)
+        sd_diff = np.nanstd(diffs, axis=0, ddof=1)
+        t_stat = mean_diff / (sd_diff / np.sqrt(n))
+        p_t = 2 * stats.t.sf(np.abs(t_stat), n - 1)
+        cohens_dz = mean_diff / sd_diff
+
+    # Slices without any non-zero difference have no defined signed-rank test
+    testable = np.nansum(np.abs(diffs), axis=0) > 0
+    w_stat = np.full(diffs.shape[1], np.nan)
+    p_w = np.full(diffs.shape[1], np.nan)
+    if testable.any():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = stats.wilcoxon(
+                diffs[:, testable],
+                axis=0,
+                nan_policy="omit",
+                method=wilcoxon_method,
+            )
+        w_stat[testable] = result.statistic
+        p_w[testable] = result.pvalue
+
+    return {
+        "n": n,
+        "mean_diff": mean_diff,
+        "sd_diff": sd_diff,
+        "t": t_stat,
+        "p_t": p_t,
+        "cohens_dz": cohens_dz,
+        "wilcoxon_w": w_stat,
+        "p_wilcoxon": p_w,
+    }
+
+
+def run_paired_tests(
+    df, group_col="experience_group", value_suffix=COMPLETION_SUFFIX, pivot=None
+):
+    """
+    Run paired tests for every task, experience group and library pair.
+
+    Args:
+        df (pd.DataFrame): Long-format completion data (see ``build_completion_cube``)
+        group_col (str): Participant-level grouping column, ``None`` to skip groups
+        value_suffix (str): Suffix identifying the per-library value columns
+        pivot (PivotCube): Cached cube to slice instead of pivoting ``df``
+
+    Returns:
+        pd.DataFrame: Tidy results table, one row per group x task x library pair
+    """
+    cube, participants, tasks, libraries, participant_info = participant_slices(
+        df, value_suffix, pivot
+    )
+
+    # Per-participant average over all tasks as an additional "task"
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        overall = np.nanmean(cube, axis=1, keepdims=True)
+    cube = np.concatenate([cube, overall], axis=1)
+    tasks = tasks + [OVERALL_TASK]
+
+    pairs = list(combinations(range(len(libraries)), 2))
+    first, second = (np.array(idx) for idx in zip(*pairs))
+    # (participants, tasks, pairs)
+    diffs = cube[:, :, first] - cube[:, :, second]
+
+    groups = {ALL_GROUPS: np.ones(len(participants), dtype=bool)}
+    if group_col is not None and group_col in participant_info.columns:
+        participant_groups = participant_info[group_col]
+        for group in pd.unique(participant_groups.dropna()):
+            groups[group] = (participant_groups == group).to_numpy()
+
+    frames = []
+    task_labels = np.repeat(tasks, len(pairs))
+    pair_first = np.tile([libraries[i] for i in first], len(tasks))
+    pair_second = np.tile([libraries[j] for j in second], len(tasks))
+
+    for group, mask in groups.items():
+        group_diffs = diffs[mask].reshape(int(mask.sum()), -1)
+        results = paired_statistics(group_diffs)
+        frame = pd.DataFrame(
+            {
+                "group": group,
+                "task": task_labels,
+                "library_a": pair_first,
+                "library_b": pair_second,
+                **results,
+            }
+        )
+        frames.append(frame)
+
+    results_df = pd.concat(frames, ignore_index=True)
+
+    # Correct across the complete family of tests
+    results_df["p_t_holm"] = holm_correction(results_df["p_t"])
+    results_df["p_t_bh"] = benjamini_hochberg_correction(results_df["p_t"])
+    results_df["p_wilcoxon_holm"] = holm_correction(results_df["p_wilcoxon"])
+    results_df["p_wilcoxon_bh"] = benjamini_hochberg_correction(
+        results_df["p_wilcoxon"]
+    )
+
+    return results_df
@@ -0,0 +1,248 @@
+"""
+Pivot Cube - Memory-Mapped Participant x Task x Library Metrics
+Bachelor Thesis: Component Libraries for Project Business
+
+completion.py and the statistics modules all work on the same shape: one
+value per participant, task and library. Instead of pivoting the long-format
+completion table again in every function, it is pivoted once into
+
+    values[metric, participant, task, library]   completion
+
+and cached as .npy files in cube_cache/ together with a JSON index holding
+the labels and the participant attributes. Metrics form the outermost axis
+so every metric is one contiguous block. Only per-participant metrics belong
+into the cube: LoC and implementation times exist per task only and stay in
+dev_ex.py's frames, feedback time and difficulty carry no participant id of
+the study.
+
+Loading maps the arrays read-only into memory, so it costs almost nothing,
+and every selection is a zero-copy view:
+
+    pivot = load_pivot_cube()
+    completion = pivot.metric("completion")     # (participants, tasks, libraries)
+    button = pivot.sel("completion", task="Button", library="spade")
+
+The cache key is the SHA-256 over the input file; any change builds a new
+cube. A caller that already loaded the completion data passes it in, so it
+is not read twice; otherwise it is loaded through the store like
+completion.py does, without importing the script (it sets plot styles on
+import).
+
+Usage:
+    python pivot_cube.py [--rebuild]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from compact_dtypes import compact_dtypes
+from paired_tests import build_completion_cube
+from store import EvalStore, file_sha256
+
+EVAL_DIR = Path(__file__).parent
+CACHE_DIR = EVAL_DIR / "cube_cache"
+INPUT_FILES = ["completion_data.csv"]
+
+# Bump when the layout of the cached files changes
+FORMAT_VERSION = 3
+INDEX_NAME = "index.json"
+
+METRICS = ["completion"]
+PARTICIPANT_ATTRIBUTES = ["experience_group", "experience_years"]
+
+
+def _position(labels, label, kind):
+    try:
+        return list(labels).index(label)
+    except ValueError:
+        raise ValueError(
+            f"Unbekannte {kind} '{label}' (vorhanden: {', '.join(map(str, labels))})"
+        ) from None
+
+
+class PivotCube:
+    """Read-only metric arrays with their label indexes"""
+
+    def __init__(self, values, index):
+        self.values = values
+        self.key = index["key"]
+        self.metrics = index["metrics"]
+        self.participants = np.asarray(index["participants"])
+        self.tasks = index["tasks"]
+        self.libraries = index["libraries"]
+        self.participant_info = pd.DataFrame(
+            index["participant_info"],
+            index=pd.Index(self.participants, name="participant_id"),
+        )
+
+    def metric(self, name):
+        """View (participants, tasks, libraries) of one metric"""
+        return self.values[_position(self.metrics, name, "Kennzahl")]
+
+    def sel(self, metric, participant=None, task=None, library=None):
+        """
+        Zero-copy selection by labels; every given label drops its axis.
+
+        Args:
+            metric (str): Participant-level metric (see ``METRICS``)
+            participant: Participant id
+            task (str): Task label
+            library (str): Library key
+
+        Returns:
+            np.ndarray: Read-only view into the memory-mapped cube
+        """
+        view = self.metric(metric)
+        # Select from the innermost axis so the outer positions stay valid
+        if library is not None:
+            view = view[..., _position(self.libraries, library, "Bibliothek")]
+        if task is not None:
+            view = view[:, _position(self.tasks, task, "Aufgabe")]
+        if participant is not None:
+            view = view[_position(self.participants, participant, "Teilnehmer-ID")]
+        return view
+
+    def as_cube(self, metric):
+        """(cube, participants, tasks, libraries) like ``build_completion_cube``"""
+        return self.metric(metric), self.participants, list(self.tasks), self.libraries
+
+
+def input_files(eval_dir=EVAL_DIR):
+    """Input files the cube depends on"""
+    files = [eval_dir / name for name in INPUT_FILES]
+    return [path for path in files if path.exists()]
+
+
+def cache_key(eval_dir=EVAL_DIR):
+    """SHA-256 over the format version and all input files"""
+    digest = hashlib.sha256(f"pivot-cube-v{FORMAT_VERSION}".encode())
+    for path in input_files(eval_dir):
+        digest.update(f"{path.name}:{file_sha256(path)}\n".encode())
+    return digest.hexdigest()
+
+
+def build_pivot_cube(completion_df):
+    """
+    Pivot the long-format completion data into the cube array.
+
+    Args:
+        completion_df (pd.DataFrame): Layout of completion_data.csv
+
+    Returns:
+        tuple: (values, index) - ``index`` holds the labels and participant
+        attributes (JSON-serializable)
+    """
+    completion, participants, tasks, libraries = build_completion_cube(completion_df)
+    values = np.stack([completion])
+
+    info = (
+        completion_df.groupby("participant_id", observed=True)[PARTICIPANT_ATTRIBUTES]
+        .first()
+        .reindex(participants)
+    )
+    index = {
+        "metrics": METRICS,
+        "participants": participants.tolist(),
+        "tasks": [str(task) for task in tasks],
+        "libraries": libraries,
+        "participant_info": {
+            column: info[column].astype(object).where(info[column].notna()).tolist()
+            for column in PARTICIPANT_ATTRIBUTES
+        },
+    }
+    return values, index
+
+
+def _load_completion(eval_dir=EVAL_DIR):
+    """Completion data as completion.py loads it"""
+    with EvalStore() as store:
+        store.sync_completion_csv(eval_dir / "completion_data.csv")
+        completion_df, _ = compact_dtypes(store.read_completion())
+    return completion_df
+
+
+def write_pivot_cube(directory, values, index):
+    """Write the cube files into a fresh directory and move it into place"""
+    directory = Path(directory)
+    temporary = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+    shutil.rmtree(temporary, ignore_errors=True)
+    temporary.mkdir(parents=True)
+    np.save(temporary / "values.npy", np.ascontiguousarray(values))
+    (temporary / INDEX_NAME).write_text(json.dumps(index), encoding="utf-8")
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(temporary, directory)
+
+
+def open_pivot_cube(directory):
+    """Map a cached cube read-only into memory"""
+    directory = Path(directory)
+    index = json.loads((directory / INDEX_NAME).read_text(encoding="utf-8"))
+    return PivotCube(
+        np.load(directory / "values.npy", mmap_mode="r"),
+        index,
+    )
+
+
+def load_pivot_cube(completion_df=None, cache_dir=CACHE_DIR, rebuild=False):
+    """
+    Cached cube for the current inputs, built on the first call after a change.
+
+    Args:
+        completion_df (pd.DataFrame): Already loaded completion data to build
+            from (loaded through the store if not given)
+        cache_dir (Path): Directory holding one subdirectory per cache key
+        rebuild (bool): Build even if a cube for the current key exists
+
+    Returns:
+        PivotCube: Memory-mapped cube
+    """
+    cache_dir = Path(cache_dir)
+    key = cache_key()
+    directory = cache_dir / key[:16]
+
+    if rebuild or not (directory / INDEX_NAME).exists():
+        if completion_df is None:
+            completion_df = _load_completion()
+        values, index = build_pivot_cube(completion_df)
+        index["key"] = key
+        write_pivot_cube(directory, values, index)
+        # Cubes of older inputs are obsolete (open maps stay valid after unlink)
+        for stale in cache_dir.iterdir():
+            if stale.is_dir() and stale != directory and not stale.name.startswith("."):
+                shutil.rmtree(stale, ignore_errors=True)
+
+    return open_pivot_cube(directory)
+
+
+def main():
+    """Main function to build or verify the cached pivot cube"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pivot = load_pivot_cube(rebuild=args.rebuild)
+    elapsed = time.perf_counter() - start
+
+    print(f"🧊 Pivot-Cube {pivot.key[:12]} geladen in {elapsed * 1000:.1f} ms")
+    print(
+        f"   {len(pivot.participants)} Teilnehmer x {len(pivot.tasks)} Aufgaben x "
+        f"{len(pivot.libraries)} Bibliotheken x {len(pivot.metrics)} Kennzahlen "
+        f"({pivot.values.nbytes / 1024:.0f} KB)"
+    )
+    for name in pivot.metrics:
+        filled = int(np.count_nonzero(~np.isnan(pivot.metric(name))))
+        print(f"   • {name}: {filled} Werte")
+
+
+if __name__ == "__main__":
+    main()
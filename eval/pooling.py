@@ -0,0 +1,415 @@
+"""
+Partial Pooling - Hierarchical Estimates across Studies, Groups and Tasks
+Bachelor Thesis: Component Libraries for Project Business
+
+Means per experience group rest on very few participants (two Studenten,
+two Seniors), so their differences are mostly noise. This module pools
+all client studies - one directory with completion_data.csv and
+time_data.csv each, identified by its resolved path - in a normal-normal
+hierarchical model:
+
+    ȳ_c ~ N(θ_c, σ²_f / n_c)    cell c = (study, experience group)
+    θ_c ~ N(μ_f, τ²_f)          family f = (source, task, library)
+
+σ²_f is the pooled within-cell variance of the family; μ_f and τ²_f are
+estimated by empirical Bayes (maximum marginal likelihood): a grid over
+the profile likelihood picks the right maximum per family, fixed-point
+updates refine it for all families at once as segment sums, so thousands
+of cells converge in milliseconds. Each
+cell mean is shrunken towards its family mean by B_c = v_c / (v_c + τ²_f)
+(v_c = σ²_f / n_c): small groups borrow strength from the other groups and
+studies, well-measured ones keep their own mean.
+
+time_data.csv only holds means and standard deviations per task; the
+cell size is its "<Library> N" column if present, otherwise the number of
+participants of the study's completion data.
+
+Usage:
+    python pooling.py [study_dir ...]
+"""
+
+import argparse
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from artifacts import save_figure, stable_output
+from chart_labels import format_numbers
+from paired_tests import OVERALL_TASK
+from schemas import COMPLETION_SCHEMA, TIME_SCHEMA, validate
+
+LIBRARIES = {"material": "Angular Material", "spade": "Spade"}
+ALL_GROUPS = "Alle"
+
+FAMILY_COLUMNS = ["source", "task", "library"]
+CELL_COLUMNS = ["study", "experience_group"]
+
+MAX_ITERATIONS = 1000
+TOLERANCE = 1e-9
+# Points of the profile-likelihood grid that seeds the updates
+GRID_SIZE = 64
+
+
+def load_study(directory):
+    """Completion and time data of one study directory"""
+    directory = Path(directory)
+    completion_path = directory / "completion_data.csv"
+    time_path = directory / "time_data.csv"
+    completion_df = validate(
+        pd.read_csv(completion_path), COMPLETION_SCHEMA, source=completion_path
+    )
+    time_df = (
+        validate(pd.read_csv(time_path), TIME_SCHEMA, source=time_path)
+        if time_path.exists()
+        else None
+    )
+    return completion_df, time_df
+
+
+def completion_cells(completion_df, study):
+    """
+    Cell summaries of the completion rates per experience group.
+
+    Tasks are summarized one by one and as participant averages over all
+    tasks (task ``OVERALL_TASK``).
+
+    Returns:
+        pd.DataFrame: One row per family and cell with n, mean and sd
+    """
+    columns = [f"{library}_completion" for library in LIBRARIES]
+    overall = (
+        completion_df.groupby(["participant_id", "experience_group"], observed=True)[
+            columns
+        ]
+        .mean()
+        .reset_index()
+        .assign(task=OVERALL_TASK)
+    )
+    long_df = pd.concat(
+        [completion_df[["experience_group", "task", *columns]], overall],
+        ignore_index=True,
+    ).melt(
+        id_vars=["experience_group", "task"],
+        value_vars=columns,
+        var_name="library",
+        value_name="value",
+    )
+    long_df["library"] = long_df["library"].str.removesuffix("_completion")
+
+    cells = (
+        long_df.dropna(subset=["value"])
+        .groupby(["task", "library", "experience_group"], sort=False)["value"]
+        .agg(n="count", mean="mean", sd="std")
+        .reset_index()
+    )
+    return cells.assign(source="completion", study=study)
+
+
+def time_cells(time_df, study, default_n):
+    """Cell summaries of the implementation times (one cell per study and task)"""
+    frames = []
+    for library, label in LIBRARIES.items():
+        n = time_df[f"{label} N"] if f"{label} N" in time_df.columns else default_n
+        frames.append(
+            pd.DataFrame(
+                {
+                    "task": time_df["Task"],
+                    "library": library,
+                    "experience_group": ALL_GROUPS,
+                    "n": n,
+                    "mean": time_df[label],
+                    "sd": time_df[f"{label} Std"],
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True).assign(source="time", study=study)
+
+
+def profile_nll(means, variances, families, tau2):
+    """
+    Negative marginal log-likelihood per family with μ_f profiled out.
+
+    Args:
+        means (np.ndarray): Observed cell means (cells of known variance only)
+        variances (np.ndarray): Sampling variances of the cell means
+        families (np.ndarray): Family code (0..k-1) per cell
+        tau2 (np.ndarray): Candidate τ² per family, shape (k,) or (k, m)
+
+    Returns:
+        np.ndarray: Negative log-likelihood in the shape of ``tau2``
+    """
+    tau2 = np.asarray(tau2, dtype=float)
+    shape = tau2.shape
+    tau2 = tau2.reshape(len(tau2), -1)
+    k, m = tau2.shape
+    bins = (families[:, None] * m + np.arange(m)).ravel()
+
+    def family_sum(values):
+        return np.bincount(bins, values.ravel(), minlength=k * m).reshape(k, m)
+
+    total = variances[:, None] + tau2[families]
+    weight = 1 / total
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mu = family_sum(weight * means[:, None]) / family_sum(weight)
+    nll = 0.5 * family_sum(
+        np.log(total) + weight * (means[:, None] - mu[families]) ** 2
+    )
+    return nll.reshape(shape)
+
+
+def fit_partial_pooling(means, variances, families, max_iter=MAX_ITERATIONS):
+    """
+    Empirical-Bayes fit of the normal-normal model for all families at once.
+
+    μ_f and τ²_f maximize the marginal likelihood ȳ_c ~ N(μ_f, v_c + τ²_f).
+    With unequal v_c the likelihood in τ² can have several maxima, so every
+    family starts at the best point of a grid over the profile likelihood
+    (τ² in [0, range²], beyond which it only falls). From there the
+    fixed-point updates (precision-weighted mean, moment update of τ²
+    truncated at 0) climb to the nearby maximum; they are the EM fixed point
+    but also settle in a few iterations when τ² is 0, where plain EM crawls.
+    A family keeps the fixed point only if it beats the grid maximum.
+
+    Args:
+        means (np.ndarray): Observed cell means
+        variances (np.ndarray): Sampling variances of the cell means
+            (NaN: unknown, the cell keeps its own mean)
+        families (np.ndarray): Family code (0..k-1) per cell
+        max_iter (int): Upper bound of the updates
+
+    Returns:
+        dict: Per family "mu" and "tau2", per cell "posterior_mean",
+        "posterior_var" and "shrinkage", plus "iterations"
+    """
+    means = np.asarray(means, dtype=float)
+    variances = np.asarray(variances, dtype=float)
+    known = np.isfinite(variances) & (variances > 0)
+    k = int(families.max()) + 1
+
+    def family_sum(values, cells=slice(None)):
+        return np.bincount(
+            families[cells], np.where(known[cells], values, 0.0), minlength=k
+        )
+
+    def family_ratio(numerator, denominator):
+        return np.divide(
+            numerator, denominator, out=np.full(k, np.nan), where=denominator > 0
+        )
+
+    def weighted_mean(tau2):
+        weight = 1 / (variances + tau2[families])
+        return family_ratio(family_sum(weight * means), family_sum(weight))
+
+    # Direct 1-D maximization on a grid as starting point (and reference)
+    y, v, f = means[known], variances[known], families[known]
+    spread = np.zeros(k)
+    np.maximum.at(spread, f, y)
+    lowest = np.full(k, np.inf)
+    np.minimum.at(lowest, f, y)
+    spread = np.where(np.isfinite(lowest), (spread - lowest) ** 2, 0.0)
+    grid = spread[:, None] * np.concatenate([[0.0], np.geomspace(1e-6, 1, GRID_SIZE)])
+    grid_nll = profile_nll(y, v, f, grid)
+    grid_tau2 = grid[np.arange(k), np.argmin(grid_nll, axis=1)]
+    tau2 = grid_tau2
+    mu = weighted_mean(tau2)
+
+    # Only families that have not converged yet are updated
+    active = np.isfinite(mu)
+    iteration = 0
+    while active.any() and iteration < max_iter:
+        iteration += 1
+        cells = np.flatnonzero(active[families])
+        y, v, f = means[cells], variances[cells], families[cells]
+        weight = 1 / (v + tau2[f])
+        new_mu = family_ratio(family_sum(weight * y, cells), family_sum(weight, cells))
+        residual = (y - new_mu[f]) ** 2 - v
+        new_tau2 = np.maximum(
+            family_ratio(
+                family_sum(weight**2 * residual, cells), family_sum(weight**2, cells)
+            ),
+            0.0,
+        )
+        changed = active & (
+            (np.abs(new_mu - mu) > TOLERANCE * (1 + np.abs(mu)))
+            | (np.abs(new_tau2 - tau2) > TOLERANCE * (1 + tau2))
+        )
+        mu = np.where(active, new_mu, mu)
+        tau2 = np.where(active, new_tau2, tau2)
+        active = changed
+
+    # Check against the grid maximum (fixed points can be saddles or minima)
+    y, v, f = means[known], variances[known], families[known]
+    worse = profile_nll(y, v, f, tau2) > grid_nll.min(axis=1) + TOLERANCE
+    tau2 = np.where(worse, grid_tau2, tau2)
+    mu = np.where(worse, weighted_mean(tau2), mu)
+
+    # Posterior of every cell mean; cells of unknown variance keep their mean
+    prior_var = tau2[families]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        shrinkage = np.where(known, variances / (variances + prior_var), 0.0)
+        # Uncertainty of the estimated family mean (Morris), which dominates
+        # when a cell is shrunken almost completely
+        mu_var = 1 / family_sum(1 / (variances + prior_var))
+    posterior_var = (1 - shrinkage) * variances + shrinkage**2 * mu_var[families]
+    return {
+        "mu": mu,
+        "tau2": tau2,
+        "posterior_mean": np.where(
+            known, mu[families] + (1 - shrinkage) * (means - mu[families]), means
+        ),
+        "posterior_var": np.where(known, posterior_var, np.nan),
+        "shrinkage": shrinkage,
+        "iterations": iteration,
+    }
+
+
+def pool_cells(cells_df, max_iter=MAX_ITERATIONS):
+    """
+    Shrunken estimates for cell summaries (columns of ``completion_cells``).
+
+    Returns:
+        tuple: (pooled DataFrame, iterations of the fit)
+    """
+    cells_df = cells_df.reset_index(drop=True)
+    families = (
+        cells_df.groupby(FAMILY_COLUMNS, sort=False).ngroup().to_numpy(dtype=np.int64)
+    )
+    k = int(families.max()) + 1
+
+    # Pooled within-cell variance per family (cells with n >= 2)
+    dof = np.clip(cells_df["n"].to_numpy(dtype=float) - 1, 0, None)
+    squares = np.nan_to_num(dof * cells_df["sd"].to_numpy(dtype=float) ** 2)
+    within = np.divide(
+        np.bincount(families, squares, minlength=k),
+        np.bincount(families, dof, minlength=k),
+        out=np.full(k, np.nan),
+        where=np.bincount(families, dof, minlength=k) > 0,
+    )
+    variances = within[families] / cells_df["n"].to_numpy(dtype=float)
+
+    fit = fit_partial_pooling(cells_df["mean"], variances, families, max_iter)
+    pooled_df = cells_df[[*FAMILY_COLUMNS, *CELL_COLUMNS, "n", "mean", "sd"]].assign(
+        pooled_mean=fit["posterior_mean"],
+        posterior_sd=np.sqrt(fit["posterior_var"]),
+        shrinkage=fit["shrinkage"],
+        family_mean=fit["mu"][families],
+        family_sd=np.sqrt(fit["tau2"][families]),
+    )
+    return pooled_df, fit["iterations"]
+
+
+def group_estimates(pooled_df, study):
+    """Pooled overall completion rates per experience group of one study (chart layout)"""
+    subset = pooled_df[
+        (pooled_df["source"] == "completion")
+        & (pooled_df["task"] == OVERALL_TASK)
+        & (pooled_df["study"] == study)
+    ]
+    estimates = subset.pivot(
+        index="experience_group",
+        columns="library",
+        values=["pooled_mean", "posterior_sd"],
+    )
+    return pd.DataFrame(
+        {
+            (f"{library}_completion", stat): estimates[(column, library)]
+            for library in LIBRARIES
+            for stat, column in [("mean", "pooled_mean"), ("std", "posterior_sd")]
+        }
+    )
+
+
+def create_pooled_group_comparison(completion_df, pooled_df, study):
+    """Experience group chart of completion.py with the partial pooling estimates"""
+    from completion import create_experience_group_comparison
+
+    fig = create_experience_group_comparison(
+        completion_df, estimates=group_estimates(pooled_df, study)
+    )
+    ax = fig.axes[0]
+    ax.set_title(
+        "Erfüllungsraten nach Erfahrungsgruppe (Partial Pooling)",
+        fontweight="bold",
+        fontsize=14,
+        pad=20,
+    )
+    ax.set_ylabel("Erfüllungsrate (%) ± Posterior-SD", fontweight="bold", fontsize=12)
+    return fig
+
+
+def main():
+    """Main function to pool completion rates and times across studies"""
+    from store import EvalStore
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "studies", nargs="*", type=Path, default=[Path(__file__).parent]
+    )
+    args = parser.parse_args()
+
+    # Studies are keyed by their resolved path: directories with the same
+    # name stay apart, the same directory given twice is pooled once
+    studies = list(
+        dict.fromkeys(str(directory.resolve()) for directory in args.studies)
+    )
+
+    frames = []
+    completion_frames = {}
+    for study in studies:
+        completion_df, time_df = load_study(study)
+        completion_frames[study] = completion_df
+        frames.append(completion_cells(completion_df, study))
+        if time_df is not None:
+            participants = completion_df["participant_id"].nunique()
+            frames.append(time_cells(time_df, study, participants))
+
+    cells_df = pd.concat(frames, ignore_index=True)
+    pooled_df, iterations = pool_cells(cells_df)
+    print(
+        f"✓ {len(pooled_df)} Zellen in "
+        f"{pooled_df.groupby(FAMILY_COLUMNS).ngroups} Familien aus "
+        f"{len(studies)} Studien, Schätzung nach {iterations} Iterationen"
+    )
+
+    output_dir = Path("output")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with stable_output(output_dir / "pooled_estimates.csv") as buffer:
+        pooled_df.to_csv(buffer, index=False)
+    with EvalStore() as store:
+        store.write_results("pooled_estimates", pooled_df)
+
+    study = studies[0]
+    fig = create_pooled_group_comparison(completion_frames[study], pooled_df, study)
+    save_figure(
+        fig,
+        output_dir / "erfahrungsgruppen_pooling.png",
+        dpi=300,
+        bbox_inches="tight",
+        facecolor="white",
+        edgecolor="none",
+    )
+    plt.close(fig)
+
+    print(f"\n📉 Shrinkage der Gesamt-Erfüllungsraten ({Path(study).name}):")
+    overall = pooled_df[
+        (pooled_df["source"] == "completion")
+        & (pooled_df["task"] == OVERALL_TASK)
+        & (pooled_df["study"] == study)
+    ]
+    for _, row in overall.iterrows():
+        mean, pooled_mean = format_numbers([row["mean"], row["pooled_mean"]])
+        print(
+            f"   • {row['experience_group']} {LIBRARIES[row['library']]} "
+            f"(n = {row['n']}): {mean}% → {pooled_mean}% "
+            f"(B = {format_numbers(row['shrinkage'], 2)})"
+        )
+
+    print("\nErgebnisse gespeichert in:")
+    print("- output/pooled_estimates.csv")
+    print("- output/erfahrungsgruppen_pooling.png")
+
+
+if __name__ == "__main__":
+    main()
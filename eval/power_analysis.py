@@ -0,0 +1,337 @@
+"""
+Power Analysis - Monte-Carlo Power Curves for Material vs. Spade
+Bachelor Thesis: Component Libraries for Project Business
+
+Estimates how many participants a follow-up study needs to detect the
+observed differences between Angular Material and Spade. For every task and
+candidate sample size thousands of studies are simulated and evaluated with
+the same paired t-test and Wilcoxon signed-rank test as paired_tests.py
+(Wilcoxon p-values from the normal approximation), batched over all
+simulated studies at once:
+
+- Completion rates: participants' observed paired differences are
+  resampled (bootstrap), so the shape of their distribution is kept
+- Implementation times: time_data.csv only has means and standard
+  deviations per library, differences are drawn from a normal distribution
+  with an assumed within-participant correlation (TIME_CORRELATION)
+
+Sample sizes are simulated in worker processes.
+
+Usage:
+    python power_analysis.py [--simulations 4000] [--max-n 60] [--target 0.8]
+"""
+
+import argparse
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from artifacts import save_figure, stable_output
+from paired_tests import OVERALL_TASK, paired_statistics, participant_slices
+
+plt.style.use("seaborn-v0_8-whitegrid")
+sns.set_palette("Set2")
+
+DEFAULT_SIMULATIONS = 4000
+DEFAULT_SAMPLE_SIZES = list(range(4, 61, 2))
+ALPHA = 0.05
+TARGET_POWER = 0.8
+SEED = 20250601
+
+# Correlation of a participant's times with both libraries (not observed)
+TIME_CORRELATION = 0.5
+
+# Normal approximation (with tie correction) for the simulated Wilcoxon tests;
+# scipy's exact/permutation distributions are too slow for thousands of studies
+WILCOXON_METHOD = "approx"
+
+# Simulated studies per batch (bounds memory to n x SIMULATION_BLOCK values)
+SIMULATION_BLOCK = 2000
+
+# From this many simulated studies in total the sample sizes run in worker processes
+PARALLEL_MIN_SIMULATIONS = 200_000
+
+SOURCE_LABELS = {
+    "completion": "Erfüllungsrate",
+    "time": "Implementierungszeit",
+}
+
+
+def completion_scenarios(df, pivot=None):
+    """Observed paired differences (Material - Spade) per task, incl. the overall average"""
+    cube, _, tasks, libraries, _ = participant_slices(df, pivot=pivot)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        overall = np.nanmean(cube, axis=1, keepdims=True)
+    cube = np.concatenate([cube, overall], axis=1)
+    material, spade = libraries.index("material"), libraries.index("spade")
+
+    scenarios = []
+    for position, task in enumerate(tasks + [OVERALL_TASK]):
+        diffs = cube[:, position, material] - cube[:, position, spade]
+        diffs = diffs[~np.isnan(diffs)]
+        scenarios.append(
+            {
+                "source": "completion",
+                "task": task,
+                "method": "bootstrap",
+                "params": diffs,
+                "observed_n": len(diffs),
+                "mean_diff": float(np.mean(diffs)),
+                "sd_diff": float(np.std(diffs, ddof=1)),
+            }
+        )
+    return scenarios
+
+
+def time_scenarios(time_df, correlation=TIME_CORRELATION):
+    """Normal differences (Material - Spade) per task from means and standard deviations"""
+    scenarios = []
+    for _, row in time_df.iterrows():
+        sd_material, sd_spade = row["Angular Material Std"], row["Spade Std"]
+        sd_diff = np.sqrt(
+            sd_material**2 + sd_spade**2 - 2 * correlation * sd_material * sd_spade
+        )
+        mean_diff = row["Angular Material"] - row["Spade"]
+        scenarios.append(
+            {
+                "source": "time",
+                "task": row["Task"],
+                "method": "normal",
+                "params": (mean_diff, sd_diff),
+                "observed_n": int(row.get("Angular Material N", 0)) or None,
+                "mean_diff": float(mean_diff),
+                "sd_diff": float(sd_diff),
+            }
+        )
+    return scenarios
+
+
+def simulate_power(method, params, n, simulations, alpha, seed):
+    """
+    Share of simulated studies with ``n`` participants that reach significance.
+
+    Returns:
+        tuple: (power of the paired t-test, power of the Wilcoxon test)
+    """
+    rng = np.random.default_rng(seed)
+    significant_t = significant_w = 0
+
+    for start in range(0, simulations, SIMULATION_BLOCK):
+        size = (n, min(SIMULATION_BLOCK, simulations - start))
+        if method == "bootstrap":
+            diffs = rng.choice(params, size=size, replace=True)
+        else:
+            mean_diff, sd_diff = params
+            diffs = rng.normal(mean_diff, sd_diff, size=size)
+
+        # One column per simulated study
+        results = paired_statistics(diffs, wilcoxon_method=WILCOXON_METHOD)
+        significant_t += int(np.sum(results["p_t"] < alpha))
+        significant_w += int(np.sum(results["p_wilcoxon"] < alpha))
+
+    return significant_t / simulations, significant_w / simulations
+
+
+def _simulate_job(job):
+    return simulate_power(*job)
+
+
+def run_power_analysis(
+    scenarios,
+    sample_sizes=DEFAULT_SAMPLE_SIZES,
+    simulations=DEFAULT_SIMULATIONS,
+    alpha=ALPHA,
+    seed=SEED,
+    max_workers=None,
+):
+    """
+    Power curves for every scenario and candidate sample size.
+
+    Args:
+        scenarios (list): Output of ``completion_scenarios``/``time_scenarios``
+        sample_sizes (list): Candidate numbers of participants
+        simulations (int): Simulated studies per scenario and sample size
+        alpha (float): Significance level of both tests
+        seed (int): Seed of the independent per-job random streams
+        max_workers (int): Worker processes (defaults to CPU count)
+
+    Returns:
+        pd.DataFrame: One row per scenario and sample size with the power of
+        the paired t-test and the Wilcoxon signed-rank test
+    """
+    keys = [(position, n) for position in range(len(scenarios)) for n in sample_sizes]
+    seeds = np.random.SeedSequence(seed).spawn(len(keys))
+    jobs = [
+        (
+            scenarios[position]["method"],
+            scenarios[position]["params"],
+            n,
+            simulations,
+            alpha,
+            job_seed,
+        )
+        for (position, n), job_seed in zip(keys, seeds)
+    ]
+
+    if len(jobs) * simulations >= PARALLEL_MIN_SIMULATIONS:
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            powers = list(
+                executor.map(
+                    _simulate_job,
+                    jobs,
+                    chunksize=max(1, len(jobs) // (4 * workers)),
+                )
+            )
+    else:
+        powers = [_simulate_job(job) for job in jobs]
+
+    rows = []
+    for (position, n), (power_t, power_w) in zip(keys, powers):
+        scenario = scenarios[position]
+        rows.append(
+            {
+                "source": scenario["source"],
+                "task": scenario["task"],
+                "n": n,
+                "power_t": power_t,
+                "power_wilcoxon": power_w,
+                "mean_diff": scenario["mean_diff"],
+                "sd_diff": scenario["sd_diff"],
+                "cohens_dz": scenario["mean_diff"] / scenario["sd_diff"],
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def required_sample_sizes(power_df, target=TARGET_POWER):
+    """Smallest simulated n reaching ``target`` power per source and task (NaN if none)"""
+    rows = []
+    for (source, task), group in power_df.groupby(["source", "task"], sort=False):
+        row = {"source": source, "task": task, "cohens_dz": group["cohens_dz"].iloc[0]}
+        for test in ["t", "wilcoxon"]:
+            reached = group.loc[group[f"power_{test}"] >= target, "n"]
+            row[f"n_{test}"] = reached.min() if len(reached) else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def create_power_curves(power_df, target=TARGET_POWER):
+    """Power of the paired t-test (solid) and Wilcoxon test (dashed) per task"""
+    sources = list(pd.unique(power_df["source"]))
+    fig, axes = plt.subplots(
+        1, len(sources), figsize=(7 * len(sources), 6), sharey=True, squeeze=False
+    )
+
+    for ax, source in zip(axes[0], sources):
+        subset = power_df[power_df["source"] == source]
+        for color, (task, group) in zip(
+            sns.color_palette("Set2"), subset.groupby("task", sort=False)
+        ):
+            ax.plot(
+                group["n"],
+                group["power_t"],
+                color=color,
+                linewidth=2,
+                marker="o",
+                markersize=4,
+                label=f"{task} (dz = {group['cohens_dz'].iloc[0]:.2f})".replace(
+                    ".", ","
+                ),
+            )
+            ax.plot(
+                group["n"],
+                group["power_wilcoxon"],
+                color=color,
+                linewidth=1.5,
+                linestyle="--",
+            )
+
+        ax.axhline(target, color="#333333", linestyle=":", linewidth=1.5)
+        ax.set_title(
+            SOURCE_LABELS.get(source, source), fontweight="bold", fontsize=14, pad=15
+        )
+        ax.set_xlabel("Teilnehmende (n)", fontweight="bold", fontsize=12)
+        ax.set_ylim(0, 1.02)
+        ax.legend(loc="lower right", frameon=True, fancybox=True, shadow=True)
+        ax.grid(alpha=0.3)
+
+    axes[0][0].set_ylabel(
+        "Teststärke (t-Test —, Wilcoxon - -)", fontweight="bold", fontsize=12
+    )
+    plt.tight_layout()
+    return fig
+
+
+def main():
+    """Main function to simulate the power of the Material vs. Spade comparison"""
+    from dev_ex import load_data_from_csv
+    from pivot_cube import load_pivot_cube
+    from store import EvalStore
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--simulations", type=int, default=DEFAULT_SIMULATIONS)
+    parser.add_argument("--max-n", type=int, default=max(DEFAULT_SAMPLE_SIZES))
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--target", type=float, default=TARGET_POWER)
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+
+    _, time_df = load_data_from_csv()
+    scenarios = completion_scenarios(None, pivot=load_pivot_cube())
+    scenarios += time_scenarios(time_df)
+    sample_sizes = list(range(4, args.max_n + 1, 2))
+
+    print(
+        f"Simuliere {args.simulations} Studien für {len(scenarios)} Szenarien "
+        f"x {len(sample_sizes)} Stichprobengrößen..."
+    )
+    power_df = run_power_analysis(
+        scenarios, sample_sizes, args.simulations, args.alpha, args.seed
+    )
+
+    output_dir = Path("output")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with stable_output(output_dir / "power_analysis.csv") as buffer:
+        power_df.to_csv(buffer, index=False)
+    with EvalStore() as store:
+        store.write_results("power_analysis", power_df)
+
+    fig = create_power_curves(power_df, args.target)
+    save_figure(fig, output_dir / "power_curves.png", dpi=300, bbox_inches="tight")
+    plt.close(fig)
+
+    observed_n = scenarios[0]["observed_n"]
+    print(
+        f"\nBenötigte Teilnehmende für {args.target:.0%} Teststärke "
+        f"(α = {str(args.alpha).replace('.', ',')}, bisher n = {observed_n}):"
+    )
+    required = required_sample_sizes(power_df, args.target)
+    for _, row in required.iterrows():
+        needed = {
+            test: (
+                f"n = {int(row[f'n_{test}'])}"
+                if not np.isnan(row[f"n_{test}"])
+                else f"n > {args.max_n}"
+            )
+            for test in ["t", "wilcoxon"]
+        }
+        print(
+            f"   • {SOURCE_LABELS[row['source']]} {row['task']}: "
+            f"t-Test {needed['t']}, Wilcoxon {needed['wilcoxon']}"
+        )
+
+    print("\nErgebnisse gespeichert in:")
+    print("- output/power_analysis.csv")
+    print("- output/power_curves.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Render Client - Thin Entry Point for the Render Server
+Bachelor Thesis: Component Libraries for Project Business
+
+Replaces ``python completion.py`` / ``dev_ex.py`` / ``participants.py``
+when render_server.py is running: only the standard library is imported and
+the report is rendered by the warm server. Without a running server the
+scripts are executed in-process as before. The scripts themselves keep
+rendering in-process: they import matplotlib and pandas at module level, so
+by the time their main() could hand off to the server the start-up cost the
+server saves is already paid - this client is the fast entry point.
+
+Server and client meet in a directory only the current user can access
+(~/.spade-eval-render, mode 0700): a Unix socket (localhost TCP on Windows)
+and a random authkey written by the server on every start (mode 0600).
+
+Usage:
+    python render_client.py completion dev_ex participants
+    python render_client.py --chart code_aufwand_vergleich --format png --format pdf
+"""
+
+import argparse
+import os
+import runpy
+import sys
+import time
+from multiprocessing.connection import Client
+from pathlib import Path
+
+EVAL_DIR = Path(__file__).parent
+
+# Shared with render_server.py, which imports them from here
+RUNTIME_DIR = Path.home() / ".spade-eval-render"
+SOCKET_NAME = "render.sock"
+AUTHKEY_NAME = "authkey"
+TCP_ADDRESS = ("127.0.0.1", 50321)  # Windows has no Unix sockets
+
+
+def server_address():
+    """(address, family) the render server listens on"""
+    if sys.platform != "win32":
+        return str(RUNTIME_DIR / SOCKET_NAME), "AF_UNIX"
+    return TCP_ADDRESS, "AF_INET"
+
+
+def read_authkey():
+    """Authkey of the running server, ``None`` if no server was started"""
+    try:
+        return (RUNTIME_DIR / AUTHKEY_NAME).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def submit(jobs):
+    """
+    Send jobs to the render server.
+
+    Returns:
+        list: One response per job, or ``None`` if no server is running
+    """
+    authkey = read_authkey()
+    if authkey is None:
+        return None
+    address, family = server_address()
+    try:
+        connection = Client(address, family=family, authkey=authkey)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None
+
+    with connection:
+        responses = []
+        for job in jobs:
+            connection.send(job)
+            if job != "shutdown":
+                responses.append(connection.recv())
+        return responses
+
+
+def run_locally(report):
+    """Fallback: run the report script in this process"""
+    script = str(EVAL_DIR / f"{report}.py")
+    previous_cwd, previous_argv = os.getcwd(), sys.argv
+    sys.path.insert(0, str(EVAL_DIR))
+    os.chdir(EVAL_DIR)
+    # The script parses its own arguments, not the client's
+    sys.argv = [script]
+    try:
+        runpy.run_path(script, run_name="__main__")
+    finally:
+        os.chdir(previous_cwd)
+        sys.argv = previous_argv
+
+
+def main():
+    """Main function to request reports or charts from the render server"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("reports", nargs="*", help="completion, dev_ex, participants")
+    parser.add_argument("--chart", action="append", default=[])
+    parser.add_argument("--format", action="append", dest="formats")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--shutdown", action="store_true")
+    args = parser.parse_args()
+
+    jobs = [{"report": report} for report in args.reports]
+    jobs += [
+        {"chart": chart, "formats": args.formats or ["png"], "dpi": args.dpi}
+        for chart in args.chart
+    ]
+    if args.shutdown:
+        jobs.append("shutdown")
+
+    started = time.perf_counter()
+    responses = submit(jobs)
+
+    if responses is None:
+        print("⚠️  Render Server nicht erreichbar - rendere lokal")
+        for report in args.reports:
+            run_locally(report)
+        if args.chart:
+            print("❌ Einzelne Charts benötigen den Render Server")
+        return
+
+    for job, response in zip(jobs, responses):
+        label = job.get("chart") or job.get("report")
+        print(response["output"], end="")
+        if not response["ok"]:
+            print(f"❌ {label}: {response['error']}")
+            print(response["traceback"])
+            continue
+        for file in response.get("files", []):
+            print(f"✓ {file}")
+        print(f"⏱️  {label}: {response['elapsed'] * 1000:.0f}ms")
+
+    print(f"⏱️  Gesamt: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
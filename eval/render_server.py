@@ -0,0 +1,333 @@
+"""
+Render Server - Persistent Warm Process for Evaluation Charts
+Bachelor Thesis: Component Libraries for Project Business
+
+Long-lived local process that imports matplotlib/seaborn/pandas and the
+evaluation modules once, warms up the font manager and then renders jobs
+sent over a local socket (see render_client.py):
+
+    {"report": "completion"}                      run a script's main()
+    {"chart": "code_aufwand_vergleich",           render one chart
+     "formats": ["png", "pdf"], "dpi": 300}
+
+Every job runs in its own rc_context with the style of its script, so the
+publication rcParams of dev_ex.py never leak into other charts. Datasets are
+loaded with the scripts' own loaders (store, schema validation, timing log
+aggregation) and kept in memory until one of the stage's inputs changes.
+Output printed by a job is returned to the client instead of the server
+console; malformed jobs get an error response.
+
+Jobs arrive pickled, so only the current user may connect: the socket lives
+in a 0700 directory and every start writes a fresh random authkey (0600)
+that the client reads (see render_client.py).
+
+Usage:
+    python render_server.py
+"""
+
+import io
+import os
+import secrets
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+import completion
+import dev_ex
+import participants
+from artifacts import save_figure
+from render_client import AUTHKEY_NAME, RUNTIME_DIR, server_address
+from watch import STAGES, snapshot, stage_inputs
+
+EVAL_DIR = Path(__file__).parent
+OUTPUT_DIR = EVAL_DIR / "output"
+
+# Script reports that can be run through the server
+REPORTS = ["completion", "dev_ex", "participants"]
+
+_dataset_cache = {}
+
+
+def load_dataset(stage, loader):
+    """Load a stage's data with its script's loader, cached while its inputs are unchanged"""
+    version = snapshot(stage_inputs(stage))
+
+    cached = _dataset_cache.get(stage)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    data = loader()
+    _dataset_cache[stage] = (version, data)
+    return data
+
+
+def completion_data():
+    return load_dataset("completion", completion.load_completion_data)
+
+
+def loc_data():
+    return load_dataset("dev_ex", dev_ex.load_data_from_csv)[0]
+
+
+def time_data():
+    return load_dataset("dev_ex", dev_ex.load_data_from_csv)[1]
+
+
+def _save(fig, output_dir, name, formats, dpi):
+    files = []
+    for fmt in formats:
+        path = Path(output_dir) / f"{name}.{fmt}"
+        save_figure(
+            fig,
+            path,
+            dpi=dpi,
+            bbox_inches="tight",
+            facecolor="white",
+            edgecolor="none",
+        )
+        files.append(str(path))
+    return files
+
+
+def _render_figure(create):
+    def render(df, output_dir, name, formats, dpi):
+        result = create(df)
+        fig = result[0] if isinstance(result, tuple) else result
+        return _save(fig, output_dir, name, formats, dpi)
+
+    return render
+
+
+def _render_dev_ex(plot):
+    def render(df, output_dir, name, formats, dpi):
+        dev_ex.setup_matplotlib()
+        plot(df, Path(output_dir), dpi=dpi, formats=tuple(formats))
+        return [str(Path(output_dir) / f"{name}.{fmt}") for fmt in formats]
+
+    return render
+
+
+# Chart name -> (stage, dataset loader, render function)
+CHARTS = {
+    "completion_rates_overview": (
+        "completion",
+        completion_data,
+        _render_figure(completion.create_completion_rate_visualization),
+    ),
+    "experience_completion_correlation": (
+        "completion",
+        completion_data,
+        _render_figure(completion.create_experience_correlation_analysis),
+    ),
+    "experience_group_comparison": (
+        "completion",
+        completion_data,
+        _render_figure(completion.create_experience_group_comparison),
+    ),
+    "experience_correlation_matrix": (
+        "completion",
+        completion_data,
+        _render_figure(completion.create_correlation_heatmap),
+    ),
+    "code_aufwand_vergleich": (
+        "dev_ex",
+        loc_data,
+        _render_dev_ex(dev_ex.plot_lines_of_code),
+    ),
+    "implementierungszeit_vergleich": (
+        "dev_ex",
+        time_data,
+        _render_dev_ex(dev_ex.plot_time_to_implement),
+    ),
+    "berufserfahrung_stichprobe": (
+        "participants",
+        None,
+        _render_figure(lambda df: participants.create_participant_distribution()),
+    ),
+}
+
+
+def _in_stage_style(stage, render):
+    """Run ``render`` with the rcParams/palette of the stage's script"""
+    _, _, palette, _ = STAGES[stage]
+    with plt.rc_context():
+        plt.style.use("seaborn-v0_8-whitegrid")
+        if palette:
+            sns.set_palette(palette)
+        try:
+            return render()
+        finally:
+            plt.close("all")
+
+
+def run_chart_job(job):
+    if job["chart"] not in CHARTS:
+        raise ValueError(f"Unbekannter Chart: {job['chart']!r}")
+    stage, data, render = CHARTS[job["chart"]]
+    df = data() if data else None
+    output_dir = Path(job.get("output_dir") or OUTPUT_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    files = _in_stage_style(
+        stage,
+        lambda: render(
+            df,
+            output_dir,
+            job["chart"],
+            job.get("formats") or ["png"],
+            job.get("dpi") or 300,
+        ),
+    )
+    return {"files": files}
+
+
+def run_report_job(job):
+    module = STAGES[job["report"]][0]
+
+    # The scripts write relative to the eval directory and parse their own
+    # arguments (e.g. dev_ex.py --trim), which must not see the server's
+    previous_cwd, previous_argv = os.getcwd(), sys.argv
+    os.chdir(EVAL_DIR)
+    sys.argv = [module.__file__]
+    try:
+        _in_stage_style(job["report"], module.main)
+    finally:
+        os.chdir(previous_cwd)
+        sys.argv = previous_argv
+    return {}
+
+
+def job_label(job):
+    """Chart or report name of a job for the server log"""
+    if isinstance(job, dict):
+        return job.get("chart") or job.get("report")
+    return type(job).__name__
+
+
+def handle_job(job):
+    """Run one job and return a response dict (never raises)"""
+    started = time.perf_counter()
+    output = io.StringIO()
+    try:
+        # Chart and report jobs print progress; it belongs to the client
+        with redirect_stdout(output):
+            if not isinstance(job, dict):
+                raise TypeError(f"Job muss ein dict sein, nicht {type(job).__name__}")
+            if "chart" in job:
+                response = run_chart_job(job)
+            elif job.get("report") in REPORTS:
+                response = run_report_job(job)
+            else:
+                raise ValueError(f"Unbekannter Job: {job!r}")
+        response["ok"] = True
+    except Exception as error:
+        response = {
+            "ok": False,
+            "error": f"{type(error).__name__}: {error}",
+            "traceback": traceback.format_exc(),
+        }
+    response["output"] = output.getvalue()
+    response["elapsed"] = time.perf_counter() - started
+    return response
+
+
+def warm_up():
+    """Trigger font manager and renderer initialization once"""
+    with plt.rc_context():
+        fig, ax = plt.subplots(figsize=(1, 1))
+        ax.text(0.5, 0.5, "Spade", fontweight="bold")
+        fig.savefig(io.BytesIO(), format="png")
+        fig.savefig(io.BytesIO(), format="pdf")
+        plt.close(fig)
+
+
+def prepare_runtime_dir():
+    """
+    User-only runtime directory with a fresh authkey.
+
+    Returns:
+        tuple: (address, family, authkey) for the listener
+    """
+    RUNTIME_DIR.mkdir(mode=0o700, exist_ok=True)
+    os.chmod(RUNTIME_DIR, 0o700)
+
+    authkey = secrets.token_bytes(32)
+    authkey_path = RUNTIME_DIR / AUTHKEY_NAME
+    authkey_path.unlink(missing_ok=True)
+    descriptor = os.open(authkey_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(descriptor, "wb") as file:
+        file.write(authkey)
+
+    address, family = server_address()
+    if family == "AF_UNIX":
+        # Socket file of a previous server that was not shut down cleanly
+        Path(address).unlink(missing_ok=True)
+    return address, family, authkey
+
+
+def _accept_jobs(listener, address):
+    print(f"🚀 Render Server bereit auf {address}")
+    while True:
+        try:
+            connection = listener.accept()
+        except (AuthenticationError, EOFError, OSError) as error:
+            # Wrong authkey (e.g. a client of an older server) or aborted handshake
+            print(f"⚠️  Verbindung abgelehnt: {type(error).__name__}")
+            continue
+        with connection:
+            while True:
+                try:
+                    job = connection.recv()
+                except EOFError:
+                    break
+                except Exception as error:
+                    # Message that cannot be unpickled: drop this client only
+                    print(f"⚠️  Ungültige Nachricht: {type(error).__name__}")
+                    break
+                if isinstance(job, str) and job == "shutdown":
+                    print("👋 Render Server beendet")
+                    return
+                response = handle_job(job)
+                try:
+                    connection.send(response)
+                except OSError:
+                    # Client went away before the response
+                    break
+                status = "✓" if response["ok"] else "❌"
+                print(
+                    f"{status} {job_label(job)} in {response['elapsed'] * 1000:.0f}ms"
+                )
+
+
+def serve():
+    """Accept connections and render their jobs one after another"""
+    warm_up()
+    address, family, authkey = prepare_runtime_dir()
+    try:
+        with Listener(address, family=family, authkey=authkey) as listener:
+            _accept_jobs(listener, address)
+    finally:
+        (RUNTIME_DIR / AUTHKEY_NAME).unlink(missing_ok=True)
+
+
+def main():
+    """Main function to start the render server"""
+    try:
+        serve()
+    except KeyboardInterrupt:
+        print("\n👋 Render Server beendet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Report Bundle - All Evaluation Charts and Tables in One PDF
+Bachelor Thesis: Component Libraries for Project Business
+
+Streams every chart of completion.py, dev_ex.py and participants.py plus
+the summary tables into a single multi-page PDF. Each figure is created in
+the style of its script, rendered once as vector page and closed right
+away, and the PDF is streamed to disk (not buffered in memory), so memory
+stays constant regardless of the number of pages. No PNGs are written on
+the way. The bundle carries no build date, so unchanged data gives a
+byte-identical PDF.
+
+Usage:
+    python report_bundle.py [--output output/evaluationsbericht.pdf]
+"""
+
+import argparse
+import textwrap
+from contextlib import contextmanager
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import seaborn as sns
+from matplotlib.backends.backend_pdf import PdfPages
+
+import completion
+import dev_ex
+import participants
+from artifacts import STABLE_METADATA, streamed_output
+from paired_tests import run_paired_tests
+from watch import STAGES
+
+REPORT_PATH = Path("output") / "evaluationsbericht.pdf"
+REPORT_TITLE = "Component Libraries for Project Business - Evaluation"
+
+# A4 landscape for title and table pages
+PAGE_SIZE = (11.69, 8.27)
+TABLE_ROWS_PER_PAGE = 22
+HEADER_COLOR = "#603DB1"
+HEADER_WRAP = 14  # characters per line of a column header
+
+CHART_TITLES = {
+    "completion_rates_overview": "Erfüllungsraten im Überblick",
+    "experience_completion_correlation": "Erfahrung vs. Erfüllungsrate",
+    "experience_group_comparison": "Erfüllungsraten nach Erfahrungsgruppe",
+    "experience_correlation_matrix": "Korrelationsmatrix Erfahrung",
+    "code_aufwand_vergleich": "Code-Aufwand",
+    "implementierungszeit_vergleich": "Implementierungszeit",
+    "berufserfahrung_stichprobe": "Berufserfahrung der Stichprobe",
+}
+
+PAIRED_TEST_COLUMNS = {
+    "group": "Gruppe",
+    "task": "Aufgabe",
+    "n": "n",
+    "mean_diff": "Mittl. Differenz",
+    "cohens_dz": "Cohen's dz",
+    "p_t_holm": "p t-Test (Holm)",
+    "p_wilcoxon_holm": "p Wilcoxon (Holm)",
+}
+
+
+@contextmanager
+def stage_style(stage):
+    """rcParams and palette of the stage's script (see watch.STAGES)"""
+    palette = STAGES[stage][2]
+    with plt.rc_context():
+        plt.style.use("seaborn-v0_8-whitegrid")
+        if palette:
+            sns.set_palette(palette)
+        yield
+
+
+def _figure(result):
+    """Figure of a chart function that returns either a figure or (figure, data)"""
+    return result[0] if isinstance(result, tuple) else result
+
+
+def chart_pages(completion_df, loc_df, time_df):
+    """(stage, title, create) per chart; ``create`` builds the figure lazily"""
+    for name, (_, create) in completion.CHARTS.items():
+        yield (
+            "completion",
+            name,
+            lambda create=create: _figure(create(completion_df)),
+        )
+
+    def dev_ex_chart(plot, data):
+        def create():
+            dev_ex.setup_matplotlib()
+            return plot(data, Path("output"), formats=())
+
+        return create
+
+    yield (
+        "dev_ex",
+        "code_aufwand_vergleich",
+        dev_ex_chart(dev_ex.plot_lines_of_code, loc_df),
+    )
+    yield (
+        "dev_ex",
+        "implementierungszeit_vergleich",
+        dev_ex_chart(dev_ex.plot_time_to_implement, time_df),
+    )
+    yield (
+        "participants",
+        "berufserfahrung_stichprobe",
+        participants.create_participant_distribution,
+    )
+
+
+def create_title_page(contents):
+    """Title page with the list of contents"""
+    fig = plt.figure(figsize=PAGE_SIZE)
+    fig.text(0.08, 0.85, REPORT_TITLE, fontsize=22, fontweight="bold")
+    fig.text(
+        0.08,
+        0.79,
+        "Bachelor Thesis - Angular Material vs. Spade",
+        fontsize=13,
+        color="#555555",
+    )
+    fig.text(0.08, 0.68, "Inhalt", fontsize=15, fontweight="bold")
+    for position, title in enumerate(contents):
+        fig.text(0.1, 0.63 - position * 0.04, f"{position + 2}.  {title}", fontsize=12)
+    return fig
+
+
+def create_table_page(title, df):
+    """One page with a table (at most TABLE_ROWS_PER_PAGE rows)"""
+    fig, ax = plt.subplots(figsize=PAGE_SIZE)
+    ax.axis("off")
+    ax.set_title(title, fontweight="bold", fontsize=14, pad=20)
+
+    table = ax.table(
+        cellText=df.astype(str).to_numpy(),
+        colLabels=[textwrap.fill(str(col), HEADER_WRAP) for col in df.columns],
+        loc="upper center",
+        cellLoc="center",
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(9)
+    table.scale(1, 1.5)
+    for (row, _), cell in table.get_celld().items():
+        cell.set_edgecolor("#CCCCCC")
+        if row == 0:
+            cell.set_height(cell.get_height() * 2)
+            cell.set_facecolor(HEADER_COLOR)
+            cell.set_text_props(color="white", fontweight="bold")
+        elif row % 2 == 0:
+            cell.set_facecolor("#F3F0FA")
+    return fig
+
+
+def table_pages(title, df):
+    """(title, create) per page of a table split into TABLE_ROWS_PER_PAGE rows"""
+    pages = max(1, -(-len(df) // TABLE_ROWS_PER_PAGE))
+    for page in range(pages):
+        rows = df.iloc[page * TABLE_ROWS_PER_PAGE : (page + 1) * TABLE_ROWS_PER_PAGE]
+        page_title = title if pages == 1 else f"{title} ({page + 1}/{pages})"
+        yield page_title, lambda rows=rows, page_title=page_title: (
+            create_table_page(page_title, rows)
+        )
+
+
+def summary_tables(completion_df, loc_df, time_df):
+    """(title, DataFrame) of the summary tables"""
+    yield (
+        "Developer Experience - Zusammenfassung",
+        dev_ex.build_summary_table(loc_df, time_df),
+    )
+
+    descriptive = (
+        completion_df[["material_completion", "spade_completion"]]
+        .describe()
+        .round(2)
+        .rename(
+            columns={
+                "material_completion": "Angular Material (%)",
+                "spade_completion": "Spade (%)",
+            }
+        )
+        .rename_axis("Kennzahl")
+        .reset_index()
+    )
+    yield "Erfüllungsraten - Deskriptive Statistik", descriptive
+
+    paired = run_paired_tests(completion_df)[list(PAIRED_TEST_COLUMNS)]
+    paired = paired.round(3).rename(columns=PAIRED_TEST_COLUMNS)
+    yield "Paired Tests Material vs. Spade", paired
+
+
+def _save_page(pdf, fig, page_number):
+    fig.text(
+        0.99, 0.01, f"Seite {page_number}", ha="right", fontsize=8, color="#777777"
+    )
+    pdf.savefig(fig, facecolor="white", edgecolor="none")
+    plt.close(fig)
+
+
+def build_report(output_path=REPORT_PATH):
+    """
+    Write the report bundle.
+
+    Args:
+        output_path (Path): Target PDF file
+
+    Returns:
+        int: Number of pages
+    """
+    completion_df = completion.load_completion_data()
+    loc_df, time_df = dev_ex.load_data_from_csv()
+
+    charts = list(chart_pages(completion_df, loc_df, time_df))
+    tables = [
+        page
+        for title, df in summary_tables(completion_df, loc_df, time_df)
+        for page in table_pages(title, df)
+    ]
+    contents = [CHART_TITLES[name] for _, name, _ in charts]
+    contents += [title for title, _ in tables]
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        **STABLE_METADATA["pdf"],
+        "Title": REPORT_TITLE,
+        "Subject": "Evaluation Angular Material vs. Spade",
+    }
+
+    with streamed_output(output_path) as handle, PdfPages(
+        handle, metadata=metadata
+    ) as pdf:
+        _save_page(pdf, create_title_page(contents), 1)
+        page_number = 1
+
+        for stage, name, create in charts:
+            page_number += 1
+            print(f"📄 Seite {page_number}: {CHART_TITLES[name]}")
+            with stage_style(stage):
+                _save_page(pdf, create(), page_number)
+
+        for title, create in tables:
+            page_number += 1
+            print(f"📄 Seite {page_number}: {title}")
+            with stage_style("completion"):
+                _save_page(pdf, create(), page_number)
+
+    return page_number
+
+
+def main():
+    """Main function to bundle all evaluation outputs into one PDF"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args()
+
+    pages = build_report(args.output)
+    print(f"✅ Bericht mit {pages} Seiten gespeichert in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
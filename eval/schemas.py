@@ -0,0 +1,357 @@
+"""
+Input Contracts - Declarative Schemas for the Evaluation Inputs
+Bachelor Thesis: Component Libraries for Project Business
+
+Every input table is checked right after loading, before any import,
+decoding or rendering: column presence, types, value ranges, allowed
+values, key uniqueness, required rows and row order. All checks are
+vectorized over whole columns, and all violations are collected and
+raised together as one ``SchemaError`` with file line numbers and example
+values:
+
+    validate(pd.read_csv(path), LOC_SCHEMA, source=path)
+
+Unknown columns that closely resemble an expected one are reported as
+probably renamed headers instead of being silently ignored.
+"""
+
+import difflib
+
+import numpy as np
+import pandas as pd
+
+TASKS = ["Button", "Input", "Dropdown"]
+EXPERIENCE_GROUPS = ["Studenten", "Junior", "Mid-Level", "Senior"]
+LOC_SERIES = [
+    ("Angular Material", "Wrapper & Overrides"),
+    ("Spade", "Code Changes"),
+    ("Spade", "Code Additions"),
+]
+
+# Example rows/values listed per violation
+MAX_EXAMPLES = 3
+
+# Similarity from which an unknown column counts as a renamed expected column
+RENAMED_COLUMN_CUTOFF = 0.8
+
+
+class SchemaError(ValueError):
+    """Input table violates its schema; ``problems`` lists every violation"""
+
+    def __init__(self, schema, problems, source=None):
+        self.schema = schema
+        self.problems = problems
+        self.source = source
+        name = source if source is not None else "Tabelle"
+        lines = [
+            f"{name} verletzt das Schema '{schema.name}' ({len(problems)} Problem(e)):"
+        ]
+        lines += [f"   • {problem}" for problem in problems]
+        super().__init__("\n".join(lines))
+
+
+class Column:
+    """
+    Contract of one column.
+
+    Args:
+        name (str): Column header
+        kind (str): "integer", "number" or "string"
+        required (bool): Column must be present
+        nullable (bool): Missing values are allowed
+        min_value (float): Smallest allowed value (numeric kinds)
+        max_value (float): Largest allowed value (numeric kinds)
+        allowed (list): Allowed values
+        prefix (bool): ``name`` is a header prefix (e.g. a multi-select
+            question with one "Question [Option]" column per option)
+    """
+
+    def __init__(
+        self,
+        name,
+        kind="string",
+        required=True,
+        nullable=True,
+        min_value=None,
+        max_value=None,
+        allowed=None,
+        prefix=False,
+    ):
+        self.name = name
+        self.kind = kind
+        self.required = required
+        self.nullable = nullable
+        self.min_value = min_value
+        self.max_value = max_value
+        self.allowed = allowed
+        self.prefix = prefix
+
+
+class Schema:
+    """
+    Contract of a table.
+
+    Args:
+        name (str): Name used in error messages
+        columns (list): Column contracts
+        unique (list): Key columns whose combination must be unique
+        required_rows (list): Key tuples (in the order of ``unique``) that
+            must be present
+        order (tuple): (column, values) - rows must follow this value order
+        check_renamed (bool): Report unknown columns that resemble expected ones
+    """
+
+    def __init__(
+        self,
+        name,
+        columns,
+        unique=None,
+        required_rows=None,
+        order=None,
+        check_renamed=False,
+    ):
+        self.name = name
+        self.columns = columns
+        self.unique = unique
+        self.required_rows = required_rows
+        self.order = order
+        self.check_renamed = check_renamed
+
+
+def _rows(mask, index):
+    """Positions and file line numbers (header = line 1) of the first violations"""
+    positions = np.flatnonzero(np.asarray(mask, dtype=bool))[:MAX_EXAMPLES]
+    # Chunked reads keep counting the RangeIndex, so labels are row numbers
+    rows = index[positions] if isinstance(index, pd.RangeIndex) else positions
+    return positions, ", ".join(str(row + 2) for row in rows)
+
+
+def _plain(value):
+    """Python scalar for readable examples (no ``np.float64(...)`` reprs)"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _violation(column, mask, values, description):
+    count = int(np.count_nonzero(mask))
+    if count == 0:
+        return None
+    positions, lines = _rows(mask, values.index)
+    examples = ", ".join(repr(_plain(values.iloc[position])) for position in positions)
+    more = " ..." if count > MAX_EXAMPLES else ""
+    return f"{column}: {count} {description} (Zeilen {lines}{more}: {examples})"
+
+
+def _matching_columns(df, column):
+    if column.prefix:
+        return [col for col in df.columns if str(col).startswith(column.name)]
+    return [column.name] if column.name in df.columns else []
+
+
+def _check_values(name, values, column):
+    """Type, null, range and allowed-value violations of one column"""
+    problems = []
+    missing = values.isna().to_numpy()
+
+    if not column.nullable:
+        problems.append(_violation(name, missing, values, "fehlende Werte"))
+
+    if column.kind in ("integer", "number"):
+        numeric = pd.to_numeric(values, errors="coerce")
+        not_numeric = numeric.isna().to_numpy() & ~missing
+        problems.append(_violation(name, not_numeric, values, "nicht-numerische Werte"))
+        present = numeric.notna().to_numpy()
+        numbers = numeric.to_numpy(dtype=float, na_value=np.nan)
+
+        with np.errstate(invalid="ignore"):
+            if column.kind == "integer":
+                fractional = present & (np.mod(numbers, 1) != 0)
+                problems.append(
+                    _violation(name, fractional, values, "nicht-ganzzahlige Werte")
+                )
+            if column.min_value is not None:
+                problems.append(
+                    _violation(
+                        name,
+                        present & (numbers < column.min_value),
+                        values,
+                        f"Werte unter {column.min_value}",
+                    )
+                )
+            if column.max_value is not None:
+                problems.append(
+                    _violation(
+                        name,
+                        present & (numbers > column.max_value),
+                        values,
+                        f"Werte über {column.max_value}",
+                    )
+                )
+
+    if column.allowed is not None:
+        unknown = ~values.isin(column.allowed).to_numpy() & ~missing
+        problems.append(
+            _violation(
+                name,
+                unknown,
+                values,
+                f"unbekannte Werte (erlaubt: {', '.join(map(str, column.allowed))})",
+            )
+        )
+
+    return [problem for problem in problems if problem]
+
+
+def _renamed_columns(df, schema):
+    """Unknown columns that closely resemble a missing optional column"""
+    problems = []
+    # Missing required columns already name their closest match
+    names = [column.name for column in schema.columns if not column.required]
+    matched = set()
+    for column in schema.columns:
+        matched.update(_matching_columns(df, column))
+
+    for col in df.columns:
+        if col in matched:
+            continue
+        # Compare option columns of multi-select questions by their question part
+        question = str(col).split(" [")[0]
+        close = difflib.get_close_matches(
+            question, names, n=1, cutoff=RENAMED_COLUMN_CUTOFF
+        )
+        if close:
+            problems.append(
+                f"Unbekannte Spalte '{col}' - umbenannt? Erwartet: '{close[0]}'"
+            )
+    return problems
+
+
+def validate(df, schema, source=None):
+    """
+    Check a table against its schema.
+
+    Args:
+        df (pd.DataFrame): Table as loaded
+        schema (Schema): Contract of the table
+        source (str): File name for the error message
+
+    Returns:
+        pd.DataFrame: ``df`` unchanged
+
+    Raises:
+        SchemaError: With all violations if any check fails
+    """
+    problems = []
+
+    for column in schema.columns:
+        matches = _matching_columns(df, column)
+        if not matches:
+            if column.required:
+                close = difflib.get_close_matches(
+                    column.name, [str(col) for col in df.columns], n=1, cutoff=0.6
+                )
+                hint = f" (ähnlich: '{close[0]}')" if close else ""
+                problems.append(f"Spalte '{column.name}' fehlt{hint}")
+            continue
+        for name in matches:
+            problems += _check_values(name, df[name], column)
+
+    if schema.check_renamed:
+        problems += _renamed_columns(df, schema)
+
+    keys = schema.unique
+    if keys and all(key in df.columns for key in keys):
+        duplicated = df.duplicated(keys, keep=False).to_numpy()
+        if duplicated.any():
+            _, lines = _rows(duplicated, df.index)
+            problems.append(
+                f"{' + '.join(keys)}: {int(duplicated.sum())} Zeilen mit doppeltem "
+                f"Schlüssel (Zeilen {lines})"
+            )
+
+        if schema.required_rows is not None:
+            present = pd.MultiIndex.from_frame(df[keys].astype(str))
+            required = pd.MultiIndex.from_tuples(
+                [tuple(map(str, row)) for row in schema.required_rows]
+            )
+            missing_rows = required[~required.isin(present)]
+            if len(missing_rows):
+                listed = "; ".join(
+                    " / ".join(row) for row in missing_rows[:MAX_EXAMPLES]
+                )
+                more = " ..." if len(missing_rows) > MAX_EXAMPLES else ""
+                problems.append(
+                    f"{len(missing_rows)} erwartete Zeilen fehlen ({listed}{more})"
+                )
+
+    if schema.order is not None and schema.order[0] in df.columns:
+        col, values = schema.order
+        ranks = df[col].map({value: rank for rank, value in enumerate(values)})
+        out_of_order = (ranks.diff() < 0).to_numpy()
+        if out_of_order.any():
+            _, lines = _rows(out_of_order, df.index)
+            problems.append(
+                f"{col}: Zeilen nicht in der Reihenfolge {', '.join(values)} "
+                f"(Zeilen {lines})"
+            )
+
+    if problems:
+        raise SchemaError(schema, problems, source)
+    return df
+
+
+COMPLETION_SCHEMA = Schema(
+    "completion",
+    [
+        Column("participant_id", "integer", nullable=False),
+        Column("experience_years", "number", min_value=0, max_value=60),
+        Column("experience_group", allowed=EXPERIENCE_GROUPS),
+        Column("task", nullable=False, allowed=TASKS),
+        Column("material_completion", "number", min_value=0, max_value=100),
+        Column("spade_completion", "number", min_value=0, max_value=100),
+    ],
+    unique=["participant_id", "task"],
+)
+
+# dev_ex.py reads the series per library by position: complete and ordered by task
+LOC_SCHEMA = Schema(
+    "loc",
+    [
+        Column("Task", nullable=False, allowed=TASKS),
+        Column("Library", nullable=False),
+        Column("Type", nullable=False),
+        Column("Lines", "integer", nullable=False, min_value=0),
+    ],
+    unique=["Task", "Library", "Type"],
+    required_rows=[
+        (task, library, kind) for task in TASKS for library, kind in LOC_SERIES
+    ],
+    order=("Task", TASKS),
+)
+
+TIME_SCHEMA = Schema(
+    "time",
+    [Column("Task", nullable=False)]
+    + [
+        Column(name, "number", nullable=False, min_value=0)
+        for name in [
+            "Angular Material",
+            "Spade",
+            "Angular Material Std",
+            "Spade Std",
+        ]
+    ],
+    unique=["Task"],
+    required_rows=[(task,) for task in TASKS],
+)
+
+# Column checks only: logs are validated chunk by chunk, so key uniqueness and
+# row order could not be enforced across chunks (see timing_logs.py)
+TIME_LOG_SCHEMA = Schema(
+    "time_log",
+    [
+        Column("participant_id", nullable=False),
+        Column("task", nullable=False),
+        Column("library", nullable=False),
+        Column("minutes", "number", min_value=0),
+    ],
+)
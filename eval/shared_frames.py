@@ -0,0 +1,287 @@
+"""
+Shared Frames - Zero-Copy DataFrame Hand-off to Worker Processes
+Bachelor Thesis: Component Libraries for Project Business
+
+A loaded frame is published once into a single shared memory block; worker
+processes only receive a small picklable handle and attach to the block
+instead of unpickling their own copy of the data:
+
+    with SharedFrame(df) as shared:
+        executor.submit(work, shared.handle)   # worker: attach_frame(handle)
+
+Numeric, boolean, nullable (Int8, boolean, ...) and categorical columns are
+attached zero-copy as read-only views. Text columns are dictionary-encoded (codes
+plus UTF-8 buffer of the distinct values); only the distinct values are
+decoded on attach, since Python string objects cannot live in shared memory.
+
+Usage:
+    python shared_frames.py [survey.csv]   # compare pickling vs. shared memory
+"""
+
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ALIGNMENT = 64
+
+# Frames attached in this (worker) process: block name -> (shared memory, frame)
+_attached = {}
+
+
+def _encode_strings(values):
+    """Codes plus UTF-8 data buffer and offsets of the distinct strings"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    encoded = [str(value).encode("utf-8") for value in uniques]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return codes.astype(np.int32), data, offsets
+
+
+def _column_arrays(values):
+    """
+    Split a column into plain numpy buffers.
+
+    Returns:
+        tuple: (kind, metadata, list of arrays)
+    """
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return (
+            "category",
+            {"categories": dtype.categories, "ordered": dtype.ordered},
+            [values.cat.codes.to_numpy()],
+        )
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype) and hasattr(
+        values.array, "_mask"
+    ):
+        array = values.array
+        return "masked", {"dtype": dtype}, [array._data, array._mask]
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        return "array", {}, [np.asarray(values)]
+    return "string", {}, list(_encode_strings(np.asarray(values, dtype=object)))
+
+
+def _decode_column(kind, metadata, arrays):
+    if kind == "array":
+        return arrays[0]
+    if kind == "category":
+        return pd.Categorical.from_codes(
+            arrays[0], dtype=pd.CategoricalDtype(**metadata)
+        )
+    if kind == "masked":
+        array_type = metadata["dtype"].construct_array_type()
+        return array_type(arrays[0], arrays[1], copy=False)
+
+    # Only distinct strings are decoded, rows are gathered by code
+    codes, data, offsets = arrays
+    raw = data.tobytes()
+    uniques = np.empty(len(offsets), dtype=object)
+    uniques[:-1] = [
+        raw[start:end].decode("utf-8") for start, end in zip(offsets[:-1], offsets[1:])
+    ]
+    uniques[-1] = np.nan
+    return uniques.take(codes)
+
+
+class SharedFrame:
+    """A DataFrame published into one shared memory block"""
+
+    def __init__(self, df):
+        layout = []
+        buffers = []
+        size = 0
+        default_index = isinstance(df.index, pd.RangeIndex) and df.index.start == 0
+        index = [] if default_index else [df.index.to_series()]
+        for column in [*index, *(df[name] for name in df.columns)]:
+            kind, metadata, arrays = _column_arrays(column)
+            specs = []
+            for array in arrays:
+                array = np.ascontiguousarray(array)
+                specs.append((size, array.dtype.str, array.shape))
+                buffers.append((size, array))
+                size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+            layout.append((kind, metadata, specs))
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for offset, array in buffers:
+            target = np.ndarray(
+                array.shape, dtype=array.dtype, buffer=self.shm.buf, offset=offset
+            )
+            target[...] = array
+            del target
+
+        self.handle = {
+            "name": self.shm.name,
+            "size": size,
+            "rows": len(df),
+            "columns": list(df.columns),
+            "index": None if default_index else layout.pop(0),
+            "index_name": df.index.name,
+            "layout": layout,
+        }
+
+    def close(self):
+        """Release and remove the shared memory block"""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _view_arrays(shm, specs):
+    arrays = []
+    for offset, dtype, shape in specs:
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+        array.flags.writeable = False
+        arrays.append(array)
+    return arrays
+
+
+def attach_frame(handle):
+    """
+    Attach to a published frame (cached per process).
+
+    The returned frame is backed by the shared block and must be treated as
+    read-only; call ``.copy()`` before modifying it.
+    """
+    cached = _attached.get(handle["name"])
+    if cached is not None:
+        return cached[1]
+
+    shm = shared_memory.SharedMemory(name=handle["name"])
+    data = {
+        name: _decode_column(kind, metadata, _view_arrays(shm, specs))
+        for name, (kind, metadata, specs) in zip(handle["columns"], handle["layout"])
+    }
+    if handle["index"] is None:
+        index = pd.RangeIndex(handle["rows"])
+    else:
+        kind, metadata, specs = handle["index"]
+        index = pd.Index(
+            _decode_column(kind, metadata, _view_arrays(shm, specs)),
+            name=handle["index_name"],
+        )
+
+    # copy=False keeps one block per column instead of consolidating (copying)
+    df = pd.DataFrame(data, index=index, copy=False)
+    _attached[handle["name"]] = (shm, df)
+    return df
+
+
+def _call_with_frame(handle, func, args):
+    return func(attach_frame(handle), *args)
+
+
+def run_with_shared_frame(df, calls, max_workers=None):
+    """
+    Run ``func(df, *args)`` for every ``(func, args)`` in a process pool.
+
+    ``df`` is published once; every worker attaches to the same shared copy.
+    Functions must be importable module-level functions.
+
+    Returns:
+        list: Results in the order of ``calls``
+    """
+    with SharedFrame(df) as shared, ProcessPoolExecutor(max_workers) as executor:
+        futures = [
+            executor.submit(_call_with_frame, shared.handle, func, args)
+            for func, args in calls
+        ]
+        return [future.result() for future in futures]
+
+
+def measure_handoff(df, repeats=3):
+    """
+    Compare pickling a frame per worker with publishing it once.
+
+    Returns:
+        dict: Best-of-``repeats`` timings in seconds and transferred bytes
+    """
+    timings = {
+        "pickle_s": np.inf,
+        "unpickle_s": np.inf,
+        "publish_s": np.inf,
+        "attach_s": np.inf,
+    }
+    for _ in range(repeats):
+        started = time.perf_counter()
+        payload = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+        timings["pickle_s"] = min(timings["pickle_s"], time.perf_counter() - started)
+
+        started = time.perf_counter()
+        pickle.loads(payload)
+        timings["unpickle_s"] = min(
+            timings["unpickle_s"], time.perf_counter() - started
+        )
+
+        started = time.perf_counter()
+        shared = SharedFrame(df)
+        handle_payload = pickle.dumps(shared.handle)
+        timings["publish_s"] = min(timings["publish_s"], time.perf_counter() - started)
+
+        # Attach as a fresh worker would (bypassing this process' cache)
+        started = time.perf_counter()
+        attach_frame(pickle.loads(handle_payload))
+        timings["attach_s"] = min(timings["attach_s"], time.perf_counter() - started)
+
+        shm, attached = _attached.pop(shared.handle["name"])
+        del attached
+        shm.close()
+        shared.close()
+
+    timings["pickle_bytes"] = len(payload)
+    timings["handle_bytes"] = len(handle_payload)
+    timings["shared_bytes"] = shared.handle["size"]
+    return timings
+
+
+def format_handoff_summary(label, timings, workers):
+    """Human readable comparison for ``workers`` worker processes"""
+    before = timings["pickle_s"] + workers * timings["unpickle_s"]
+    after = timings["publish_s"] + workers * timings["attach_s"]
+    return (
+        f"📦 {label}: Pickle {timings['pickle_bytes'] / 1024**2:.1f} MB pro Worker, "
+        f"{before * 1000:.1f}ms für {workers} Worker | Shared Memory "
+        f"{timings['shared_bytes'] / 1024**2:.1f} MB einmalig, "
+        f"Handle {timings['handle_bytes']} B, {after * 1000:.1f}ms"
+    )
+
+
+def main():
+    """Main function to measure the hand-off of the evaluation frames"""
+    from completion import load_completion_data
+    from csv2ex import decode_survey, load_survey_export
+
+    workers = 4
+    frames = {"completion_data": load_completion_data()}
+
+    survey_files = [Path(path) for path in sys.argv[1:]] or sorted(
+        Path(__file__).parent.glob("*.csv")
+    )
+    for path in survey_files:
+        if path.name.startswith(("completion_data", "loc_data", "time_")):
+            continue
+        survey_df, _ = load_survey_export(path)
+        if "Response ID" in survey_df.columns:
+            frames[path.stem] = survey_df
+            frames[f"{path.stem} (dekodiert)"] = decode_survey(survey_df)
+
+    for label, df in frames.items():
+        print(format_handoff_summary(label, measure_handoff(df), workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Mergeable frequency and cardinality sketches with bounded memory.
+
+Space-Saving keeps the top-k candidates of a stream, Count-Min estimates the
+frequency of any item and HyperLogLog counts distinct items. All sketches
+are updated with whole chunks (vectorized hashing), never keep the raw
+values and can be merged across files or worker processes. Hashing uses
+pandas' keyed SipHash, so sketches built in different processes agree.
+"""
+
+import heapq
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+HASH_KEY = "spade-eval-sketc"  # 16 characters, see pd.util.hash_array
+
+
+def hash_values(values, key=HASH_KEY):
+    """Stable 64-bit hashes of arbitrary values (strings are hashed as text)"""
+    values = np.asarray(values, dtype=object)
+    return pd.util.hash_array(values.astype(str), hash_key=key, categorize=True)
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k summary (Metwally et al.), weighted and mergeable.
+
+    Every monitored item carries a count that overestimates its true
+    frequency by at most its ``error``; no error exceeds ``n / capacity``.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.n = 0
+
+    def _min_count(self):
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def update(self, values):
+        """Add a chunk of items"""
+        return self.update_counts(Counter(values))
+
+    def update_counts(self, counts):
+        """Add pre-aggregated item counts (e.g. a chunk's value_counts)"""
+        heap = None
+        for item, count in counts.items():
+            if count <= 0:
+                continue
+            self.n += count
+            if item in self.counts:
+                self.counts[item] += count
+                if heap is not None:
+                    # The old entry goes stale and is skipped when popped
+                    heapq.heappush(heap, (self.counts[item], item))
+            elif len(self.counts) < self.capacity:
+                self.counts[item] = count
+                self.errors[item] = 0
+                heap = None
+            else:
+                # Replace the item with the smallest count
+                if heap is None:
+                    heap = [(value, key) for key, value in self.counts.items()]
+                    heapq.heapify(heap)
+                while True:
+                    minimum, evicted = heapq.heappop(heap)
+                    if self.counts.get(evicted) == minimum:
+                        break
+                del self.counts[evicted], self.errors[evicted]
+                self.counts[item] = minimum + count
+                self.errors[item] = minimum
+                heapq.heappush(heap, (minimum + count, item))
+        return self
+
+    def merge(self, other):
+        """Combine with another summary (in place)"""
+        own_min, other_min = self._min_count(), other._min_count()
+        # Own items first, so ties keep their order of first appearance
+        items = list(self.counts) + [
+            item for item in other.counts if item not in self.counts
+        ]
+        counts = {
+            item: self.counts.get(item, own_min) + other.counts.get(item, other_min)
+            for item in items
+        }
+        errors = {
+            item: self.errors.get(item, own_min) + other.errors.get(item, other_min)
+            for item in items
+        }
+        kept = sorted(counts, key=counts.get, reverse=True)[: self.capacity]
+        self.counts = {item: counts[item] for item in kept}
+        self.errors = {item: errors[item] for item in kept}
+        self.n += other.n
+        return self
+
+    def top(self, k):
+        """The ``k`` most frequent items as (item, count, error), by count"""
+        ranked = sorted(self.counts.items(), key=lambda item: -item[1])[:k]
+        return [(item, count, self.errors[item]) for item, count in ranked]
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch (Cormode & Muthukrishnan), mergeable.
+
+    Estimates never underestimate; with probability ``1 - delta`` they
+    overestimate by at most ``epsilon * n``.
+    """
+
+    def __init__(self, width=2048, depth=5):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.n = 0
+
+    @property
+    def epsilon(self):
+        return np.e / self.width
+
+    @property
+    def delta(self):
+        return float(np.exp(-self.depth))
+
+    def _columns(self, values):
+        return [
+            (hash_values(values, key=f"countmin-row{row:04d}") % self.width).astype(
+                np.int64
+            )
+            for row in range(self.depth)
+        ]
+
+    def update(self, values, counts=None):
+        """Add a chunk of items (optionally with per-item counts)"""
+        values = list(values)
+        if not values:
+            return self
+        counts = (
+            np.ones(len(values), dtype=np.int64)
+            if counts is None
+            else np.asarray(counts, dtype=np.int64)
+        )
+        for row, columns in enumerate(self._columns(values)):
+            np.add.at(self.table[row], columns, counts)
+        self.n += int(counts.sum())
+        return self
+
+    def update_counts(self, counts):
+        """Add pre-aggregated item counts"""
+        return self.update(list(counts), list(counts.values()))
+
+    def estimate(self, values):
+        """Upper-bound frequency estimates for ``values``"""
+        values = list(values)
+        if not values:
+            return np.zeros(0, dtype=np.int64)
+        rows = [
+            self.table[row][columns]
+            for row, columns in enumerate(self._columns(values))
+        ]
+        return np.min(rows, axis=0)
+
+    def merge(self, other):
+        """Combine with a sketch of the same shape (in place)"""
+        if self.table.shape != other.table.shape:
+            raise ValueError(
+                "Count-Min sketches with different shapes cannot be merged"
+            )
+        self.table += other.table
+        self.n += other.n
+        return self
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter (Flajolet et al.), mergeable"""
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        """Standard error of the estimate"""
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def update(self, values):
+        """Add a chunk of items; missing values are skipped"""
+        values = pd.Series(values, dtype=object).dropna().to_numpy()
+        if len(values) == 0:
+            return self
+
+        hashes = hash_values(values)
+        remaining_bits = 64 - self.precision
+        buckets = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        remaining = hashes & np.uint64((1 << remaining_bits) - 1)
+
+        # Position of the leftmost 1-bit in the remaining bits (exact bit length)
+        bit_length = np.zeros(len(remaining), dtype=np.int64)
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = remaining >= np.uint64(1 << shift)
+            bit_length[high] += shift
+            remaining[high] >>= np.uint64(shift)
+        bit_length += remaining > 0
+        ranks = (remaining_bits - bit_length + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, buckets, ranks)
+        return self
+
+    def merge(self, other):
+        """Combine with a counter of the same precision (in place)"""
+        if self.precision != other.precision:
+            raise ValueError("HyperLogLogs with different precision cannot be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        """Estimated number of distinct items"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(float)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Small range correction: linear counting
+        if raw <= 2.5 * m and zeros:
+            return float(m * np.log(m / zeros))
+        return float(raw)
@@ -0,0 +1,605 @@
+"""
+Evaluation Data Store - Embedded SQLite Database
+Bachelor Thesis: Component Libraries for Project Business
+
+Single local database that all evaluation scripts read from and write to:
+1. Experiment inputs (completion, lines of code, implementation time) in long
+   format, re-imported only when the source CSV content changes
+2. Survey waves upserted by Response ID: new responses are appended, edited
+   ones replace their stored row; decoded rows keep their column dtypes
+3. Footer aggregates of the survey appendix, updated per wave so the
+   statistics never need to be recomputed over the full history (open
+   questions keep a bounded term sketch, see text_analysis.py); waves that
+   edit stored responses rebuild them, as sketches cannot be subtracted
+4. Experiment feedback files, appended incrementally and deduplicated by
+   submission timestamp
+5. Result tables written back by the analysis scripts
+"""
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from schemas import COMPLETION_SCHEMA, LOC_SCHEMA, TIME_SCHEMA, validate
+from text_analysis import TermSketch
+
+DEFAULT_DB_PATH = Path(__file__).parent / "eval_store.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    imported_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS completion (
+    participant_id INTEGER NOT NULL,
+    experience_years REAL,
+    experience_group TEXT,
+    task TEXT NOT NULL,
+    library TEXT NOT NULL,
+    completion REAL
+);
+CREATE INDEX IF NOT EXISTS idx_completion_participant ON completion (participant_id);
+CREATE INDEX IF NOT EXISTS idx_completion_task ON completion (task);
+CREATE INDEX IF NOT EXISTS idx_completion_library ON completion (library);
+
+CREATE TABLE IF NOT EXISTS loc (
+    task TEXT NOT NULL,
+    library TEXT NOT NULL,
+    type TEXT NOT NULL,
+    lines INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_loc_task ON loc (task);
+CREATE INDEX IF NOT EXISTS idx_loc_library ON loc (library);
+
+CREATE TABLE IF NOT EXISTS timing (
+    task TEXT NOT NULL,
+    library TEXT NOT NULL,
+    mean_minutes REAL,
+    std_minutes REAL
+);
+CREATE INDEX IF NOT EXISTS idx_timing_task ON timing (task);
+CREATE INDEX IF NOT EXISTS idx_timing_library ON timing (library);
+
+CREATE TABLE IF NOT EXISTS survey_waves (
+    wave_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    imported_at TEXT NOT NULL,
+    new_responses INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS survey_responses (
+    response_id TEXT PRIMARY KEY,
+    wave_id INTEGER NOT NULL REFERENCES survey_waves (wave_id),
+    answers TEXT NOT NULL,
+    decoded TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_survey_responses_wave ON survey_responses (wave_id);
+
+CREATE TABLE IF NOT EXISTS survey_columns (
+    position INTEGER NOT NULL,
+    name TEXT PRIMARY KEY,
+    dtype TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS footer_columns (
+    position INTEGER NOT NULL,
+    question TEXT PRIMARY KEY,
+    responses INTEGER NOT NULL DEFAULT 0,
+    rating_sum REAL NOT NULL DEFAULT 0,
+    rating_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS footer_counts (
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (question, answer)
+);
+
+CREATE TABLE IF NOT EXISTS footer_terms (
+    question TEXT PRIMARY KEY,
+    sketch TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS feedback_submissions (
+    submission_timestamp TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    angular_experience TEXT,
+    material_experience TEXT,
+    imported_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS feedback (
+    submission_timestamp TEXT NOT NULL REFERENCES feedback_submissions (submission_timestamp),
+    task TEXT NOT NULL,
+    library TEXT NOT NULL,
+    minutes REAL,
+    completion REAL,
+    difficulty REAL
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_submission ON feedback (submission_timestamp);
+
+CREATE TABLE IF NOT EXISTS loc_diff_cache (
+    content_key TEXT PRIMARY KEY,
+    changed INTEGER NOT NULL,
+    added INTEGER NOT NULL,
+    deleted INTEGER NOT NULL
+);
+"""
+
+COMPLETION_SUFFIX = "_completion"
+TIME_LIBRARIES = ["Angular Material", "Spade"]
+
+
+def survey_answers(raw_df):
+    """One JSON record per raw response, as stored to detect edited answers"""
+    return raw_df.to_json(orient="records", lines=True).splitlines()
+
+
+def _restore_dtype(values, dtype):
+    """Re-apply a stored dtype to a column read back from JSON"""
+    if dtype == "category":
+        # Categories in order of first appearance, as in compact_dtypes
+        return values.astype(pd.CategoricalDtype(pd.unique(values.dropna())))
+    if values.isna().any():
+        # JSON nulls need the nullable counterpart of numpy ints and bools
+        if dtype == "bool":
+            dtype = "boolean"
+        elif dtype.startswith(("int", "uint")):
+            dtype = dtype.replace("uint", "UInt").replace("int", "Int")
+    return values.astype(dtype)
+
+
+def file_sha256(path):
+    """Content hash of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class EvalStore:
+    """Embedded SQLite store shared by all evaluation scripts"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    # ------------------------------------------------------------------
+    # Experiment inputs
+    # ------------------------------------------------------------------
+
+    def _source_changed(self, name, path):
+        """Return the new hash if ``path`` differs from the last import, else None"""
+        sha256 = file_sha256(path)
+        row = self.connection.execute(
+            "SELECT sha256 FROM sources WHERE name = ?", (name,)
+        ).fetchone()
+        if row is not None and row[0] == sha256:
+            return None
+        return sha256
+
+    def _mark_source(self, name, path, sha256):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sources (name, path, sha256, imported_at) VALUES (?, ?, ?, ?)",
+            (name, str(path), sha256, datetime.now().isoformat(timespec="seconds")),
+        )
+
+    def _replace_table(self, table, long_df, name, path, sha256):
+        with self.connection:
+            self.connection.execute(f"DELETE FROM {table}")
+            long_df.to_sql(table, self.connection, if_exists="append", index=False)
+            self._mark_source(name, path, sha256)
+
+    def sync_completion_csv(self, csv_path):
+        """Import ``completion_data.csv`` (wide per library) if it changed"""
+        sha256 = self._source_changed("completion", csv_path)
+        if sha256 is None:
+            return False
+
+        df = validate(pd.read_csv(csv_path), COMPLETION_SCHEMA, source=csv_path)
+        value_cols = [col for col in df.columns if col.endswith(COMPLETION_SUFFIX)]
+        id_cols = [col for col in df.columns if col not in value_cols]
+        long_df = df.melt(
+            id_vars=id_cols,
+            value_vars=value_cols,
+            var_name="library",
+            value_name="completion",
+        )
+        long_df["library"] = long_df["library"].str[: -len(COMPLETION_SUFFIX)]
+        self._replace_table("completion", long_df, "completion", csv_path, sha256)
+        return True
+
+    def sync_loc_csv(self, csv_path):
+        """Import ``loc_data.csv`` if it changed"""
+        sha256 = self._source_changed("loc", csv_path)
+        if sha256 is None:
+            return False
+
+        df = validate(pd.read_csv(csv_path), LOC_SCHEMA, source=csv_path).rename(
+            columns={
+                "Task": "task",
+                "Library": "library",
+                "Type": "type",
+                "Lines": "lines",
+            }
+        )
+        self._replace_table("loc", df, "loc", csv_path, sha256)
+        return True
+
+    def sync_time_csv(self, csv_path):
+        """Import ``time_data.csv`` (one mean and std column per library) if it changed"""
+        sha256 = self._source_changed("timing", csv_path)
+        if sha256 is None:
+            return False
+
+        df = validate(pd.read_csv(csv_path), TIME_SCHEMA, source=csv_path)
+        long_df = pd.concat(
+            [
+                pd.DataFrame(
+                    {
+                        "task": df["Task"],
+                        "library": library,
+                        "mean_minutes": df[library],
+                        "std_minutes": df[f"{library} Std"],
+                    }
+                )
+                for library in TIME_LIBRARIES
+            ],
+            ignore_index=True,
+        )
+        self._replace_table("timing", long_df, "timing", csv_path, sha256)
+        return True
+
+    def read_completion(self):
+        """Completion data in the wide layout ``completion.py`` expects"""
+        long_df = pd.read_sql_query(
+            "SELECT * FROM completion ORDER BY rowid", self.connection
+        )
+        id_cols = ["participant_id", "experience_years", "experience_group", "task"]
+        wide = long_df.pivot(index=id_cols, columns="library", values="completion")
+        wide.columns = [f"{library}{COMPLETION_SUFFIX}" for library in wide.columns]
+        wide = wide.reset_index()
+
+        # Keep the original row order (pivot sorts the index)
+        order = long_df.drop_duplicates(id_cols)[id_cols]
+        return order.merge(wide, on=id_cols, how="left")
+
+    def read_loc(self):
+        """Lines of code data in the layout ``dev_ex.py`` expects"""
+        return pd.read_sql_query(
+            'SELECT task AS "Task", library AS "Library", type AS "Type", lines AS "Lines" '
+            "FROM loc ORDER BY rowid",
+            self.connection,
+        )
+
+    def read_time(self):
+        """Implementation time data in the layout ``dev_ex.py`` expects"""
+        long_df = pd.read_sql_query(
+            "SELECT * FROM timing ORDER BY rowid", self.connection
+        )
+        tasks = pd.unique(long_df["task"])
+        time_df = pd.DataFrame({"Task": tasks})
+        for library in TIME_LIBRARIES:
+            subset = long_df[long_df["library"] == library].set_index("task")
+            time_df[library] = subset["mean_minutes"].reindex(tasks).to_numpy()
+        for library in TIME_LIBRARIES:
+            subset = long_df[long_df["library"] == library].set_index("task")
+            time_df[f"{library} Std"] = subset["std_minutes"].reindex(tasks).to_numpy()
+        return time_df
+
+    def read_loc_diff_cache(self, content_keys):
+        """Cached line classifications for the given content keys"""
+        cached = {}
+        keys = list(content_keys)
+        # Stay below SQLite's host parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            for key, changed, added, deleted in self.connection.execute(
+                f"SELECT content_key, changed, added, deleted FROM loc_diff_cache "
+                f"WHERE content_key IN ({placeholders})",
+                batch,
+            ):
+                cached[key] = {"changed": changed, "added": added, "deleted": deleted}
+        return cached
+
+    def write_loc_diff_cache(self, results):
+        """Store line classifications keyed by content hash"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO loc_diff_cache (content_key, changed, added, deleted) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (key, counts["changed"], counts["added"], counts["deleted"])
+                    for key, counts in results.items()
+                ],
+            )
+
+    # ------------------------------------------------------------------
+    # Experiment feedback
+    # ------------------------------------------------------------------
+
+    def known_feedback_sources(self):
+        rows = self.connection.execute("SELECT source FROM feedback_submissions")
+        return {row[0] for row in rows}
+
+    def known_feedback_timestamps(self):
+        rows = self.connection.execute(
+            "SELECT submission_timestamp FROM feedback_submissions"
+        )
+        return {row[0] for row in rows}
+
+    def append_feedback(self, submissions_df, long_df):
+        """
+        Append new feedback submissions and their per-task values.
+
+        Args:
+            submissions_df (pd.DataFrame): One row per new submission
+                (submission_timestamp, source, angular_experience, material_experience)
+            long_df (pd.DataFrame): One row per submission, task and library
+                (submission_timestamp, task, library, minutes, completion, difficulty)
+        """
+        submissions_df = submissions_df.assign(
+            imported_at=datetime.now().isoformat(timespec="seconds")
+        )
+        with self.connection:
+            submissions_df.to_sql(
+                "feedback_submissions",
+                self.connection,
+                if_exists="append",
+                index=False,
+            )
+            long_df.to_sql("feedback", self.connection, if_exists="append", index=False)
+
+    def read_feedback(self):
+        """All stored feedback values with their submission's experience answers"""
+        return pd.read_sql_query(
+            "SELECT f.submission_timestamp, s.angular_experience, s.material_experience, "
+            "f.task, f.library, f.minutes, f.completion, f.difficulty "
+            "FROM feedback f JOIN feedback_submissions s USING (submission_timestamp) "
+            "ORDER BY f.submission_timestamp, f.rowid",
+            self.connection,
+        )
+
+    # ------------------------------------------------------------------
+    # Analysis results
+    # ------------------------------------------------------------------
+
+    def write_results(self, name, df):
+        """Store an analysis result table (replaces previous results of that name)"""
+        with self.connection:
+            df.to_sql(
+                f"result_{name}", self.connection, if_exists="replace", index=False
+            )
+
+    def read_results(self, name):
+        return pd.read_sql_query(f'SELECT * FROM "result_{name}"', self.connection)
+
+    # ------------------------------------------------------------------
+    # Survey waves
+    # ------------------------------------------------------------------
+
+    def known_response_ids(self):
+        rows = self.connection.execute("SELECT response_id FROM survey_responses")
+        return {row[0] for row in rows}
+
+    def changed_responses(self, raw_df):
+        """
+        Classify raw responses against the stored ones by Response ID.
+
+        Args:
+            raw_df (pd.DataFrame): Raw responses (deduplicated by Response ID)
+
+        Returns:
+            tuple: (is_new, is_edited) boolean Series aligned to ``raw_df``;
+            edited responses are stored with different answers
+        """
+        stored = dict(
+            self.connection.execute("SELECT response_id, answers FROM survey_responses")
+        )
+        response_ids = raw_df["Response ID"].astype(str)
+        stored_answers = response_ids.map(stored)
+        is_new = stored_answers.isna()
+        answers = pd.Series(survey_answers(raw_df), index=raw_df.index)
+        is_edited = ~is_new & (answers != stored_answers)
+        return is_new, is_edited
+
+    def append_survey_wave(self, source, raw_df, decoded_df, collect_aggregates):
+        """
+        Upsert one survey wave with its decoded rows and footer aggregates.
+
+        New responses are appended; responses already stored (edited in the
+        export) replace their row in place. Footer aggregates of a wave with
+        only new responses are merged into the stored totals, otherwise they
+        are rebuilt from the full history in the same transaction.
+
+        Args:
+            source (str): Name of the imported export file
+            raw_df (pd.DataFrame): New or edited raw responses (see
+                ``changed_responses``)
+            decoded_df (pd.DataFrame): Decoded rows for ``raw_df`` (same order)
+            collect_aggregates (callable): Footer aggregates of a decoded table
+
+        Returns:
+            int: ID of the new wave
+        """
+        response_ids = raw_df["Response ID"].astype(str).tolist()
+        answers = survey_answers(raw_df)
+        decoded = decoded_df.to_json(orient="records", lines=True).splitlines()
+        known = self.known_response_ids()
+        new_responses = sum(response_id not in known for response_id in response_ids)
+
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO survey_waves (source, imported_at, new_responses) VALUES (?, ?, ?)",
+                (
+                    str(source),
+                    datetime.now().isoformat(timespec="seconds"),
+                    new_responses,
+                ),
+            )
+            wave_id = cursor.lastrowid
+
+            # Updating in place keeps the rowid, i.e. the import order
+            self.connection.executemany(
+                """
+                INSERT INTO survey_responses (response_id, wave_id, answers, decoded)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (response_id) DO UPDATE SET
+                    wave_id = excluded.wave_id,
+                    answers = excluded.answers,
+                    decoded = excluded.decoded
+                """,
+                [
+                    (response_id, wave_id, answer, row)
+                    for response_id, answer, row in zip(response_ids, answers, decoded)
+                ],
+            )
+            self._write_survey_columns(decoded_df)
+
+            if new_responses == len(response_ids):
+                self._merge_footer_aggregates(collect_aggregates(decoded_df))
+            else:
+                for table in ("footer_columns", "footer_counts", "footer_terms"):
+                    self.connection.execute(f"DELETE FROM {table}")
+                self._merge_footer_aggregates(
+                    collect_aggregates(self.read_decoded_survey())
+                )
+
+        return wave_id
+
+    def _write_survey_columns(self, decoded_df):
+        """Record the decoded columns with the dtype of the latest wave"""
+        next_position = self.connection.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM survey_columns"
+        ).fetchone()[0]
+        self.connection.executemany(
+            """
+            INSERT INTO survey_columns (position, name, dtype) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET dtype = excluded.dtype
+            """,
+            [
+                (next_position + offset, name, str(dtype))
+                for offset, (name, dtype) in enumerate(decoded_df.dtypes.items())
+            ],
+        )
+
+    def _merge_footer_aggregates(self, aggregates):
+        """Merge footer aggregates into the stored totals"""
+        next_position = self.connection.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM footer_columns"
+        ).fetchone()[0]
+        for offset, (question, entry) in enumerate(aggregates.items()):
+            self.connection.execute(
+                """
+                INSERT INTO footer_columns (position, question, responses, rating_sum, rating_count)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (question) DO UPDATE SET
+                    responses = responses + excluded.responses,
+                    rating_sum = rating_sum + excluded.rating_sum,
+                    rating_count = rating_count + excluded.rating_count
+                """,
+                (
+                    next_position + offset,
+                    question,
+                    int(entry["responses"]),
+                    float(entry["rating_sum"]),
+                    int(entry["rating_count"]),
+                ),
+            )
+            if "terms" in entry:
+                self._merge_footer_terms(question, entry["terms"])
+                continue
+            self.connection.executemany(
+                """
+                INSERT INTO footer_counts (question, answer, count) VALUES (?, ?, ?)
+                ON CONFLICT (question, answer) DO UPDATE SET
+                    count = count + excluded.count
+                """,
+                [
+                    (question, str(answer), int(count))
+                    for answer, count in entry["counts"].items()
+                ],
+            )
+
+    def _merge_footer_terms(self, question, terms):
+        """Fold a wave's term sketch into the stored one (bounded size)"""
+        row = self.connection.execute(
+            "SELECT sketch FROM footer_terms WHERE question = ?", (question,)
+        ).fetchone()
+        if row is not None:
+            terms = TermSketch.from_dict(json.loads(row[0])).merge(terms)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO footer_terms (question, sketch) VALUES (?, ?)",
+            (question, json.dumps(terms.to_dict())),
+        )
+
+    def read_decoded_survey(self):
+        """All stored decoded survey rows in import order, with their dtypes"""
+        rows = self.connection.execute(
+            "SELECT decoded FROM survey_responses ORDER BY rowid"
+        )
+        df = pd.DataFrame.from_records([json.loads(row[0]) for row in rows])
+        dtypes = dict(self.connection.execute("SELECT name, dtype FROM survey_columns"))
+        return df.assign(
+            **{
+                name: _restore_dtype(df[name], dtypes[name])
+                for name in df.columns
+                if name in dtypes
+            }
+        )
+
+    def response_count(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM survey_responses"
+        ).fetchone()[0]
+
+    def read_footer_aggregates(self):
+        """Footer aggregates over the full history, in the layout of ``collect_footer_aggregates``"""
+        aggregates = {}
+        for question, responses, rating_sum, rating_count in self.connection.execute(
+            "SELECT question, responses, rating_sum, rating_count FROM footer_columns ORDER BY position"
+        ):
+            aggregates[question] = {
+                "responses": responses,
+                "counts": {},
+                "rating_sum": rating_sum,
+                "rating_count": rating_count,
+            }
+
+        # Waves insert answers in order of first appearance and later waves only
+        # add new answers, so rowid order is the first appearance over all waves
+        for question, answer, count in self.connection.execute(
+            "SELECT question, answer, count FROM footer_counts ORDER BY rowid"
+        ):
+            aggregates[question]["counts"][answer] = count
+
+        for question, sketch in self.connection.execute(
+            "SELECT question, sketch FROM footer_terms"
+        ):
+            terms = TermSketch.from_dict(json.loads(sketch))
+            counts, count_errors = terms.footer_counts()
+            aggregates[question].update(
+                terms=terms, counts=counts, count_errors=count_errors
+            )
+
+        return aggregates
@@ -0,0 +1,244 @@
+"""
+Streaming statistics with single-pass, mergeable accumulators.
+
+Accumulators consume data in chunks (arrays or DataFrame columns), never
+keep the raw values and can be merged across files or worker processes.
+"""
+
+import numpy as np
+from scipy import stats
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+class PearsonAccumulator:
+    """Running means, variances and co-moment of (x, y) pairs (Welford/Chan)"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def update(self, x, y):
+        """Add a chunk of pairs; rows with a missing value are skipped"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x) == 0:
+            return self
+
+        chunk = PearsonAccumulator()
+        chunk.n = len(x)
+        chunk.mean_x = x.mean()
+        chunk.mean_y = y.mean()
+        dx = x - chunk.mean_x
+        dy = y - chunk.mean_y
+        chunk.m2_x = float(dx @ dx)
+        chunk.m2_y = float(dy @ dy)
+        chunk.c_xy = float(dx @ dy)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Combine with another accumulator (in place)"""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        n = self.n + other.n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+
+        self.m2_x += other.m2_x + delta_x * delta_x * weight
+        self.m2_y += other.m2_y + delta_y * delta_y * weight
+        self.c_xy += other.c_xy + delta_x * delta_y * weight
+        self.mean_x += delta_x * other.n / n
+        self.mean_y += delta_y * other.n / n
+        self.n = n
+        return self
+
+    @classmethod
+    def from_arrays(cls, x, y, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Accumulate two aligned arrays chunk by chunk"""
+        accumulator = cls()
+        x = np.asarray(x)
+        y = np.asarray(y)
+        for start in range(0, len(x), chunk_size):
+            accumulator.update(
+                x[start : start + chunk_size], y[start : start + chunk_size]
+            )
+        return accumulator
+
+    def correlation(self):
+        """Pearson r and two-sided p-value (t-distribution with n-2 df)"""
+        if self.n < 3 or self.m2_x == 0 or self.m2_y == 0:
+            return np.nan, np.nan
+        r = self.c_xy / np.sqrt(self.m2_x * self.m2_y)
+        r = float(np.clip(r, -1.0, 1.0))
+        df = self.n - 2
+        if abs(r) == 1.0:
+            return r, 0.0
+        t_stat = r * np.sqrt(df / (1 - r * r))
+        return r, float(2 * stats.t.sf(abs(t_stat), df))
+
+    def linear_fit(self):
+        """Least-squares slope and intercept of y on x"""
+        if self.m2_x == 0:
+            return np.nan, np.nan
+        slope = self.c_xy / self.m2_x
+        return slope, self.mean_y - slope * self.mean_x
+
+
+class WelfordAccumulator:
+    """Running count, mean, variance, min and max (Welford/Chan)"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """Add a chunk of values; missing values are skipped"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        chunk = WelfordAccumulator()
+        chunk.n = len(values)
+        chunk.mean = values.mean()
+        deviations = values - chunk.mean
+        chunk.m2 = float(deviations @ deviations)
+        chunk.min = values.min()
+        chunk.max = values.max()
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Combine with another accumulator (in place)"""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.mean += delta * other.n / n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.n = n
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    def confidence_interval(self, level=0.95):
+        """t-based confidence interval of the mean"""
+        if self.n < 2:
+            return np.nan, np.nan
+        half_width = stats.t.ppf((1 + level) / 2, self.n - 1) * self.std
+        half_width /= np.sqrt(self.n)
+        return self.mean - half_width, self.mean + half_width
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy (DDSketch-style).
+
+    Positive values are counted in logarithmic buckets, so every quantile is
+    returned within ``relative_accuracy`` of the true value while memory only
+    depends on the value range, not on the number of values.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.n = 0
+
+    def update(self, values):
+        """Add a chunk of non-negative values; missing values are skipped"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        if (values < 0).any():
+            raise ValueError("QuantileSketch only supports non-negative values")
+
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        keys = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64)
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(unique_keys.tolist(), counts.tolist()):
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.n += len(values)
+        return self
+
+    def merge(self, other):
+        """Combine with another sketch of the same accuracy (in place)"""
+        if other.gamma != self.gamma:
+            raise ValueError("Sketches with different accuracy cannot be merged")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.n += other.n
+        return self
+
+    def _sorted_values_and_counts(self):
+        keys = np.array(sorted(self.buckets), dtype=np.int64)
+        counts = np.array([self.buckets[key] for key in keys.tolist()], dtype=float)
+        # Bucket representative with relative error below the accuracy
+        values = 2 * self.gamma**keys / (self.gamma + 1)
+        if self.zero_count:
+            values = np.concatenate([[0.0], values])
+            counts = np.concatenate([[self.zero_count], counts])
+        return values, counts
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1)"""
+        if self.n == 0:
+            return np.nan
+        values, counts = self._sorted_values_and_counts()
+        rank = q * (self.n - 1)
+        index = np.searchsorted(np.cumsum(counts), rank, side="right")
+        return float(values[min(index, len(values) - 1)])
+
+    def trimmed_moments(self, lower=0.05, upper=0.95):
+        """
+        Approximate count, mean and std without values outside the quantile range.
+
+        Computed from the buckets, so trimming needs no second pass over the data.
+        """
+        if self.n == 0:
+            return 0, np.nan, np.nan
+        values, counts = self._sorted_values_and_counts()
+        cumulative = np.cumsum(counts)
+        start = cumulative - counts
+
+        # Fraction of each bucket inside [lower, upper] quantile mass
+        low_rank, high_rank = lower * self.n, upper * self.n
+        kept = np.clip(
+            np.minimum(cumulative, high_rank) - np.maximum(start, low_rank), 0, None
+        )
+        n = kept.sum()
+        if n == 0:
+            return 0, np.nan, np.nan
+        mean = float(kept @ values / n)
+        variance = float(kept @ (values - mean) ** 2 / (n - 1)) if n > 1 else np.nan
+        return n, mean, float(np.sqrt(variance))
@@ -0,0 +1,102 @@
+"""
+Survey Input - Format Detection and Streaming Readers for Survey Exports
+Bachelor Thesis: Component Libraries for Project Business
+
+Survey tools deliver exports as plain CSV, compressed CSV (.csv.gz,
+.csv.zst) or Excel workbooks (.xlsx). The format is detected from the
+file's magic bytes (falling back to the extension) and every format is
+read as a stream of DataFrame chunks:
+
+- CSV is decompressed incrementally by pandas while parsing (.zst needs
+  the optional ``zstandard`` package), no uncompressed copy is written
+- Workbooks are read with openpyxl in read-only mode row by row
+
+so the chunked decoding in csv2ex.py never needs the complete export.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import load_workbook
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Supported export file patterns (see find_survey_exports)
+SURVEY_PATTERNS = ("*.csv", "*.csv.gz", "*.csv.zst", "*.xlsx")
+
+MAGIC_BYTES = {
+    b"\x1f\x8b": "gzip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+    b"PK\x03\x04": "xlsx",
+}
+
+
+def detect_format(path):
+    """
+    Detect the export format.
+
+    Returns:
+        tuple: (reader, compression) with reader "csv" or "xlsx" and the
+        pandas compression of CSV files ("gzip", "zstd" or None)
+    """
+    with open(path, "rb") as file:
+        head = file.read(4)
+
+    for magic, kind in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return ("xlsx", None) if kind == "xlsx" else ("csv", kind)
+
+    suffixes = Path(path).suffixes
+    if suffixes[-1:] == [".xlsx"]:
+        return "xlsx", None
+    return "csv", None
+
+
+def _iter_workbook_chunks(path, chunksize):
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(value) if value is not None else "" for value in header]
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunksize:
+                yield pd.DataFrame(batch, columns=columns).infer_objects()
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns).infer_objects()
+    finally:
+        workbook.close()
+
+
+def iter_survey_chunks(path, chunksize=DEFAULT_CHUNK_SIZE):
+    """Yield the raw export as DataFrame chunks of up to ``chunksize`` rows"""
+    reader, compression = detect_format(path)
+    if reader == "xlsx":
+        yield from _iter_workbook_chunks(path, chunksize)
+        return
+    yield from pd.read_csv(path, compression=compression, chunksize=chunksize)
+
+
+def read_survey_export(path):
+    """Read a complete export in any supported format"""
+    reader, compression = detect_format(path)
+    if reader == "csv":
+        return pd.read_csv(path, compression=compression)
+    chunks = list(iter_survey_chunks(path))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
+
+
+def find_survey_exports(directory=".", stem="*"):
+    """All exports in ``directory`` whose name starts with ``stem``"""
+    directory = Path(directory)
+    paths = set()
+    for pattern in SURVEY_PATTERNS:
+        paths.update(directory.glob(stem + pattern.lstrip("*")))
+    return sorted(paths)
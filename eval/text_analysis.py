@@ -0,0 +1,256 @@
+"""
+Open-Text Analysis - Survey Free-Text Answers
+Bachelor Thesis: Component Libraries for Project Business
+
+Tokenizes and normalizes German/English free-text answers and counts
+keywords and bigrams in a mergeable ``TermSketch``. Large inputs are split
+into chunks that are counted in a process pool (in-memory answers are handed
+to the workers through shared memory, see shared_frames.py).
+
+Memory is bounded by the sketch, not by the vocabulary: a Space-Saving
+summary keeps ``capacity`` candidate terms and a Count-Min sketch tightens
+their counts (see sketches.py). Only one chunk is ever counted exactly.
+Reported counts are upper bounds; each carries an ``error`` so that the true
+frequency lies within ``[count - error, count]``, and no error exceeds
+``n / capacity`` for ``n`` counted terms. As long as a column has no more
+distinct terms than ``capacity``, every count is exact (error 0).
+"""
+
+import os
+import re
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from shared_frames import SharedFrame, attach_frame
+from sketches import CountMinSketch, SpaceSaving
+
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+(?:[-'][^\W\d_]+)*")
+MIN_TOKEN_LENGTH = 3
+
+# Answers below this count are analysed in-process (pool start-up dominates)
+PARALLEL_MIN_ANSWERS = 20000
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_CAPACITY = 2000
+DEFAULT_TOP_TERMS = 10
+
+STOPWORDS = frozenset("""
+    aber alle allem allen aller alles als also am an ander andere anderen auch auf aus
+    bei bin bis bist da dadurch daher damit dann das dass dem den denen der des dessen
+    deshalb die dies diese diesem diesen dieser dieses doch dort durch ein eine einem
+    einen einer eines einfach es etwas euch euer für gegen gibt hat hatte hatten haben
+    hier hin hinter ich ihr ihre im immer in ist ja jede jedem jeden jeder jedes jetzt
+    kann kein keine keinem keinen keiner können könnte man manchmal mehr mein meine
+    meist meistens mit muss müssen nach nicht nichts noch nur ob oder ohne sehr sein
+    seine sich sie sind so sondern sowie über um und uns unser unsere unter viel viele
+    vom von vor war waren was weil welche wenn wer werden wie wieder will wir wird wo
+    wurde würde zu zum zur zwar zwischen
+    about above after again all also and any are because been before being between both
+    but can could did does doing don down during each few for from further had has have
+    having here how however into its itself just more most much not now off once only
+    other our out over own same should some such than that the their them then there
+    these they this those through too under until very was were what when where which
+    while who why will with would you your
+    """.split())
+
+
+def normalize_text(text):
+    """Unicode-normalize and case-fold a free-text answer"""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def tokenize(text):
+    """Split an answer into normalized tokens without stopwords and short fragments"""
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(normalize_text(text))
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOPWORDS
+    ]
+
+
+def count_terms(answers):
+    """
+    Count keywords and bigrams for one batch of answers exactly.
+
+    Args:
+        answers (iterable): Free-text answers (non-strings are skipped)
+
+    Returns:
+        Counter: Term frequencies; bigrams are joined with a single space
+    """
+    counter = Counter()
+    for answer in answers:
+        if not isinstance(answer, str) or not answer.strip():
+            continue
+        tokens = tokenize(answer)
+        counter.update(tokens)
+        counter.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return counter
+
+
+class TermSketch:
+    """
+    Bounded-memory, mergeable term frequencies.
+
+    Space-Saving keeps the ``capacity`` candidate terms (in order of first
+    appearance), Count-Min bounds their frequencies from above.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, width=2048, depth=5):
+        self.top = SpaceSaving(capacity)
+        self.frequencies = CountMinSketch(width, depth)
+
+    @property
+    def n(self):
+        """Number of counted term occurrences"""
+        return self.top.n
+
+    def update(self, answers):
+        """Add one batch of answers (counted exactly, then folded in)"""
+        counts = count_terms(answers)
+        if counts:
+            self.top.update_counts(counts)
+            self.frequencies.update_counts(counts)
+        return self
+
+    def merge(self, other):
+        """Combine with another sketch of the same shape (in place)"""
+        self.top.merge(other.top)
+        self.frequencies.merge(other.frequencies)
+        return self
+
+    def most_common(self, k=DEFAULT_TOP_TERMS):
+        """
+        The ``k`` most frequent terms.
+
+        Returns:
+            list: (term, count, error) - ``count`` is the tighter of both
+            upper bounds, the true frequency is at least ``count - error``
+        """
+        candidates = self.top.top(k)
+        estimates = self.frequencies.estimate(term for term, _, _ in candidates)
+        terms = []
+        for (term, count, error), estimate in zip(candidates, estimates):
+            upper = int(min(count, estimate))
+            terms.append((term, upper, upper - (count - error)))
+        return terms
+
+    def footer_counts(self, k=DEFAULT_TOP_TERMS):
+        """``counts`` and ``count_errors`` dicts of the ``k`` most frequent terms"""
+        terms = self.most_common(k)
+        return (
+            {term: count for term, count, _ in terms},
+            {term: error for term, _, error in terms},
+        )
+
+    def to_dict(self):
+        """JSON-serializable state (see ``from_dict``)"""
+        return {
+            "capacity": self.top.capacity,
+            "n": self.top.n,
+            "terms": [
+                [term, count, self.top.errors[term]]
+                for term, count in self.top.counts.items()
+            ],
+            "table": self.frequencies.table.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        table = np.asarray(state["table"], dtype=np.int64)
+        sketch = cls(state["capacity"], width=table.shape[1], depth=table.shape[0])
+        sketch.top.n = state["n"]
+        sketch.top.counts = {term: count for term, count, _ in state["terms"]}
+        sketch.top.errors = {term: error for term, _, error in state["terms"]}
+        sketch.frequencies.table = table
+        sketch.frequencies.n = state["n"]
+        return sketch
+
+
+def _chunks(answers, chunk_size):
+    iterator = iter(answers)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _sketch_chunk(answers, capacity):
+    return TermSketch(capacity).update(answers)
+
+
+def _sketch_shared_chunk(handle, start, stop, capacity):
+    answers = attach_frame(handle)["answer"].iloc[start:stop]
+    return _sketch_chunk(answers, capacity)
+
+
+def count_terms_parallel(
+    answers,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_workers=None,
+    capacity=DEFAULT_CAPACITY,
+):
+    """
+    Count keywords and bigrams over many answers with a process pool.
+
+    Answers that are already in memory (list, Series, array) are published
+    once into shared memory and workers only receive row ranges. Otherwise
+    chunks are pulled lazily from ``answers``. Workers return one sketch per
+    chunk and at most two chunks per worker are in flight, so memory stays
+    bounded by the sketches regardless of the number of answers.
+
+    Args:
+        answers (iterable): Free-text answers, may be a generator
+        chunk_size (int): Answers per worker task
+        max_workers (int): Worker processes (defaults to CPU count)
+        capacity (int): Candidate terms kept by the sketch
+
+    Returns:
+        TermSketch: Merged term frequencies
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = 2 * max_workers
+    merged = TermSketch(capacity)
+
+    shared = None
+    if hasattr(answers, "__len__"):
+        shared = SharedFrame(
+            pd.DataFrame({"answer": np.asarray(answers, dtype=object)})
+        )
+        tasks = (
+            (_sketch_shared_chunk, shared.handle, start, start + chunk_size, capacity)
+            for start in range(0, len(answers), chunk_size)
+        )
+    else:
+        tasks = (
+            (_sketch_chunk, chunk, capacity) for chunk in _chunks(answers, chunk_size)
+        )
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = []
+            for func, *args in tasks:
+                pending.append(executor.submit(func, *args))
+                if len(pending) >= max_in_flight:
+                    # Merge in submission order, so ties keep first appearance
+                    merged.merge(pending.pop(0).result())
+
+            for future in pending:
+                merged.merge(future.result())
+    finally:
+        if shared is not None:
+            shared.close()
+
+    return merged
+
+
+def analyze_answers(answers, capacity=DEFAULT_CAPACITY):
+    """Sketch term frequencies; small inputs in-process, everything else in a pool"""
+    if hasattr(answers, "__len__") and len(answers) < PARALLEL_MIN_ANSWERS:
+        sketch = TermSketch(capacity)
+        for chunk in _chunks(answers, DEFAULT_CHUNK_SIZE):
+            sketch.update(chunk)
+        return sketch
+    return count_terms_parallel(answers, capacity=capacity)
@@ -0,0 +1,155 @@
+"""
+Raw Timing Logs - Streaming Descriptive Statistics for dev_ex.py
+Bachelor Thesis: Component Libraries for Project Business
+
+Aggregates raw per-participant, per-task timing records
+
+    participant_id,task,library,minutes
+
+into the layout of time_data.csv ("Angular Material", "Angular Material Std",
+...) plus medians, confidence intervals and counts. Every file is read in
+chunks into mergeable accumulators (Welford for mean/std, a quantile sketch
+for medians and trimming), files are processed in parallel and merged, so
+millions of records never have to be held in memory.
+
+Chunks are validated independently against TIME_LOG_SCHEMA, which therefore
+only has column checks: records are not required to be unique or ordered,
+and repeated records of a participant count as separate measurements.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from schemas import TIME_LOG_SCHEMA, validate
+from streaming_stats import QuantileSketch, WelfordAccumulator
+
+LOG_COLUMNS = ["participant_id", "task", "library", "minutes"]
+DEFAULT_CHUNK_SIZE = 250_000
+
+# Raw per-participant timing logs (time_log*.csv) replace time_data.csv if present
+TIME_LOG_PATTERN = "time_log*.csv"
+TIME_LOG_TRIM = None  # default of dev_ex.py --trim, e.g. (0.05, 0.95)
+
+# Normalized library labels as used in dev_ex.py
+LIBRARY_LABELS = {
+    "material": "Angular Material",
+    "angular material": "Angular Material",
+    "spade": "Spade",
+}
+LIBRARIES = ["Angular Material", "Spade"]
+TASK_ORDER = ["Button", "Input", "Dropdown"]
+
+
+class TimingAccumulator:
+    """Welford accumulator and quantile sketch per (task, library)"""
+
+    def __init__(self):
+        self.groups = {}
+
+    def _group(self, key):
+        if key not in self.groups:
+            self.groups[key] = (WelfordAccumulator(), QuantileSketch())
+        return self.groups[key]
+
+    def update(self, chunk):
+        """Add a chunk of raw records"""
+        libraries = chunk["library"].astype(str).str.strip()
+        libraries = libraries.str.lower().map(LIBRARY_LABELS).fillna(libraries)
+        minutes = pd.to_numeric(chunk["minutes"], errors="coerce")
+
+        for (task, library), values in minutes.groupby(
+            [chunk["task"].astype(str).str.strip(), libraries], sort=False
+        ):
+            moments, sketch = self._group((task, library))
+            moments.update(values.to_numpy())
+            sketch.update(values.to_numpy())
+        return self
+
+    def merge(self, other):
+        """Combine with another accumulator (in place)"""
+        for key, (moments, sketch) in other.groups.items():
+            own_moments, own_sketch = self._group(key)
+            own_moments.merge(moments)
+            own_sketch.merge(sketch)
+        return self
+
+
+def accumulate_log_file(path, chunksize=DEFAULT_CHUNK_SIZE):
+    """Single pass over one log file (column checks per chunk, see module docstring)"""
+    accumulator = TimingAccumulator()
+    for chunk in pd.read_csv(path, usecols=LOG_COLUMNS, chunksize=chunksize):
+        accumulator.update(validate(chunk, TIME_LOG_SCHEMA, source=path))
+    return accumulator
+
+
+def summarize_time_logs(
+    paths, chunksize=DEFAULT_CHUNK_SIZE, max_workers=None, trim=None
+):
+    """
+    Compute time_data.csv-style statistics from raw timing logs.
+
+    Args:
+        paths (list): Raw log CSV files (processed in parallel when several)
+        chunksize (int): Records per chunk
+        max_workers (int): Worker processes (defaults to CPU count)
+        trim (tuple): Optional (lower, upper) quantiles; mean, std and CI are
+            then computed without records outside that range
+
+    Returns:
+        pd.DataFrame: One row per task with mean, std, median, CI and n per library
+    """
+    paths = list(paths)
+    accumulator = TimingAccumulator()
+
+    if len(paths) > 1:
+        workers = min(max_workers or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(
+                accumulate_log_file, paths, [chunksize] * len(paths)
+            ):
+                accumulator.merge(partial)
+    elif paths:
+        accumulator = accumulate_log_file(paths[0], chunksize)
+
+    tasks = list(dict.fromkeys(task for task, _ in accumulator.groups))
+    tasks = [task for task in TASK_ORDER if task in tasks] + [
+        task for task in tasks if task not in TASK_ORDER
+    ]
+
+    rows = []
+    for task in tasks:
+        row = {"Task": task}
+        for library in LIBRARIES:
+            moments, sketch = accumulator.groups.get(
+                (task, library), (WelfordAccumulator(), QuantileSketch())
+            )
+            if trim is None:
+                n, mean, std = moments.n, moments.mean, moments.std
+                ci_low, ci_high = moments.confidence_interval()
+            else:
+                n, mean, std = sketch.trimmed_moments(*trim)
+                ci_low, ci_high = np.nan, np.nan
+                if n > 1:
+                    half_width = stats.t.ppf(0.975, n - 1) * std / np.sqrt(n)
+                    ci_low, ci_high = mean - half_width, mean + half_width
+
+            row[library] = mean if n else np.nan
+            row[f"{library} Std"] = std
+            row[f"{library} Median"] = sketch.quantile(0.5)
+            row[f"{library} CI Low"] = ci_low
+            row[f"{library} CI High"] = ci_high
+            row[f"{library} N"] = int(n)
+        rows.append(row)
+
+    # Column order of time_data.csv first, extended statistics after
+    columns = ["Task"] + LIBRARIES + [f"{library} Std" for library in LIBRARIES]
+    extra = [
+        f"{library} {stat}"
+        for library in LIBRARIES
+        for stat in ["Median", "CI Low", "CI High", "N"]
+    ]
+    return pd.DataFrame(rows, columns=columns + extra)
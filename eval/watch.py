@@ -0,0 +1,239 @@
+"""
+Watch Mode - Re-render Evaluation Outputs on Input Change
+Bachelor Thesis: Component Libraries for Project Business
+
+Keeps matplotlib/pandas and the evaluation modules loaded in one process and
+polls the inputs of every stage in an asyncio loop. Bursts of changes are
+debounced, then only the stages whose inputs (data files, timing logs
+matched by glob, or the stage's own script) changed are re-rendered at preview resolution into output/preview/,
+so the publication figures in output/ are never overwritten.
+
+Usage:
+    python watch.py [--dpi 100] [--stage completion --stage dev_ex ...]
+"""
+
+import argparse
+import asyncio
+import importlib
+import time
+import traceback
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from artifacts import save_figure
+from store import EvalStore
+from timing_logs import TIME_LOG_PATTERN
+
+import completion
+import csv2ex
+import dev_ex
+import participants
+
+EVAL_DIR = Path(__file__).parent
+OUTPUT_DIR = EVAL_DIR / "output"
+PREVIEW_DIR = OUTPUT_DIR / "preview"
+
+PREVIEW_DPI = 100
+POLL_INTERVAL = 0.1  # seconds between input checks
+DEBOUNCE_DELAY = 0.25  # quiet period before a burst of changes is rendered
+
+
+def _save_preview(fig, name, dpi):
+    save_figure(
+        fig,
+        PREVIEW_DIR / name,
+        dpi=dpi,
+        bbox_inches="tight",
+        facecolor="white",
+        edgecolor="none",
+    )
+    plt.close(fig)
+
+
+def render_completion(dpi):
+    """Completion rate, correlation, experience group and correlation matrix charts"""
+    df = completion.load_completion_data()
+
+    fig, _ = completion.create_completion_rate_visualization(df)
+    _save_preview(fig, "completion_rates_overview.png", dpi)
+
+    fig, _ = completion.create_experience_correlation_analysis(df)
+    _save_preview(fig, "experience_completion_correlation.png", dpi)
+
+    fig = completion.create_experience_group_comparison(df)
+    _save_preview(fig, "experience_group_comparison.png", dpi)
+
+    fig, _ = completion.create_correlation_heatmap(df)
+    _save_preview(fig, "experience_correlation_matrix.png", dpi)
+
+
+def render_dev_ex(dpi):
+    """Lines of code and time-to-implement charts"""
+    dev_ex.setup_matplotlib()
+    # Publication rcParams lay out at 300 dpi; preview at the requested dpi
+    plt.rcParams.update({"figure.dpi": dpi, "savefig.dpi": dpi})
+    loc_df, time_df = dev_ex.load_data_from_csv()
+
+    fig = dev_ex.plot_lines_of_code(loc_df, PREVIEW_DIR, dpi=dpi, formats=("png",))
+    plt.close(fig)
+    fig = dev_ex.plot_time_to_implement(time_df, PREVIEW_DIR, dpi=dpi, formats=("png",))
+    plt.close(fig)
+
+
+def render_participants(dpi):
+    """Experience distribution of the sample"""
+    fig = participants.create_participant_distribution()
+    _save_preview(fig, "berufserfahrung_stichprobe.png", dpi)
+
+
+def render_survey(dpi):
+    """Survey appendix workbook, built from the stored waves like ``csv2ex.main``"""
+    with EvalStore() as store:
+        csv2ex.process_survey_wave(
+            EVAL_DIR / "results-survey.csv",
+            EVAL_DIR / "survey_results_appendix.xlsx",
+            store,
+        )
+
+
+# Stage name -> (module, render function, seaborn palette, data inputs or globs)
+STAGES = {
+    "completion": (
+        completion,
+        render_completion,
+        "Set2",
+        ["completion_data.csv"],
+    ),
+    "dev_ex": (
+        dev_ex,
+        render_dev_ex,
+        "husl",
+        ["loc_data.csv", "time_data.csv", TIME_LOG_PATTERN],
+    ),
+    "participants": (participants, render_participants, "Set2", []),
+    "survey": (csv2ex, render_survey, None, ["results-survey.csv"]),
+}
+
+
+def stage_inputs(name):
+    """Files whose change triggers a re-render of the stage (globs expanded)"""
+    module, _, _, data_files = STAGES[name]
+    paths = [Path(module.__file__)]
+    for pattern in data_files:
+        if any(char in pattern for char in "*?["):
+            paths += sorted(EVAL_DIR.glob(pattern))
+        else:
+            paths.append(EVAL_DIR / pattern)
+    return paths
+
+
+def watched_inputs(stage_names):
+    """Inputs per stage and the snapshot of all of them"""
+    inputs = {name: stage_inputs(name) for name in stage_names}
+    return inputs, snapshot({path for paths in inputs.values() for path in paths})
+
+
+def snapshot(paths):
+    """Modification time and size per path (None for missing files)"""
+    result = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+            result[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            result[path] = None
+    return result
+
+
+def run_stage(name, dpi, reload_module=False):
+    """Render one stage in isolated rcParams, returns the elapsed seconds"""
+    module, render, palette, _ = STAGES[name]
+    started = time.perf_counter()
+
+    try:
+        with plt.rc_context():
+            if reload_module:
+                importlib.reload(module)
+            plt.style.use("seaborn-v0_8-whitegrid")
+            if palette:
+                sns.set_palette(palette)
+            render(dpi)
+    except Exception:
+        print(f"❌ Stage '{name}' fehlgeschlagen:")
+        traceback.print_exc()
+    finally:
+        plt.close("all")
+
+    return time.perf_counter() - started
+
+
+async def watch(stage_names, dpi=PREVIEW_DPI):
+    """Poll stage inputs, debounce bursts and re-render changed stages"""
+    PREVIEW_DIR.mkdir(parents=True, exist_ok=True)
+
+    inputs, state = watched_inputs(stage_names)
+
+    print(f"👀 Beobachte {len(state)} Dateien für: {', '.join(stage_names)}")
+    for name in stage_names:
+        print(f"⏱️  {name}: {run_stage(name, dpi):.2f}s")
+
+    while True:
+        await asyncio.sleep(POLL_INTERVAL)
+        # Globs are expanded on every poll, so new timing logs are picked up
+        current_inputs, current = watched_inputs(stage_names)
+        if current == state:
+            continue
+
+        # Wait until the burst of writes is over
+        while True:
+            await asyncio.sleep(DEBOUNCE_DELAY)
+            current_inputs, settled = watched_inputs(stage_names)
+            if settled == current:
+                break
+            current = settled
+
+        changed = {
+            path
+            for path in state.keys() | current.keys()
+            if state.get(path) != current.get(path)
+        }
+
+        for name in stage_names:
+            # Removed files only show up in the previous inputs
+            changed_inputs = changed.intersection(inputs[name] + current_inputs[name])
+            if not changed_inputs:
+                continue
+            module_file = Path(STAGES[name][0].__file__)
+            elapsed = run_stage(name, dpi, reload_module=module_file in changed_inputs)
+            files = ", ".join(path.name for path in sorted(changed_inputs))
+            print(f"🔄 {name} neu gerendert in {elapsed:.2f}s ({files})")
+
+        inputs, state = current_inputs, current
+
+
+def main():
+    """Main function to start the watch loop"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dpi", type=int, default=PREVIEW_DPI)
+    parser.add_argument(
+        "--stage",
+        action="append",
+        choices=list(STAGES),
+        help="Stage to watch (default: all)",
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(watch(args.stage or list(STAGES), dpi=args.dpi))
+    except KeyboardInterrupt:
+        print("\n👋 Watch Mode beendet")
+
+
+if __name__ == "__main__":
+    main()